@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .endpoints import auth
+from .endpoints import auth, webhooks
 from .endpoints.admin import router as admin_router
 from .endpoints.public import router as public_router
 
@@ -11,3 +11,6 @@ api_router.include_router(admin_router, prefix="/admin", tags=["admin"])
 
 # Public routes (no authentication required)
 api_router.include_router(public_router, prefix="/public", tags=["public"])
+
+# Provider webhooks (signed with a shared secret instead)
+api_router.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
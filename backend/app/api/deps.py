@@ -1,12 +1,17 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from fastapi import Depends
 from sqlalchemy.orm import Session
-from app.infrastructure.database.session import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.database.session import SessionLocal, AsyncSessionLocal
 from app.domain.services.project_service import ProjectService
-from app.infrastructure.database.repositories.project_repository_impl import SQLAlchemyProjectRepository
+from app.infrastructure.database.repositories.project_repository_impl import AsyncSQLAlchemyProjectRepository
 from app.domain.services.filemanager_service import FileManagerService
 from app.infrastructure.database.repositories.filemanager_repository_impl import SQLAlchemyFileManagerRepository
 from app.domain.repositories.filemanager_repository import FileManagerRepository
+from app.infrastructure.storage.derivatives import remove_file_blobs, schedule_derivatives
+from app.infrastructure.storage.resumable import ResumableUploadStore
+
+_resumable_uploads = ResumableUploadStore()
 
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
@@ -15,8 +20,12 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
-def get_project_service(db: Session = Depends(get_db)) -> ProjectService:
-    repository = SQLAlchemyProjectRepository(db)
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_project_service(db: AsyncSession = Depends(get_async_db)) -> ProjectService:
+    repository = AsyncSQLAlchemyProjectRepository(db)
     return ProjectService(repository)
 
 def get_filemanager_repository(db: Session = Depends(get_db)) -> FileManagerRepository:
@@ -25,4 +34,11 @@ def get_filemanager_repository(db: Session = Depends(get_db)) -> FileManagerRepo
 def get_filemanager_service(
     repository: FileManagerRepository = Depends(get_filemanager_repository)
 ) -> FileManagerService:
-    return FileManagerService(repository) 
\ No newline at end of file
+    return FileManagerService(
+        repository,
+        release_blob=remove_file_blobs,
+        on_image_saved=schedule_derivatives
+    )
+
+def get_resumable_upload_store() -> ResumableUploadStore:
+    return _resumable_uploads
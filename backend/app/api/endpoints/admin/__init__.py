@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from . import projects, sections, skills, themes, layout, github, filemanager
+from . import projects, sections, skills, themes, layout, github, filemanager, metrics
 
 router = APIRouter()
 
@@ -10,4 +10,5 @@ router.include_router(skills.router, prefix="/skills", tags=["admin-skills"])
 router.include_router(themes.router, prefix="/themes", tags=["admin-themes"])
 router.include_router(layout.router, prefix="/layout", tags=["admin-layout"])
 router.include_router(github.router, prefix="/github", tags=["admin-github"])
-router.include_router(filemanager.router, prefix="/filemanager", tags=["admin-filemanager"]) 
\ No newline at end of file
+router.include_router(filemanager.router, prefix="/filemanager", tags=["admin-filemanager"])
+router.include_router(metrics.router, prefix="/metrics", tags=["admin-metrics"])
@@ -1,88 +1,159 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, status, File as FastAPIFile
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Request, Response, status
+from starlette.concurrency import run_in_threadpool
+from typing import List, Literal, Optional
 import logging
 from app.domain.services.filemanager_service import FileManagerService
-from app.schemas.filemanager import FileUpdate, FileRead, FileCreate
-from app.api.deps import get_db, get_filemanager_service
+from app.schemas.filemanager import FileUpdate, FileRead, FileCreate, FileFromHash, FilePageRead, FileBatchRequest, FileBatchResult, FileUploadResult, FileUsageRead, ResumableUploadCreate, ResumableUploadRead
+from app.api.deps import get_filemanager_service, get_resumable_upload_store
 from app.core.auth import get_current_user
-from app.domain.models.user import SiteOwner
-from app.domain.models.file import File
-from app.domain.exceptions import FileValidationError, FileNotFoundError, FileOperationError
+from app.domain.models.file import File, FileQuery, FileBatchOperation
+from app.domain.exceptions import (
+    FileValidationError, FileTooLargeError, FileNotFoundError, FileOperationError, UploadOffsetError, ChecksumMismatchError
+)
+from app.infrastructure.storage.uploads import UploadPolicy, UploadFailure, UPLOAD_CONCURRENCY, receive_uploads
+from app.infrastructure.storage.resumable import ResumableUpload, ResumableUploadStore, MAX_CHUNK_SIZE
+from dataclasses import asdict
 from datetime import datetime
-import os
-import uuid
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+# Every route writes to or reveals the upload storage: site owner only
+router = APIRouter(dependencies=[Depends(get_current_user)])
 
-@router.get("/files", response_model=List[FileRead])
+MAX_FILES_PER_REQUEST = 50
+MAX_PAGE_SIZE = 500
+MAX_BATCH_ITEMS = 1000
+# Non-standard status of the tus checksum extension
+HTTP_460_CHECKSUM_MISMATCH = 460
+
+@router.get("/files", response_model=FilePageRead)
 def list_files(
     parent_id: Optional[str] = None,
+    sort: str = "name",
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    mime_type: Optional[str] = Query(None, description="MIME type prefix, e.g. image/"),
+    tags: Optional[List[str]] = Query(None, description="Only files carrying all of these tags"),
+    unused: bool = Query(False, description="Only files no project, post or section references"),
     service: FileManagerService = Depends(get_filemanager_service)
 ):
+    """One page of a folder; pass `next_cursor` back as `cursor` for the next one"""
     try:
-        return service.list_files(parent_id)
+        return service.list_files_page(FileQuery(
+            parent_id=parent_id,
+            sort=sort,
+            descending=order == "desc",
+            limit=limit,
+            cursor=cursor,
+            mime_prefix=mime_type,
+            tags=tags or [],
+            unused=unused
+        ))
+    except FileValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
-@router.post("/files", response_model=FileRead)
+def _upload_body(field: str, multiple: bool = False) -> dict:
+    """OpenAPI request body of the streaming upload endpoints."""
+    binary = {"type": "string", "format": "binary"}
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            field: {"type": "array", "items": binary} if multiple else binary,
+                            "parent_id": {"type": "string"}
+                        },
+                        "required": [field]
+                    }
+                }
+            }
+        }
+    }
+
+def _upload_policy(service: FileManagerService) -> UploadPolicy:
+    return UploadPolicy(allowed_types=service.allowed_types, max_size=service.max_file_size)
+
+def _resumable_policy(service: FileManagerService) -> UploadPolicy:
+    # Larger per-type caps only apply to chunked uploads
+    return UploadPolicy(
+        allowed_types=service.allowed_types,
+        max_size=service.max_file_size,
+        max_sizes={content_type: service.max_size_for(content_type) for content_type in service.allowed_types}
+    )
+
+def _resumable_read(upload: ResumableUpload, response: Optional[Response] = None) -> ResumableUploadRead:
+    if response is not None:
+        response.headers["Upload-Offset"] = str(upload.offset)
+        response.headers["Upload-Length"] = str(upload.size)
+        response.headers["Cache-Control"] = "no-store"
+    return ResumableUploadRead(
+        id=upload.id,
+        filename=upload.filename,
+        content_type=upload.content_type,
+        size=upload.size,
+        offset=upload.offset,
+        max_chunk_size=MAX_CHUNK_SIZE,
+        expires_at=datetime.fromtimestamp(upload.expires_at).astimezone()
+    )
+
+def _resumable_error(e: Exception) -> HTTPException:
+    if isinstance(e, FileNotFoundError):
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    if isinstance(e, UploadOffsetError):
+        return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if isinstance(e, ChecksumMismatchError):
+        return HTTPException(status_code=HTTP_460_CHECKSUM_MISMATCH, detail=str(e))
+    if isinstance(e, FileTooLargeError):
+        return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    if isinstance(e, FileValidationError):
+        return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    logger.error(f"Resumable upload failed: {str(e)}")
+    return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+@router.post("/files", response_model=FileRead, openapi_extra=_upload_body("file"))
 async def create_file(
-    file: UploadFile,
+    request: Request,
     parent_id: Optional[str] = None,
     service: FileManagerService = Depends(get_filemanager_service)
 ):
     try:
-        logger.debug(f"Received file upload request: {file.filename} ({file.content_type})")
-        contents = await file.read()
-        logger.debug(f"File size: {len(contents)} bytes")
-        
-        # Generate a unique filename
-        file_extension = os.path.splitext(file.filename)[1]
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        logger.debug(f"Generated unique filename: {unique_filename}")
-        
-        # Get the absolute path to the static/uploads directory
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-        static_uploads_dir = os.path.join(base_dir, "static", "uploads")
-        logger.debug(f"Upload directory path: {static_uploads_dir}")
-        
-        try:
-            os.makedirs(static_uploads_dir, exist_ok=True)
-        except Exception as e:
-            logger.error(f"Failed to create uploads directory: {str(e)}")
-            raise
-        
-        file_path = os.path.join(static_uploads_dir, unique_filename)
-        logger.debug(f"Full file path: {file_path}")
-        
-        # Save the file to disk
-        try:
-            with open(file_path, "wb") as f:
-                f.write(contents)
-            logger.debug("File saved successfully")
-        except Exception as e:
-            logger.error(f"Failed to save file: {str(e)}")
-            raise
-        
-        # Create the file record in the database
-        try:
-            result = await service.create_file(
-                name=file.filename,
-                content_type=file.content_type,
-                size=len(contents),
-                parent_id=parent_id,
-                path=f"/static/uploads/{unique_filename}"
-            )
-            logger.debug("Database record created successfully")
-            return result
-        except Exception as e:
-            logger.error(f"Failed to create database record: {str(e)}")
-            raise
-            
+        # Streamed straight to disk; the body is never held in memory
+        uploads, fields = await receive_uploads(request, _upload_policy(service), max_files=1)
+        if not uploads:
+            raise FileValidationError("No file uploaded")
+        upload = uploads[0]
+        logger.debug(f"Received file upload: {upload.filename} ({upload.content_type}, {upload.size} bytes)")
+
+        # A blob left unreferenced by a failure here is collected by the upload GC.
+        # The service works on a blocking session, so it runs off the event loop
+        result = await run_in_threadpool(
+            service.create_file,
+            name=upload.filename,
+            content_type=upload.content_type,
+            size=upload.size,
+            parent_id=parent_id or fields.get("parent_id") or None,
+            path=upload.url,
+            content_hash=upload.sha256
+        )
+        logger.debug("Database record created successfully")
+        return result
+    except FileTooLargeError as e:
+        logger.error(f"File validation error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
     except FileValidationError as e:
         logger.error(f"File validation error: {str(e)}")
         raise HTTPException(
@@ -96,6 +167,113 @@ async def create_file(
             detail=str(e)
         )
 
+@router.post("/files/from-hash", response_model=FileRead)
+async def create_file_from_hash(
+    file: FileFromHash,
+    service: FileManagerService = Depends(get_filemanager_service)
+):
+    """Re-use already stored content: clients hash locally and only upload on 404."""
+    try:
+        return await run_in_threadpool(
+            service.create_file_from_hash,
+            name=file.name,
+            content_hash=file.content_hash,
+            parent_id=str(file.parent_id) if file.parent_id else None
+        )
+    except FileNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except FileValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.post("/files/uploads", response_model=ResumableUploadRead, status_code=status.HTTP_201_CREATED)
+async def create_resumable_upload(
+    upload: ResumableUploadCreate,
+    request: Request,
+    response: Response,
+    service: FileManagerService = Depends(get_filemanager_service),
+    store: ResumableUploadStore = Depends(get_resumable_upload_store)
+):
+    """Start a chunked upload; send the bytes with PATCH, then POST .../complete"""
+    try:
+        created = await store.create(
+            filename=upload.filename,
+            content_type=upload.content_type,
+            size=upload.size,
+            policy=_resumable_policy(service),
+            parent_id=str(upload.parent_id) if upload.parent_id else None
+        )
+        response.headers["Location"] = str(request.url_for("get_resumable_upload", upload_id=created.id))
+        return _resumable_read(created, response)
+    except Exception as e:
+        raise _resumable_error(e)
+
+@router.get("/files/uploads/{upload_id}", response_model=ResumableUploadRead)
+async def get_resumable_upload(
+    upload_id: str,
+    response: Response,
+    store: ResumableUploadStore = Depends(get_resumable_upload_store)
+):
+    """Where to resume: the number of bytes received so far"""
+    try:
+        return _resumable_read(await store.get(upload_id), response)
+    except Exception as e:
+        raise _resumable_error(e)
+
+@router.patch("/files/uploads/{upload_id}", response_model=ResumableUploadRead)
+async def append_resumable_upload(
+    upload_id: str,
+    request: Request,
+    response: Response,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+    upload_checksum: str = Header(..., alias="Upload-Checksum", description="<algorithm> <base64 digest>, e.g. sha256"),
+    content_length: Optional[int] = Header(None, alias="Content-Length"),
+    store: ResumableUploadStore = Depends(get_resumable_upload_store)
+):
+    """Append one chunk (raw request body) at Upload-Offset"""
+    try:
+        upload = await store.append(upload_id, upload_offset, content_length, upload_checksum, request.stream())
+        return _resumable_read(upload, response)
+    except Exception as e:
+        raise _resumable_error(e)
+
+@router.post("/files/uploads/{upload_id}/complete", response_model=FileRead)
+async def complete_resumable_upload(
+    upload_id: str,
+    service: FileManagerService = Depends(get_filemanager_service),
+    store: ResumableUploadStore = Depends(get_resumable_upload_store)
+):
+    """Assemble the received chunks into a stored file"""
+    try:
+        upload, stored = await store.complete(upload_id)
+        # A blob left unreferenced by a failure here is collected by the upload GC
+        return await run_in_threadpool(
+            service.create_file,
+            name=upload.filename,
+            content_type=stored.content_type,
+            size=stored.size,
+            parent_id=upload.parent_id,
+            path=stored.url,
+            content_hash=stored.sha256
+        )
+    except Exception as e:
+        raise _resumable_error(e)
+
+@router.delete("/files/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def cancel_resumable_upload(
+    upload_id: str,
+    store: ResumableUploadStore = Depends(get_resumable_upload_store)
+):
+    try:
+        await store.cancel(upload_id)
+    except Exception as e:
+        raise _resumable_error(e)
+
 @router.post("/folders", response_model=FileRead)
 def create_folder(
     folder: FileCreate,
@@ -132,6 +310,72 @@ def get_file(
             detail=str(e)
         )
 
+@router.get("/files/{file_id}/usages", response_model=List[FileUsageRead])
+def get_usages(
+    file_id: str,
+    service: FileManagerService = Depends(get_filemanager_service)
+):
+    """Projects, posts and sections that reference the file"""
+    try:
+        return [asdict(usage) for usage in service.get_usages(file_id)]
+    except FileNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+@router.get("/files/{file_id}/tree", response_model=List[FileRead])
+def list_subtree(
+    file_id: str,
+    service: FileManagerService = Depends(get_filemanager_service)
+):
+    """Everything below a folder, depth first"""
+    try:
+        return service.list_subtree(file_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+@router.get("/files/{file_id}/size")
+def get_folder_size(
+    file_id: str,
+    service: FileManagerService = Depends(get_filemanager_service)
+):
+    """Total size of the files below a folder"""
+    try:
+        return {"id": file_id, "size": service.get_folder_size(file_id)}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+@router.get("/files/{file_id}/breadcrumbs", response_model=List[FileRead])
+def get_breadcrumbs(
+    file_id: str,
+    service: FileManagerService = Depends(get_filemanager_service)
+):
+    """Ancestors of a file from the root down, ending with the file itself"""
+    try:
+        return service.get_breadcrumbs(file_id)
+    except FileNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
 @router.put("/files/{file_id}", response_model=FileRead)
 def update_file(
     file_id: str,
@@ -149,7 +393,7 @@ def update_file(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
-    except FileValidationError as e:
+    except (FileValidationError, FileOperationError) as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
@@ -166,8 +410,8 @@ def delete_file(
     service: FileManagerService = Depends(get_filemanager_service)
 ):
     try:
-        service.delete_file(file_id)
-        return {"message": "File deleted successfully"}
+        removed = service.delete_file(file_id)
+        return {"message": "File deleted successfully", "deleted": len(removed)}
     except FileNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -179,6 +423,47 @@ def delete_file(
             detail=str(e)
         )
 
+@router.post("/files/batch", response_model=FileBatchResult)
+def apply_batch(
+    batch: FileBatchRequest,
+    background_tasks: BackgroundTasks,
+    service: FileManagerService = Depends(get_filemanager_service)
+):
+    """Move, delete and (un)tag many files in one transaction, with a result per id"""
+    if sum(len(operation.ids) for operation in batch.operations) > MAX_BATCH_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may touch at most {MAX_BATCH_ITEMS} files"
+        )
+    try:
+        results, released = service.apply_batch([
+            FileBatchOperation(
+                op=operation.op,
+                ids=[str(file_id) for file_id in operation.ids],
+                parent_id=str(operation.parent_id) if operation.parent_id else None,
+                tags=operation.tags
+            )
+            for operation in batch.operations
+        ])
+    except FileValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+    # Blobs are unlinked after the commit and after the response has been sent
+    background_tasks.add_task(service.release_blobs, released)
+    succeeded = sum(1 for result in results if result.status == "ok")
+    return FileBatchResult(
+        results=[asdict(result) for result in results],
+        succeeded=succeeded,
+        failed=len(results) - succeeded
+    )
+
 @router.post("/files/{file_id}/move", response_model=FileRead)
 def move_file(
     file_id: str,
@@ -203,31 +488,55 @@ def move_file(
             detail=str(e)
         )
 
-@router.post("/files/multi", response_model=List[FileRead])
+@router.post("/files/multi", response_model=List[FileUploadResult], openapi_extra=_upload_body("files", multiple=True))
 async def create_files(
-    files: List[UploadFile] = FastAPIFile(...),
+    request: Request,
     parent_id: Optional[str] = None,
     service: FileManagerService = Depends(get_filemanager_service)
 ):
-    results = []
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-    static_uploads_dir = os.path.join(base_dir, "static", "uploads")
-    os.makedirs(static_uploads_dir, exist_ok=True)
-    for file in files:
-        contents = await file.read()
-        file_extension = os.path.splitext(file.filename)[1]
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = os.path.join(static_uploads_dir, unique_filename)
-        
-        with open(file_path, "wb") as f:
-            f.write(contents)
-        
-        result = await service.create_file(
-            name=file.filename,
-            content_type=file.content_type,
-            size=len(contents),
-            parent_id=parent_id,
-            path=f"/static/uploads/{unique_filename}"
+    """Upload many files at once; each file succeeds or fails on its own"""
+    failures: List[UploadFailure] = []
+    try:
+        uploads, fields = await receive_uploads(
+            request,
+            _upload_policy(service),
+            max_files=MAX_FILES_PER_REQUEST,
+            concurrency=UPLOAD_CONCURRENCY,
+            failures=failures
+        )
+    except FileTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except FileValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    # All rows in one transaction; blobs of rejected rows are collected by the upload GC
+    target = parent_id or fields.get("parent_id") or None
+    created = await run_in_threadpool(service.create_files, [
+        File(
+            name=upload.filename,
+            path=upload.url,
+            parent_id=target,
+            size=upload.size,
+            mime_type=upload.content_type,
+            content_hash=upload.sha256
+        )
+        for upload in uploads
+    ])
+    results = {
+        upload.index: FileUploadResult(
+            filename=upload.filename,
+            status="created" if result.file else "error",
+            file=FileRead.model_validate(result.file) if result.file else None,
+            error=result.error
         )
-        results.append(result)
-    return results 
\ No newline at end of file
+        for upload, result in zip(uploads, created)
+    }
+    for failure in failures:
+        results[failure.index] = FileUploadResult(filename=failure.filename, status="error", error=failure.error)
+    return [results[index] for index in sorted(results)]
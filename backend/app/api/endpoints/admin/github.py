@@ -1,38 +1,70 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 import logging
 from app.core.auth import get_current_user
 from app.domain.models.user import SiteOwner # Changed User to SiteOwner
 from app.domain.services.github_service import GitHubService
-from app.infrastructure.database.repositories.project_repository_impl import SQLAlchemyProjectRepository
-from app.infrastructure.database.session import get_db
+from app.infrastructure.database.repositories.project_repository_impl import AsyncSQLAlchemyProjectRepository
+from app.api.deps import get_async_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.external.sync_worker import sync_worker, RUN_SUCCESS, RUN_CANCELLED
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-def get_github_service(db = Depends(get_db)) -> GitHubService:
-    repository = SQLAlchemyProjectRepository(db)
+def get_github_service(db: AsyncSession = Depends(get_async_db)) -> GitHubService:
+    repository = AsyncSQLAlchemyProjectRepository(db)
     return GitHubService(repository)
 
 @router.post("/sync")
 async def sync_github(
     username: str,
-    github_service: GitHubService = Depends(get_github_service),
+    response: Response,
+    source_type: str = "github",
+    wait: bool = True,
     current_site_owner: SiteOwner = Depends(get_current_user) # Renamed and updated type
 ):
-    """Sync projects from GitHub repositories."""
-    logger.debug(f"GitHub sync requested by site owner: {current_site_owner.email}") # Updated log and var
+    """Sync projects from GitHub (or GitLab) repositories through the sync worker.
+
+    Joins a sync of the same user that is already queued or running. With
+    `wait=false` the run is only queued and 202 is returned right away.
+    """
+    logger.debug(f"{source_type} sync of {username} requested by site owner: {current_site_owner.email}") # Updated log and var
+    if source_type not in ("github", "gitlab"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="source_type must be github or gitlab")
     try:
-        logger.debug("Starting GitHub sync process")
-        projects = await github_service.sync_projects(username)
-        logger.debug(f"GitHub sync completed successfully. Synced {len(projects)} projects")
-        return {"message": "GitHub sync completed successfully", "projects": projects}
-    except Exception as e:
-        logger.error(f"GitHub sync failed: {str(e)}")
+        if not wait:
+            run = sync_worker.trigger(username, source_type)
+            response.status_code = status.HTTP_202_ACCEPTED
+            return {"message": f"Sync {run.status}", "run": run.to_dict()}
+        run = await sync_worker.run(username, source_type)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    if run.status == RUN_CANCELLED:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Sync was cancelled")
+    if run.status != RUN_SUCCESS:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to sync GitHub projects: {str(e)}"
+            detail=f"Failed to sync {source_type} projects: {run.error}"
         )
+    logger.debug(f"Sync completed successfully. {len(run.result.projects)} projects changed")
+    return {"message": "Sync completed successfully", "run": run.to_dict(), "projects": run.result.projects}
+
+@router.get("/sync/status")
+async def get_sync_status(
+    current_site_owner: SiteOwner = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """Running and queued syncs of this worker, and its most recent runs."""
+    return sync_worker.status()
+
+@router.delete("/sync")
+async def cancel_sync(
+    username: Optional[str] = None,
+    source_type: Optional[str] = None,
+    current_site_owner: SiteOwner = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """Cancel queued and running syncs, optionally only those of one user."""
+    return {"cancelled": sync_worker.cancel(username, source_type)}
 
 @router.get("/{username}")
 async def get_github_projects(
@@ -1,19 +1,20 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 from app.core.auth import get_current_user
-from app.infrastructure.database.session import get_db
+from app.api.deps import get_async_db
 from app.schemas import layout as schemas
 from app.domain.models.user import SiteOwner # Changed User to SiteOwner
 from app.domain.services.layout_service import LayoutService
-from app.infrastructure.database.repositories.layout_repository_impl import SQLAlchemyLayoutRepository
+from app.infrastructure.database.repositories.layout_repository_impl import AsyncSQLAlchemyLayoutRepository
+from app.infrastructure.cache.response_cache import public_cache, LAYOUT
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-def get_layout_service(db: Session = Depends(get_db)) -> LayoutService:
-    repository = SQLAlchemyLayoutRepository(db)
+def get_layout_service(db: AsyncSession = Depends(get_async_db)) -> LayoutService:
+    repository = AsyncSQLAlchemyLayoutRepository(db)
     return LayoutService(repository)
 
 @router.get("/", response_model=schemas.Layout)
@@ -43,6 +44,7 @@ async def update_layout(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Layout configuration not found"
         )
+    await public_cache.invalidate(LAYOUT)
     return updated_layout
 
 @router.post("/preview", response_model=schemas.LayoutPreview)
@@ -100,4 +102,5 @@ async def apply_layout_template(
             detail="Failed to apply template"
         )
     
+    await public_cache.invalidate(LAYOUT)
     return updated_layout
@@ -0,0 +1,33 @@
+from typing import Any, Dict
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.api.deps import get_db
+from app.core.auth import get_current_user
+from app.domain.models.user import SiteOwner
+from app.infrastructure.database.pool import pool_metrics
+from app.infrastructure.scheduler.scheduler import scheduler_status
+from app.core.github import rate_limit_budget
+
+router = APIRouter()
+
+@router.get("/db")
+def get_db_metrics(
+    current_site_owner: SiteOwner = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """Connection pool occupancy, checkout and wait statistics per engine"""
+    return pool_metrics()
+
+@router.get("/scheduler")
+def get_scheduler_metrics(
+    db: Session = Depends(get_db),
+    current_site_owner: SiteOwner = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """Scheduler leader, and next run, status and last duration of each job"""
+    return scheduler_status(db)
+
+@router.get("/github")
+def get_github_metrics(
+    current_site_owner: SiteOwner = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """GitHub rate limit budgets of this worker: remaining, reset, share and usage counters"""
+    return {"rest": rate_limit_budget().snapshot(), "graphql": rate_limit_budget(resource="graphql").snapshot()}
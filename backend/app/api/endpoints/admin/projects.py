@@ -1,6 +1,5 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
 import logging
 from app.core.auth import get_current_user
 from app.domain.models.project import Project
@@ -8,13 +7,13 @@ from app.domain.models.user import SiteOwner # Changed User to SiteOwner
 from app.domain.services.project_service import ProjectService
 from app.schemas import project as schemas
 from app.api import deps
+from app.infrastructure.cache.response_cache import public_cache, PROJECTS
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Project], response_model_by_alias=True)
 async def get_projects(
-    db: Session = Depends(deps.get_db),
     project_service: ProjectService = Depends(deps.get_project_service)
 ):
     return await project_service.get_all_projects()
@@ -22,15 +21,15 @@ async def get_projects(
 @router.post("/", response_model=schemas.Project, response_model_by_alias=True)
 async def create_project(
     project: schemas.ProjectCreate,
-    db: Session = Depends(deps.get_db),
     project_service: ProjectService = Depends(deps.get_project_service)
 ):
-    return await project_service.create_project(project)
+    created = await project_service.create_project(project)
+    await public_cache.invalidate(PROJECTS)
+    return created
 
 @router.get("/{project_id}", response_model=schemas.Project, response_model_by_alias=True)
 async def get_project(
     project_id: int,
-    db: Session = Depends(deps.get_db),
     project_service: ProjectService = Depends(deps.get_project_service)
 ):
     project = await project_service.get_project(project_id)
@@ -42,44 +41,45 @@ async def get_project(
 async def update_project(
     project_id: int,
     project: schemas.ProjectUpdate,
-    db: Session = Depends(deps.get_db),
     project_service: ProjectService = Depends(deps.get_project_service)
 ):
     updated_project = await project_service.update_project(project_id, project)
     if not updated_project:
         raise HTTPException(status_code=404, detail="Project not found")
+    await public_cache.invalidate(PROJECTS)
     return updated_project
 
 @router.delete("/{project_id}")
 async def delete_project(
     project_id: int,
-    db: Session = Depends(deps.get_db),
     project_service: ProjectService = Depends(deps.get_project_service)
 ):
     if not await project_service.delete_project(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
+    await public_cache.invalidate(PROJECTS)
     return {"message": "Project deleted successfully"}
 
 @router.post("/import/github")
 async def import_github_projects(
     projects_data: List[schemas.GitHubProjectImport],
-    db: Session = Depends(deps.get_db),
     project_service: ProjectService = Depends(deps.get_project_service)
 ):
-    return await project_service.import_github_projects(projects_data)
+    result = await project_service.import_github_projects(projects_data)
+    await public_cache.invalidate(PROJECTS)
+    return result
 
 @router.post("/import/gitlab")
 async def import_gitlab_projects(
     projects_data: List[schemas.GitLabProjectImport],
-    db: Session = Depends(deps.get_db),
     project_service: ProjectService = Depends(deps.get_project_service)
 ):
-    return await project_service.import_gitlab_projects(projects_data)
+    result = await project_service.import_gitlab_projects(projects_data)
+    await public_cache.invalidate(PROJECTS)
+    return result
 
 @router.post("/import/manual", response_model=List[schemas.Project], response_model_by_alias=True)
 async def import_manual_projects(
     projects_data: List[schemas.ManualProjectImport],
-    db: Session = Depends(deps.get_db),
     current_site_owner: SiteOwner = Depends(get_current_user), # Renamed and updated type
     project_service: ProjectService = Depends(deps.get_project_service)
 ):
@@ -103,6 +103,7 @@ async def import_manual_projects(
             imported_projects.append(project)
             
         logger.debug(f"Successfully imported {len(imported_projects)} manual projects")
+        await public_cache.invalidate(PROJECTS)
         return imported_projects
     except Exception as e:
         logger.error(f"Manual project import failed: {str(e)}")
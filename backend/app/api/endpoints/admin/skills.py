@@ -1,52 +1,55 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 from app.core.auth import get_current_user
-from app.infrastructure.database.session import get_db
+from app.api.deps import get_async_db
 from app.domain.models.skill import Skill
 from app.domain.models.user import SiteOwner # Changed User to SiteOwner
 from app.domain.repositories.skill_repository import SkillRepository
 from app.domain.services.skill_service import SkillService
-from app.infrastructure.database.repositories.skill_repository_impl import SQLAlchemySkillRepository
+from app.infrastructure.database.repositories.skill_repository_impl import AsyncSQLAlchemySkillRepository
+from app.infrastructure.cache.response_cache import public_cache, SKILLS
 from app.schemas.skill import SkillCreate, SkillUpdate
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-def get_skill_service(db: Session = Depends(get_db)) -> SkillService:
-    repository = SQLAlchemySkillRepository(db)
+def get_skill_service(db: AsyncSession = Depends(get_async_db)) -> SkillService:
+    repository = AsyncSQLAlchemySkillRepository(db)
     return SkillService(repository)
 
 @router.get("/", response_model=List[Skill], response_model_by_alias=True)
-def list_skills(
+async def list_skills(
     skill_service: SkillService = Depends(get_skill_service),
     current_site_owner: SiteOwner = Depends(get_current_user) # Renamed and updated type
 ):
     """List all skills (admin only)"""
-    return skill_service.list_skills()
+    return await skill_service.list_skills()
 
 @router.get("/category/{category}", response_model=List[Skill], response_model_by_alias=True)
-def list_skills_by_category(
+async def list_skills_by_category(
     category: str,
     skill_service: SkillService = Depends(get_skill_service),
     current_site_owner: SiteOwner = Depends(get_current_user) # Renamed and updated type
 ):
     """List skills by category (admin only)"""
-    return skill_service.list_skills_by_category(category)
+    return await skill_service.list_skills_by_category(category)
 
 @router.post("/", response_model=Skill, response_model_by_alias=True)
-def create_skill(
+async def create_skill(
     skill: SkillCreate,
     skill_service: SkillService = Depends(get_skill_service),
     current_site_owner: SiteOwner = Depends(get_current_user), # Renamed and updated type
 ):
     """Create a new skill"""
     domain_skill = Skill(**skill.dict())
-    return skill_service.create_skill(domain_skill)
+    created = await skill_service.create_skill(domain_skill)
+    await public_cache.invalidate(SKILLS)
+    return created
 
 @router.put("/{skill_id}", response_model=Skill, response_model_by_alias=True)
-def update_skill(
+async def update_skill(
     skill_id: int,
     skill: SkillUpdate,
     skill_service: SkillService = Depends(get_skill_service),
@@ -54,31 +57,34 @@ def update_skill(
 ):
     """Update an existing skill"""
     domain_skill = Skill(**skill.dict())
-    updated = skill_service.update_skill(skill_id, domain_skill)
+    updated = await skill_service.update_skill(skill_id, domain_skill)
     if not updated:
         raise HTTPException(status_code=404, detail="Skill not found")
+    await public_cache.invalidate(SKILLS)
     return updated
 
 @router.delete("/{skill_id}")
-def delete_skill(
+async def delete_skill(
     skill_id: int,
     skill_service: SkillService = Depends(get_skill_service),
     current_site_owner: SiteOwner = Depends(get_current_user), # Renamed and updated type
 ):
     """Delete a skill"""
-    if not skill_service.delete_skill(skill_id):
+    if not await skill_service.delete_skill(skill_id):
         raise HTTPException(status_code=404, detail="Skill not found")
+    await public_cache.invalidate(SKILLS)
     return {"status": "success"}
 
 @router.put("/{skill_id}/reorder/{new_order}", response_model=Skill, response_model_by_alias=True)
-def reorder_skill(
+async def reorder_skill(
     skill_id: int,
     new_order: int,
     skill_service: SkillService = Depends(get_skill_service),
     current_site_owner: SiteOwner = Depends(get_current_user), # Renamed and updated type
 ):
     """Reorder a skill"""
-    updated = skill_service.reorder_skill(skill_id, new_order)
+    updated = await skill_service.reorder_skill(skill_id, new_order)
     if not updated:
         raise HTTPException(status_code=404, detail="Skill not found")
+    await public_cache.invalidate(SKILLS)
     return updated
@@ -4,6 +4,7 @@ from .skills import router as skills_router
 from .sections import router as sections_router
 from .themes import router as themes_router
 from .layout import router as layout_router
+from .bootstrap import router as bootstrap_router
 
 router = APIRouter()
 
@@ -11,4 +12,5 @@ router.include_router(projects_router, prefix="/projects", tags=["public-project
 router.include_router(skills_router, prefix="/skills", tags=["public-skills"])
 router.include_router(sections_router, prefix="/sections", tags=["public-sections"])
 router.include_router(themes_router, prefix="/themes", tags=["public-themes"])
-router.include_router(layout_router, prefix="/layout", tags=["public-layout"]) 
\ No newline at end of file
+router.include_router(layout_router, prefix="/layout", tags=["public-layout"]) 
+router.include_router(bootstrap_router, prefix="/bootstrap", tags=["public-bootstrap"])
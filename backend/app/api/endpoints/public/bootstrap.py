@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, Request
+from app.schemas.bootstrap import PublicBootstrap
+from app.domain.services.layout_service import LayoutService
+from app.domain.services.theme_service import ThemeService
+from app.domain.services.section_service import SectionService
+from app.domain.services.skill_service import SkillService
+from app.domain.services.project_service import ProjectService
+from app.infrastructure.cache.response_cache import public_cache, to_json_bytes, ALL_TAGS
+from app.infrastructure.storage.media import MediaResolver
+from .layout import get_layout_service
+from .themes import get_theme_service
+from .sections import get_section_service
+from .skills import get_skill_service
+from .projects import get_project_service, get_media_resolver, with_media
+
+router = APIRouter()
+
+# Browsers revalidate after a minute, CDNs keep it for five and may serve
+# a stale copy for ten more while they refetch in the background
+BOOTSTRAP_CACHE_CONTROL = "public, max-age=60, s-maxage=300, stale-while-revalidate=600"
+
+@router.get("/", response_model=PublicBootstrap, response_model_by_alias=True)
+async def get_bootstrap(
+    request: Request,
+    layout_service: LayoutService = Depends(get_layout_service),
+    theme_service: ThemeService = Depends(get_theme_service),
+    section_service: SectionService = Depends(get_section_service),
+    skill_service: SkillService = Depends(get_skill_service),
+    project_service: ProjectService = Depends(get_project_service),
+    media_resolver: MediaResolver = Depends(get_media_resolver)
+):
+    """Get layout, theme, sections, skills and projects in one response"""
+    # All services share the request's session; it is only used on a cache miss
+    async def load() -> bytes:
+        payload = {
+            "layout": await layout_service.get_current_layout(),
+            "theme": await theme_service.get_active_theme(),
+            "sections": await section_service.get_visible_sections(),
+            "skills": await skill_service.get_all_skills(),
+            "projects": await with_media(await project_service.get_visible_projects(), media_resolver),
+        }
+        return to_json_bytes(PublicBootstrap, payload)
+    return await public_cache.respond(
+        request,
+        ALL_TAGS,
+        load,
+        cache_control=BOOTSTRAP_CACHE_CONTROL,
+        compress=True
+    )
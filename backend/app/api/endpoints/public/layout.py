@@ -1,22 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.infrastructure.database.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_async_db
 from app.schemas import layout as schemas
 from app.domain.services.layout_service import LayoutService
-from app.infrastructure.database.repositories.layout_repository_impl import SQLAlchemyLayoutRepository
+from app.infrastructure.database.repositories.layout_repository_impl import AsyncSQLAlchemyLayoutRepository
+from app.infrastructure.cache.response_cache import public_cache, to_json_bytes, LAYOUT
 
 router = APIRouter()
 
-def get_layout_service(db: Session = Depends(get_db)) -> LayoutService:
-    repository = SQLAlchemyLayoutRepository(db)
+def get_layout_service(db: AsyncSession = Depends(get_async_db)) -> LayoutService:
+    repository = AsyncSQLAlchemyLayoutRepository(db)
     return LayoutService(repository)
 
 @router.get("/", response_model=schemas.Layout)
 async def get_layout(
+    request: Request,
     layout_service: LayoutService = Depends(get_layout_service)
 ):
     """Get the current layout configuration"""
-    layout = await layout_service.get_current_layout()
-    if not layout:
-        raise HTTPException(status_code=404, detail="No layout configuration found")
-    return layout 
\ No newline at end of file
+    async def load() -> bytes:
+        layout = await layout_service.get_current_layout()
+        if not layout:
+            raise HTTPException(status_code=404, detail="No layout configuration found")
+        return to_json_bytes(schemas.Layout, layout)
+    return await public_cache.respond(request, (LAYOUT,), load) 
\ No newline at end of file
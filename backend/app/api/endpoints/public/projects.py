@@ -1,31 +1,61 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.infrastructure.database.session import get_db
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_async_db
 from app.schemas import project as schemas
+from app.domain.models.project import Project
 from app.domain.services.project_service import ProjectService
-from app.infrastructure.database.repositories.project_repository_impl import SQLAlchemyProjectRepository
+from app.infrastructure.database.repositories.project_repository_impl import AsyncSQLAlchemyProjectRepository
+from app.infrastructure.cache.response_cache import public_cache, to_json_bytes, project_tag, PROJECTS, PROJECT_LIST
+from app.infrastructure.storage.media import MediaResolver
 
 router = APIRouter()
 
-def get_project_service(db: Session = Depends(get_db)) -> ProjectService:
-    repository = SQLAlchemyProjectRepository(db)
+def get_project_service(db: AsyncSession = Depends(get_async_db)) -> ProjectService:
+    repository = AsyncSQLAlchemyProjectRepository(db)
     return ProjectService(repository)
 
+def get_media_resolver(db: AsyncSession = Depends(get_async_db)) -> MediaResolver:
+    return MediaResolver(db)
+
+def _image_urls(project: Project) -> List[Optional[str]]:
+    return [project.thumbnail_url, *(project.gallery_urls or []), *(project.gif_urls or [])]
+
+async def with_media(projects: List[Project], media_resolver: MediaResolver) -> List[schemas.Project]:
+    """Attach srcset-ready image variants to the projects' image URLs."""
+    media = await media_resolver.resolve(url for project in projects for url in _image_urls(project))
+    result = []
+    for project in projects:
+        item = schemas.Project.model_validate(project)
+        item.media = {url: media[url] for url in _image_urls(project) if url in media} or None
+        result.append(item)
+    return result
+
 @router.get("/", response_model=List[schemas.Project], response_model_by_alias=True)
 async def list_visible_projects(
-    project_service: ProjectService = Depends(get_project_service)
+    request: Request,
+    project_service: ProjectService = Depends(get_project_service),
+    media_resolver: MediaResolver = Depends(get_media_resolver)
 ):
     """Get all visible projects"""
-    return await project_service.get_visible_projects()
+    # The session only checks out a connection when the cache misses
+    async def load() -> bytes:
+        projects = await project_service.get_visible_projects()
+        return to_json_bytes(List[schemas.Project], await with_media(projects, media_resolver))
+    return await public_cache.respond(request, (PROJECTS, PROJECT_LIST), load)
 
 @router.get("/{project_id}", response_model=schemas.Project, response_model_by_alias=True)
 async def get_project(
     project_id: int,
-    project_service: ProjectService = Depends(get_project_service)
+    request: Request,
+    project_service: ProjectService = Depends(get_project_service),
+    media_resolver: MediaResolver = Depends(get_media_resolver)
 ):
     """Get a specific project by ID"""
-    project = await project_service.get_visible_project(project_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    async def load() -> bytes:
+        project = await project_service.get_visible_project(project_id)
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        [item] = await with_media([project], media_resolver)
+        return to_json_bytes(schemas.Project, item)
+    return await public_cache.respond(request, (PROJECTS, project_tag(project_id)), load)
@@ -1,31 +1,39 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.infrastructure.database.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_async_db
 from app.schemas import section as schemas
 from app.domain.services.section_service import SectionService
-from app.infrastructure.database.repositories.section_repository_impl import SQLAlchemySectionRepository
+from app.infrastructure.database.repositories.section_repository_impl import AsyncSQLAlchemySectionRepository
+from app.infrastructure.cache.response_cache import public_cache, to_json_bytes, SECTIONS
 
 router = APIRouter()
 
-def get_section_service(db: Session = Depends(get_db)) -> SectionService:
-    repository = SQLAlchemySectionRepository(db)
+def get_section_service(db: AsyncSession = Depends(get_async_db)) -> SectionService:
+    repository = AsyncSQLAlchemySectionRepository(db)
     return SectionService(repository)
 
 @router.get("/", response_model=List[schemas.Section])
 async def list_visible_sections(
+    request: Request,
     section_service: SectionService = Depends(get_section_service)
 ):
     """Get all visible sections in order"""
-    return await section_service.get_visible_sections()
+    async def load() -> bytes:
+        sections = await section_service.get_visible_sections()
+        return to_json_bytes(List[schemas.Section], sections)
+    return await public_cache.respond(request, (SECTIONS,), load)
 
 @router.get("/{section_id}", response_model=schemas.Section)
 async def get_section(
     section_id: int,
+    request: Request,
     section_service: SectionService = Depends(get_section_service)
 ):
     """Get a specific section by ID"""
-    section = await section_service.get_visible_section(section_id)
-    if not section:
-        raise HTTPException(status_code=404, detail="Section not found")
-    return section 
\ No newline at end of file
+    async def load() -> bytes:
+        section = await section_service.get_visible_section(section_id)
+        if not section:
+            raise HTTPException(status_code=404, detail="Section not found")
+        return to_json_bytes(schemas.Section, section)
+    return await public_cache.respond(request, (SECTIONS,), load) 
\ No newline at end of file
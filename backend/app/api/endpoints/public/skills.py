@@ -1,27 +1,36 @@
 from typing import List
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.infrastructure.database.session import get_db
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_async_db
 from app.schemas import skill as schemas
 from app.domain.services.skill_service import SkillService
-from app.infrastructure.database.repositories.skill_repository_impl import SQLAlchemySkillRepository
+from app.infrastructure.database.repositories.skill_repository_impl import AsyncSQLAlchemySkillRepository
+from app.infrastructure.cache.response_cache import public_cache, to_json_bytes, SKILLS
 
 router = APIRouter()
 
-def get_skill_service(db: Session = Depends(get_db)) -> SkillService:
-    repository = SQLAlchemySkillRepository(db)
+def get_skill_service(db: AsyncSession = Depends(get_async_db)) -> SkillService:
+    repository = AsyncSQLAlchemySkillRepository(db)
     return SkillService(repository)
 
 @router.get("/", response_model=List[schemas.Skill], response_model_by_alias=True)
 async def list_skills(
+    request: Request,
     skill_service: SkillService = Depends(get_skill_service)
 ):
     """Get all skills grouped by category"""
-    return await skill_service.get_all_skills()
+    async def load() -> bytes:
+        skills = await skill_service.get_all_skills()
+        return to_json_bytes(List[schemas.Skill], skills)
+    return await public_cache.respond(request, (SKILLS,), load)
 
 @router.get("/categories", response_model=List[str])
 async def list_skill_categories(
+    request: Request,
     skill_service: SkillService = Depends(get_skill_service)
 ):
     """Get all skill categories"""
-    return await skill_service.get_skill_categories()
+    async def load() -> bytes:
+        categories = await skill_service.get_skill_categories()
+        return to_json_bytes(List[str], categories)
+    return await public_cache.respond(request, (SKILLS,), load)
@@ -1,22 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.infrastructure.database.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_async_db
 from app.schemas import theme as schemas
 from app.domain.services.theme_service import ThemeService
-from app.infrastructure.database.repositories.theme_repository_impl import SQLAlchemyThemeRepository
+from app.infrastructure.database.repositories.theme_repository_impl import AsyncSQLAlchemyThemeRepository
+from app.infrastructure.cache.response_cache import public_cache, to_json_bytes, THEMES
 
 router = APIRouter()
 
-def get_theme_service(db: Session = Depends(get_db)) -> ThemeService:
-    repository = SQLAlchemyThemeRepository(db)
+def get_theme_service(db: AsyncSession = Depends(get_async_db)) -> ThemeService:
+    repository = AsyncSQLAlchemyThemeRepository(db)
     return ThemeService(repository)
 
 @router.get("/", response_model=schemas.Theme)
 async def get_active_theme(
+    request: Request,
     theme_service: ThemeService = Depends(get_theme_service)
 ):
     """Get the currently active theme"""
-    theme = await theme_service.get_active_theme()
-    if not theme:
-        raise HTTPException(status_code=404, detail="No active theme found")
-    return theme 
\ No newline at end of file
+    async def load() -> bytes:
+        theme = await theme_service.get_active_theme()
+        if not theme:
+            raise HTTPException(status_code=404, detail="No active theme found")
+        return to_json_bytes(schemas.Theme, theme)
+    return await public_cache.respond(request, (THEMES,), load) 
\ No newline at end of file
@@ -0,0 +1,144 @@
+import os
+import hmac
+import json
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Header, HTTPException, Request, Response, status
+from app.infrastructure.external.sync_service import SyncService
+from app.infrastructure.external.sync_worker import sync_worker
+from app.infrastructure.database.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Without a secret the endpoint is disabled; unsigned deliveries are never accepted
+GITHUB_WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET")
+GITLAB_WEBHOOK_SECRET = os.getenv("GITLAB_WEBHOOK_SECRET")
+
+# Events that change what we store about a repository
+GITHUB_EVENTS = {"push", "release", "repository", "star", "watch", "public"}
+GITLAB_EVENTS = {"Push Hook", "Tag Push Hook", "Release Hook"}
+
+
+def _require_secret(secret: Optional[str], source_type: str) -> str:
+    if not secret:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"{source_type} webhooks are not configured"
+        )
+    return secret
+
+
+def _parse(body: bytes) -> Dict[str, Any]:
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Payload must be JSON")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Payload must be a JSON object")
+    return payload
+
+
+def _is_site_owner(owner: Optional[str]) -> bool:
+    """Only repositories of GIT_USERNAME are synced, if it is set."""
+    username = (os.getenv("GIT_USERNAME") or "").strip()
+    return bool(owner) and (not username or owner.lower() == username.lower())
+
+
+def _ignored(response: Response, reason: str) -> Dict[str, Any]:
+    # 2xx, so the provider does not retry or disable the hook
+    response.status_code = status.HTTP_202_ACCEPTED
+    return {"message": f"Ignored: {reason}"}
+
+
+def _enqueue(response: Response, owner: str, repo: str, source_type: str, event: str) -> Dict[str, Any]:
+    """Queue a refresh of one repository; the provider gets its answer right away."""
+    try:
+        run = sync_worker.trigger(owner, source_type, reason=f"webhook:{event}", repo=repo)
+    except RuntimeError as e:
+        # Not acknowledged, so the provider redelivers it later
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    response.status_code = status.HTTP_202_ACCEPTED
+    return {"message": f"Sync {run.status}", "run": run.to_dict()}
+
+
+@router.post("/github")
+async def github_webhook(
+    request: Request,
+    response: Response,
+    x_github_event: str = Header(...),
+    x_hub_signature_256: Optional[str] = Header(None),
+    x_github_delivery: Optional[str] = Header(None),
+):
+    """Refresh the project of a repository after a GitHub event.
+
+    The body must be signed with GITHUB_WEBHOOK_SECRET (`X-Hub-Signature-256`).
+    Pushes to the default branch, releases, repository changes and stars
+    queue a sync of that one repository; a repository that is deleted or made
+    private is removed by it. Everything else is acknowledged and ignored.
+    """
+    secret = _require_secret(GITHUB_WEBHOOK_SECRET, "GitHub")
+    body = await request.body()
+    expected = "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    if not x_hub_signature_256 or not hmac.compare_digest(x_hub_signature_256, expected):
+        logger.warning(f"Rejected GitHub delivery {x_github_delivery}: invalid signature")
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid signature")
+
+    if x_github_event == "ping":
+        return {"message": "pong"}
+    if x_github_event not in GITHUB_EVENTS:
+        return _ignored(response, f"{x_github_event} events")
+
+    payload = _parse(body)
+    repository = payload.get("repository") or {}
+    owner = (repository.get("owner") or {}).get("login")
+    name = repository.get("name")
+    if not name or not _is_site_owner(owner):
+        return _ignored(response, f"repository {owner}/{name}")
+    if x_github_event == "push":
+        default_branch = repository.get("default_branch") or repository.get("master_branch")
+        if payload.get("ref") != f"refs/heads/{default_branch}":
+            # Other branches and tags change nothing we show; releases have their own event
+            return _ignored(response, f"push to {payload.get('ref')}")
+
+    if x_github_event == "repository" and payload.get("action") == "renamed":
+        old_name = (((payload.get("changes") or {}).get("repository") or {}).get("name") or {}).get("from")
+        if old_name:
+            # Keep the project (and what was curated on it) instead of adding a new one
+            await SyncService(AsyncSessionLocal).rename_project(owner, old_name, name, "github")
+
+    logger.info(f"GitHub {x_github_event} event {x_github_delivery} for {owner}/{name}")
+    return _enqueue(response, owner, name, "github", x_github_event)
+
+
+@router.post("/gitlab")
+async def gitlab_webhook(
+    request: Request,
+    response: Response,
+    x_gitlab_event: str = Header(...),
+    x_gitlab_token: Optional[str] = Header(None),
+):
+    """Refresh the project of a repository after a GitLab event.
+
+    The hook's secret token must match GITLAB_WEBHOOK_SECRET. Pushes to the
+    default branch, tag pushes and releases queue a sync of that one project.
+    """
+    secret = _require_secret(GITLAB_WEBHOOK_SECRET, "GitLab")
+    if not x_gitlab_token or not hmac.compare_digest(x_gitlab_token.encode("utf-8"), secret.encode("utf-8")):
+        logger.warning(f"Rejected GitLab {x_gitlab_event}: invalid token")
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    if x_gitlab_event not in GITLAB_EVENTS:
+        return _ignored(response, x_gitlab_event)
+
+    payload = _parse(await request.body())
+    project = payload.get("project") or {}
+    namespace, _, path = (project.get("path_with_namespace") or "").rpartition("/")
+    if not path or not _is_site_owner(namespace):
+        return _ignored(response, f"project {project.get('path_with_namespace')}")
+    if x_gitlab_event == "Push Hook" and payload.get("ref") != f"refs/heads/{project.get('default_branch')}":
+        return _ignored(response, f"push to {payload.get('ref')}")
+
+    logger.info(f"GitLab {x_gitlab_event} for {namespace}/{path}")
+    return _enqueue(response, namespace, path, "gitlab", x_gitlab_event.lower().replace(" ", "_"))
@@ -1,10 +1,34 @@
 import os
+import re
+import asyncio
 import requests
-from typing import Dict, Any, List
+import httpx
+from typing import Callable, Dict, Any, List, Optional, Tuple
 import logging
+from app.core.pagination import (
+    ConditionalRequestCache,
+    RequestStats,
+    conditional_cache,
+    link_header_next_page,
+    paginate,
+)
+from app.core.rate_limit import (
+    PRIORITY_ENRICHMENT,
+    PRIORITY_LISTING,
+    RateLimitBudget,
+    RateLimitExceeded,
+    RateLimitedTransport,
+)
 
 GITHUB_API_URL = "https://api.github.com"
 GITHUB_TOKEN = os.getenv("GIT_API_KEY")
+# Maximum number of enrichment requests (releases/languages) in flight at once
+GITHUB_FETCH_CONCURRENCY = int(os.getenv("GITHUB_FETCH_CONCURRENCY", "8"))
+GITHUB_FETCH_TIMEOUT = float(os.getenv("GITHUB_FETCH_TIMEOUT", "15"))
+# Share of the hourly rate limit a sync may use; the rest is left for other users of the token
+GITHUB_RATE_LIMIT_SHARE = float(os.getenv("GITHUB_RATE_LIMIT_SHARE", "0.8"))
+# Longest a request waits for the rate limit before it is given up (enrichment is deferred)
+GITHUB_RATE_LIMIT_MAX_WAIT = float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", "60"))
 logger = logging.getLogger(__name__)
 
 logging.getLogger("app.domain.services.project_service").setLevel(logging.DEBUG)
@@ -30,14 +54,16 @@ def fetch_user_repositories(username: str) -> List[Dict[str, Any]]:
     if GITHUB_TOKEN:
         headers["Authorization"] = f"token {GITHUB_TOKEN}"
     
-    # First get all repositories
-    response = requests.get(
-        f"{GITHUB_API_URL}/users/{username}/repos",
-        headers=headers,
-        params={"sort": "updated", "per_page": 100}
-    )
-    response.raise_for_status()
-    repos = response.json()
+    # First get all repositories, following the Link header across pages
+    repos = []
+    url = f"{GITHUB_API_URL}/users/{username}/repos"
+    params = {"sort": "updated", "per_page": 100}
+    while url:
+        response = requests.get(url, headers=headers, params=params)
+        response.raise_for_status()
+        repos.extend(response.json())
+        url = response.links.get("next", {}).get("url")
+        params = None  # The next link already carries the query string
 
     # For each repo, check if it has releases
     for repo in repos:
@@ -73,6 +99,203 @@ def fetch_languages(owner: str, repo: str, github_token=None):
     return {}
 
 
+# Per-repository detail calls; everything else (repository listings) goes first
+_ENRICHMENT_PATH = re.compile(r"^/repos/[^/]+/[^/]+/(releases|languages)$")
+
+# The rate limit belongs to the token, so every client using it shares one
+# budget; REST ("core") and GraphQL are limited separately
+_budgets: Dict[Tuple[Optional[str], str], RateLimitBudget] = {}
+
+
+def rate_limit_budget(token: Optional[str] = GITHUB_TOKEN, resource: str = "core") -> RateLimitBudget:
+    key = (token, resource)
+    if key not in _budgets:
+        _budgets[key] = RateLimitBudget(
+            "GitHub" if resource == "core" else f"GitHub {resource}",
+            share=GITHUB_RATE_LIMIT_SHARE,
+            max_wait=GITHUB_RATE_LIMIT_MAX_WAIT,
+        )
+    return _budgets[key]
+
+
+def classify_request(request: httpx.Request) -> str:
+    return PRIORITY_ENRICHMENT if _ENRICHMENT_PATH.match(request.url.path) else PRIORITY_LISTING
+
+
+def create_github_client(
+    token: Optional[str] = GITHUB_TOKEN,
+    resource: str = "core",
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> httpx.AsyncClient:
+    """HTTP client for the GitHub API; long-lived clients keep their connections open.
+
+    Requests are paced and retried according to the token's rate limit budget
+    for `resource`. `transport` replaces the network, e.g. to replay fixtures.
+    """
+    headers = {"Accept": "application/vnd.github+json"}
+    if token:
+        headers["Authorization"] = f"token {token}"
+    return httpx.AsyncClient(
+        base_url=GITHUB_API_URL,
+        headers=headers,
+        timeout=GITHUB_FETCH_TIMEOUT,
+        transport=RateLimitedTransport(rate_limit_budget(token, resource), classify_request, transport),
+    )
+
+
+class AsyncGitHubFetcher:
+    """Fetch repositories plus their releases and languages over one shared HTTP client.
+
+    The per-repo `/releases` and `/languages` calls are fanned out concurrently,
+    bounded by `concurrency`, instead of being issued one after another.
+    Listing pages are revalidated with conditional requests; repositories on
+    unchanged pages are flagged `not_modified` and are not enriched again.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = GITHUB_TOKEN,
+        concurrency: int = GITHUB_FETCH_CONCURRENCY,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[ConditionalRequestCache] = conditional_cache,
+    ):
+        # A shared client (see create_github_client) is used as is and left open
+        self._owns_client = client is None
+        self._client = client or create_github_client(token)
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._cache = cache
+        self.stats = RequestStats()
+
+    async def __aenter__(self) -> "AsyncGitHubFetcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        async with self._semaphore:
+            response = await self._client.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def fetch_releases(self, owner: str, repo: str) -> List[Dict[str, Any]]:
+        # We only need to know if there are any releases
+        return await self._get_json(f"/repos/{owner}/{repo}/releases", params={"per_page": 1})
+
+    async def fetch_languages(self, owner: str, repo: str) -> Dict[str, int]:
+        return await self._get_json(f"/repos/{owner}/{repo}/languages")
+
+    async def _enrich_repository(self, repo: Dict[str, Any]) -> None:
+        """Attach release status and languages map to a repository payload."""
+        owner = (repo.get("owner") or {}).get("login")
+        name = repo.get("name")
+        releases, languages = await asyncio.gather(
+            self.fetch_releases(owner, name),
+            self.fetch_languages(owner, name),
+            return_exceptions=True,
+        )
+
+        if isinstance(releases, RateLimitExceeded) or isinstance(languages, RateLimitExceeded):
+            # Not enough budget left: keep the stored project instead of writing
+            # one without release status or languages
+            logger.warning(f"Deferred enrichment of {name}: rate limit budget exhausted")
+            repo["enrichment_deferred"] = True
+            return
+
+        if isinstance(releases, Exception):
+            logger.warning(f"Failed to fetch releases for {name}: {str(releases)}")
+            releases = []
+        # Check if there are any releases and if the latest one is a pre-release
+        repo["has_releases"] = len(releases) > 0
+        repo["is_prerelease"] = releases[0]["prerelease"] if releases else False
+
+        if isinstance(languages, Exception):
+            logger.error(f"Failed to fetch languages for {name}: {str(languages)}")
+            languages = {}
+        repo["languages_map"] = languages
+
+    async def fetch_repository(self, owner: str, name: str) -> Optional[Dict[str, Any]]:
+        """Fetch one repository, enriched like a listed one; None if it is gone or private."""
+        async with self._semaphore:
+            response = await self._client.get(f"/repos/{owner}/{name}")
+        if response.status_code in (301, 404):
+            # Renamed, transferred, deleted or no longer public
+            return None
+        response.raise_for_status()
+        repo = response.json()
+        if repo.get("private"):
+            return None
+        await self._enrich_repository(repo)
+        return repo
+
+    async def fetch_user_repositories(
+        self,
+        username: str,
+        is_unchanged: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Fetch all repositories for a GitHub user, enriched with releases and languages.
+
+        Enrichment of a page starts while the following pages are still being listed.
+        Repositories for which `is_unchanged` returns True are flagged
+        `not_modified` and not enriched. If it is given, it also decides for
+        the repositories of unchanged pages, which may be due for enrichment
+        all the same; without it, an unchanged page is enough.
+        """
+        repos: List[Dict[str, Any]] = []
+        enrichment = []
+        async for page in paginate(
+            self._client,
+            f"/users/{username}/repos",
+            next_page=link_header_next_page,
+            params={"sort": "updated", "per_page": 100},
+            cache=self._cache,
+            stats=self.stats,
+        ):
+            for repo in page.items:
+                if not repo:
+                    continue
+                unchanged = is_unchanged(repo) if is_unchanged is not None else page.not_modified
+                if unchanged:
+                    repo["not_modified"] = True
+                else:
+                    enrichment.append(asyncio.create_task(self._enrich_repository(repo)))
+                repos.append(repo)
+
+        await asyncio.gather(*enrichment)
+        logger.info(
+            f"Listed {len(repos)} GitHub repositories for {username} in {self.stats.requests} "
+            f"page requests ({self.stats.not_modified} not modified)"
+        )
+        return repos
+
+
+async def fetch_user_repositories_async(
+    username: str,
+    token: Optional[str] = GITHUB_TOKEN,
+    concurrency: int = GITHUB_FETCH_CONCURRENCY,
+    client: Optional[httpx.AsyncClient] = None,
+    is_unchanged: Optional[Callable[[Dict[str, Any]], bool]] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch all repositories for a GitHub user using the concurrent async fetcher."""
+    async with AsyncGitHubFetcher(token=token, concurrency=concurrency, client=client) as fetcher:
+        return await fetcher.fetch_user_repositories(username, is_unchanged)
+
+
+async def fetch_repository_async(
+    owner: str,
+    name: str,
+    token: Optional[str] = GITHUB_TOKEN,
+    client: Optional[httpx.AsyncClient] = None,
+) -> Optional[Dict[str, Any]]:
+    """Fetch one GitHub repository with releases and languages; None if it is gone or private."""
+    async with AsyncGitHubFetcher(token=token, client=client) as fetcher:
+        return await fetcher.fetch_repository(owner, name)
+
+
 def create_project_from_repo(repo: Dict[str, Any], github_token=None) -> Dict[str, Any]:
     """Create a project from a GitHub repository."""
     owner = repo["owner"]["login"]
@@ -82,8 +305,8 @@ def create_project_from_repo(repo: Dict[str, Any], github_token=None) -> Dict[st
     primary_language = repo.get("language")
     logger.info(f"Creating project from repo {repo_name} - Primary language: {primary_language}")
     
-    # Fetch and log languages map
-    languages_map = fetch_languages(owner, repo_name, github_token)
+    # Fetch and log languages map (already attached by AsyncGitHubFetcher)
+    languages_map = repo["languages_map"] if "languages_map" in repo else fetch_languages(owner, repo_name, github_token)
     logger.info(f"Languages map for {repo_name}: {languages_map}")
     
     return {
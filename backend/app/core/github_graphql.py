@@ -0,0 +1,197 @@
+import os
+import logging
+from typing import Any, Dict, List, Optional
+import httpx
+from app.core.github import GITHUB_TOKEN, create_github_client
+
+logger = logging.getLogger(__name__)
+
+# Repositories per page; 100 is the maximum of the GraphQL API
+GITHUB_GRAPHQL_PAGE_SIZE = int(os.getenv("GITHUB_GRAPHQL_PAGE_SIZE", "100"))
+# Languages per repository; REST /languages returns all of them, 100 is the maximum here
+GITHUB_GRAPHQL_LANGUAGES = 100
+GITHUB_GRAPHQL_TOPICS = 100
+
+# One page of a user's public repositories, with everything the REST sync
+# needs from /users/{user}/repos, /releases and /languages
+REPOSITORIES_QUERY = """
+query($login: String!, $first: Int!, $after: String, $languages: Int!, $topics: Int!) {
+  repositoryOwner(login: $login) {
+    repositories(
+      first: $first
+      after: $after
+      ownerAffiliations: OWNER
+      privacy: PUBLIC
+      orderBy: {field: UPDATED_AT, direction: DESC}
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        databaseId
+        name
+        description
+        url
+        homepageUrl
+        isArchived
+        isFork
+        stargazerCount
+        forkCount
+        diskUsage
+        hasWikiEnabled
+        updatedAt
+        pushedAt
+        owner { login avatarUrl }
+        primaryLanguage { name }
+        licenseInfo { name }
+        defaultBranchRef { name }
+        issues(states: OPEN) { totalCount }
+        pullRequests(states: OPEN) { totalCount }
+        repositoryTopics(first: $topics) { nodes { topic { name } } }
+        languages(first: $languages, orderBy: {field: SIZE, direction: DESC}) {
+          edges { size node { name } }
+        }
+        releases(first: 1, orderBy: {field: CREATED_AT, direction: DESC}) {
+          nodes { isPrerelease }
+        }
+        pages: deployments(environments: ["github-pages"], first: 1) { totalCount }
+      }
+    }
+  }
+  rateLimit { cost remaining resetAt }
+}
+"""
+
+
+class GitHubGraphQLError(Exception):
+    """The GraphQL API answered with errors instead of (complete) data."""
+
+
+def repository_from_node(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a GraphQL repository node like a REST repository payload.
+
+    Includes the fields the REST fetcher attaches (`has_releases`,
+    `is_prerelease`, `languages_map`), so the same project mapping and
+    fingerprint apply to both backends.
+    """
+    releases = (node.get("releases") or {}).get("nodes") or []
+    license_info = node.get("licenseInfo")
+    owner = node.get("owner") or {}
+    return {
+        "id": node.get("databaseId"),
+        "name": node.get("name"),
+        "description": node.get("description"),
+        "html_url": node.get("url"),
+        "homepage": node.get("homepageUrl"),
+        "archived": node.get("isArchived", False),
+        "fork": node.get("isFork", False),
+        "stargazers_count": node.get("stargazerCount", 0),
+        # REST reports stars as watchers_count too; subscribers are something else
+        "watchers_count": node.get("stargazerCount", 0),
+        "forks_count": node.get("forkCount", 0),
+        "size": node.get("diskUsage"),
+        "has_wiki": node.get("hasWikiEnabled", False),
+        # No GraphQL field; a github-pages deployment is the closest signal
+        "has_pages": ((node.get("pages") or {}).get("totalCount") or 0) > 0,
+        "updated_at": node.get("updatedAt"),
+        "pushed_at": node.get("pushedAt"),
+        "owner": {"login": owner.get("login"), "avatar_url": owner.get("avatarUrl")},
+        "language": (node.get("primaryLanguage") or {}).get("name"),
+        "license": {"name": license_info["name"]} if license_info else None,
+        "default_branch": (node.get("defaultBranchRef") or {}).get("name"),
+        # REST counts open pull requests as issues
+        "open_issues_count": (
+            ((node.get("issues") or {}).get("totalCount") or 0)
+            + ((node.get("pullRequests") or {}).get("totalCount") or 0)
+        ),
+        "topics": [
+            item["topic"]["name"] for item in (node.get("repositoryTopics") or {}).get("nodes") or []
+        ],
+        "languages_map": {
+            edge["node"]["name"]: edge["size"] for edge in (node.get("languages") or {}).get("edges") or []
+        },
+        "has_releases": len(releases) > 0,
+        "is_prerelease": releases[0]["isPrerelease"] if releases else False,
+    }
+
+
+class GitHubGraphQLFetcher:
+    """Fetch repositories with their latest release, languages and topics via GraphQL.
+
+    One request per 100 repositories instead of 1 + 2N REST calls. GraphQL has
+    no conditional requests, so every run sees full pages; the sync's
+    fingerprints still skip unchanged projects. Requires a token.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = GITHUB_TOKEN,
+        client: Optional[httpx.AsyncClient] = None,
+        page_size: int = GITHUB_GRAPHQL_PAGE_SIZE,
+    ):
+        self._owns_client = client is None
+        self._client = client or create_github_client(token, resource="graphql")
+        self._page_size = max(1, min(page_size, 100))
+        self.requests = 0
+        self.cost = 0
+
+    async def __aenter__(self) -> "GitHubGraphQLFetcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def _query(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        response = await self._client.post("/graphql", json={"query": query, "variables": variables})
+        self.requests += 1
+        response.raise_for_status()
+        payload = response.json()
+        data = payload.get("data")
+        errors = payload.get("errors")
+        if errors and not data:
+            raise GitHubGraphQLError("; ".join(error.get("message", str(error)) for error in errors))
+        if errors:
+            # Partial data, e.g. one field not resolvable; the rest is still usable
+            logger.warning(f"GitHub GraphQL returned errors: {errors}")
+        self.cost += ((data or {}).get("rateLimit") or {}).get("cost") or 0
+        return data or {}
+
+    async def fetch_user_repositories(self, username: str) -> List[Dict[str, Any]]:
+        repos: List[Dict[str, Any]] = []
+        cursor: Optional[str] = None
+        while True:
+            data = await self._query(REPOSITORIES_QUERY, {
+                "login": username,
+                "first": self._page_size,
+                "after": cursor,
+                "languages": GITHUB_GRAPHQL_LANGUAGES,
+                "topics": GITHUB_GRAPHQL_TOPICS,
+            })
+            owner = data.get("repositoryOwner")
+            if owner is None:
+                logger.warning(f"GitHub user {username} not found")
+                return []
+            connection = owner["repositories"]
+            repos.extend(repository_from_node(node) for node in connection["nodes"] if node)
+            page_info = connection["pageInfo"]
+            if not page_info["hasNextPage"]:
+                break
+            cursor = page_info["endCursor"]
+
+        logger.info(
+            f"Listed {len(repos)} GitHub repositories for {username} in {self.requests} "
+            f"GraphQL requests (cost {self.cost} points)"
+        )
+        return repos
+
+
+async def fetch_user_repositories_graphql(
+    username: str,
+    token: Optional[str] = GITHUB_TOKEN,
+    client: Optional[httpx.AsyncClient] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch all repositories for a GitHub user in pages of 100 via GraphQL."""
+    async with GitHubGraphQLFetcher(token=token, client=client) as fetcher:
+        return await fetcher.fetch_user_repositories(username)
@@ -1,25 +1,104 @@
 import os
 import requests
-from typing import Dict, Any, List
+import httpx
+from contextlib import asynccontextmanager
+from urllib.parse import quote
+from typing import Dict, Any, AsyncIterator, List, Optional
 import logging
+from app.core.pagination import (
+    ConditionalRequestCache,
+    RequestStats,
+    conditional_cache,
+    next_page_header,
+    paginate,
+)
 
 GITLAB_API_URL = "https://gitlab.com/api/v4"
 GITLAB_TOKEN = os.getenv("GITLAB_API_KEY")
+GITLAB_FETCH_TIMEOUT = float(os.getenv("GITLAB_FETCH_TIMEOUT", "15"))
 logger = logging.getLogger(__name__)
 
+def create_gitlab_client(token: Optional[str] = GITLAB_TOKEN) -> httpx.AsyncClient:
+    """HTTP client for the GitLab API; long-lived clients keep their connections open."""
+    headers = {"PRIVATE-TOKEN": token} if token else {}
+    return httpx.AsyncClient(base_url=GITLAB_API_URL, headers=headers, timeout=GITLAB_FETCH_TIMEOUT)
+
 def fetch_user_repositories(username: str) -> List[Dict[str, Any]]:
     """Fetch all repositories for a GitLab user."""
     headers = {}
     if GITLAB_TOKEN:
         headers["PRIVATE-TOKEN"] = GITLAB_TOKEN
     
-    response = requests.get(
-        f"{GITLAB_API_URL}/users/{username}/projects",
-        headers=headers,
-        params={"order_by": "updated_at", "per_page": 100}
+    repos = []
+    page = "1"
+    while page:
+        response = requests.get(
+            f"{GITLAB_API_URL}/users/{username}/projects",
+            headers=headers,
+            params={"order_by": "updated_at", "per_page": 100, "page": page}
+        )
+        response.raise_for_status()
+        repos.extend(response.json())
+        page = response.headers.get("X-Next-Page")
+    return repos
+
+async def fetch_user_repositories_async(
+    username: str,
+    token: Optional[str] = GITLAB_TOKEN,
+    cache: Optional[ConditionalRequestCache] = conditional_cache,
+    stats: Optional[RequestStats] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch all repositories for a GitLab user, following every page.
+
+    Pages are revalidated with conditional requests; repositories on pages
+    answered with 304 are flagged `not_modified`. A shared `client` is left open.
+    """
+    stats = stats if stats is not None else RequestStats()
+    repos: List[Dict[str, Any]] = []
+    async with _client_scope(client, token) as client:
+        async for page in paginate(
+            client,
+            f"/users/{username}/projects",
+            next_page=next_page_header,
+            params={"order_by": "updated_at", "per_page": 100},
+            cache=cache,
+            stats=stats,
+        ):
+            for repo in page.items:
+                if page.not_modified:
+                    repo["not_modified"] = True
+                repos.append(repo)
+
+    logger.info(
+        f"Listed {len(repos)} GitLab repositories for {username} in {stats.requests} "
+        f"page requests ({stats.not_modified} not modified)"
     )
+    return repos
+
+async def fetch_project_async(
+    path: str,
+    token: Optional[str] = GITLAB_TOKEN,
+    client: Optional[httpx.AsyncClient] = None,
+) -> Optional[Dict[str, Any]]:
+    """Fetch one GitLab project by its `namespace/path`; None if it is gone or not visible."""
+    async with _client_scope(client, token) as client:
+        response = await client.get(f"/projects/{quote(path, safe='')}")
+    if response.status_code == 404:
+        return None
     response.raise_for_status()
-    return response.json()
+    project = response.json()
+    if project.get("visibility", "public") != "public":
+        return None
+    return project
+
+@asynccontextmanager
+async def _client_scope(client: Optional[httpx.AsyncClient], token: Optional[str]) -> AsyncIterator[httpx.AsyncClient]:
+    if client is not None:
+        yield client
+        return
+    async with create_gitlab_client(token) as own_client:
+        yield own_client
 
 def create_project_from_repo(repo: Dict[str, Any]) -> Dict[str, Any]:
     """Create a project from a GitLab repository."""
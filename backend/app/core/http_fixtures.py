@@ -0,0 +1,85 @@
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Request headers (and with them the token) are not recorded at all; response
+# bodies are stored decoded, without their transfer headers
+_DROPPED_HEADERS = {"set-cookie", "content-encoding", "content-length", "transfer-encoding"}
+
+
+def _request_key(request: httpx.Request) -> Tuple[str, str, str]:
+    body = request.content.decode("utf-8") if request.content else ""
+    if body:
+        try:
+            # Key order and whitespace of a JSON body do not matter
+            body = json.dumps(json.loads(body), sort_keys=True)
+        except ValueError:
+            pass
+    return request.method, str(request.url), body
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Passes requests to the network and keeps request/response pairs for a fixture."""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self.interactions: List[Dict[str, Any]] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self._transport.handle_async_request(request)
+        # Decoded according to Content-Encoding, which is therefore not kept
+        body = await response.aread()
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in _DROPPED_HEADERS
+        }
+        method, url, request_body = _request_key(request)
+        self.interactions.append({
+            "request": {"method": method, "url": url, "body": request_body},
+            "response": {"status": response.status_code, "headers": headers, "body": body.decode("utf-8")},
+        })
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as out:
+            json.dump({"interactions": self.interactions}, out, indent=2, sort_keys=True)
+        logger.info(f"Recorded {len(self.interactions)} interaction(s) to {path}")
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Answers requests from a recorded fixture, without any network access.
+
+    Requests are matched on method, URL and body. Repeated requests get the
+    recorded responses in order, the last one again once they run out. An
+    unknown request fails, so a changed query shows up immediately.
+    """
+
+    def __init__(self, path: str):
+        with open(path) as source:
+            interactions = json.load(source)["interactions"]
+        self._responses: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+        for interaction in interactions:
+            request = interaction["request"]
+            key = _request_key(httpx.Request(
+                request["method"], request["url"], content=request["body"].encode("utf-8")
+            ))
+            self._responses.setdefault(key, []).append(interaction["response"])
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = _request_key(request)
+        responses = self._responses.get(key)
+        if not responses:
+            raise LookupError(f"No recorded response for {request.method} {request.url}")
+        recorded = responses.pop(0) if len(responses) > 1 else responses[0]
+        return httpx.Response(
+            recorded["status"],
+            headers=recorded["headers"],
+            content=recorded["body"].encode("utf-8"),
+            request=request,
+        )
@@ -0,0 +1,125 @@
+import threading
+import logging
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedPage:
+    """Validators and body of a listing page, kept to revalidate it later."""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    items: List[Dict[str, Any]]
+    next_url: Optional[str]
+
+
+@dataclass
+class Page:
+    url: str
+    items: List[Dict[str, Any]]
+    not_modified: bool = False
+
+
+@dataclass
+class RequestStats:
+    """Counts of listing requests issued during one fetch.
+
+    `not_modified` responses are tracked separately because conditional
+    requests answered with 304 do not count against the API rate limit.
+    """
+    requests: int = 0
+    not_modified: int = 0
+
+    @property
+    def rate_limited_requests(self) -> int:
+        return self.requests - self.not_modified
+
+
+class ConditionalRequestCache:
+    """Remember ETag / Last-Modified and the page body per URL."""
+
+    def __init__(self):
+        self._pages: Dict[str, CachedPage] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        with self._lock:
+            return self._pages.get(url)
+
+    def set(self, url: str, page: CachedPage) -> None:
+        with self._lock:
+            self._pages[url] = page
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+
+
+# Shared across sync runs of this process
+conditional_cache = ConditionalRequestCache()
+
+NextPageResolver = Callable[[httpx.Response], Optional[str]]
+
+
+def link_header_next_page(response: httpx.Response) -> Optional[str]:
+    """Resolve the next page from a `Link: <...>; rel="next"` header (GitHub)."""
+    return response.links.get("next", {}).get("url")
+
+
+def next_page_header(response: httpx.Response) -> Optional[str]:
+    """Resolve the next page from the `X-Next-Page` header (GitLab)."""
+    next_page = response.headers.get("X-Next-Page")
+    if not next_page:
+        return None
+    return str(response.url.copy_set_param("page", next_page))
+
+
+async def paginate(
+    client: httpx.AsyncClient,
+    url: str,
+    next_page: NextPageResolver,
+    params: Optional[Dict[str, Any]] = None,
+    cache: Optional[ConditionalRequestCache] = conditional_cache,
+    stats: Optional[RequestStats] = None,
+) -> AsyncIterator[Page]:
+    """Stream every page of a listing endpoint, using conditional requests.
+
+    Pages answered with 304 are served from the cache and flagged with
+    `not_modified` so callers can skip re-processing their items.
+    """
+    request_url: Optional[str] = str(client.build_request("GET", url, params=params).url)
+    stats = stats if stats is not None else RequestStats()
+
+    while request_url:
+        cached = cache.get(request_url) if cache else None
+        headers = {}
+        if cached and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        response = await client.get(request_url, headers=headers)
+        stats.requests += 1
+
+        if response.status_code == 304 and cached:
+            stats.not_modified += 1
+            logger.debug(f"Listing page not modified: {request_url}")
+            yield Page(request_url, [dict(item) for item in cached.items], not_modified=True)
+            request_url = cached.next_url
+            continue
+
+        response.raise_for_status()
+        items = response.json()
+        next_url = next_page(response)
+        if cache:
+            cache.set(request_url, CachedPage(
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                items=[dict(item) for item in items],
+                next_url=next_url,
+            ))
+        yield Page(request_url, items)
+        request_url = next_url
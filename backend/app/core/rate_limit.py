@@ -0,0 +1,244 @@
+import re
+import time
+import random
+import asyncio
+import logging
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Optional
+import httpx
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_LISTING = "listing"
+PRIORITY_ENRICHMENT = "enrichment"
+
+_SECONDARY_LIMIT = re.compile(rb"secondary rate limit|abuse detection", re.IGNORECASE)
+
+
+class RateLimitExceeded(Exception):
+    """The request would have to wait longer than allowed for the rate limit to reset."""
+
+    def __init__(self, message: str, retry_at: Optional[float] = None):
+        super().__init__(message)
+        self.retry_at = retry_at
+
+
+@dataclass
+class RateLimitUsage:
+    """Counters of one budget; subtract two snapshots for the usage in between."""
+    requests: int = 0
+    listing_requests: int = 0
+    enrichment_requests: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    deferred: int = 0
+    waited_ms: int = 0
+
+    def __sub__(self, other: "RateLimitUsage") -> "RateLimitUsage":
+        return RateLimitUsage(**{name: value - getattr(other, name) for name, value in asdict(self).items()})
+
+
+class RateLimitBudget:
+    """The rate limit of one API token, as last reported by the server.
+
+    Remaining requests and reset time are read from `X-RateLimit-*` (GitHub)
+    or `RateLimit-*` (GitLab) response headers. Only `share` of the limit is
+    used freely; the rest is a reserve for other users of the same token.
+
+    - Listing calls are never paced and may use the reserve, so a sync always
+      gets to see every repository.
+    - Enrichment calls stop at the reserve, and once the freely usable budget
+      gets low they are spread evenly over the time left until the reset.
+    - A secondary rate limit or `Retry-After` pauses every request; listing
+      calls go first when it ends.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        share: float = 0.8,
+        burst: int = 100,
+        max_wait: float = 60.0,
+        max_retries: int = 3,
+        backoff_base: float = 1.0
+    ):
+        self.name = name
+        self.share = min(max(share, 0.0), 1.0)
+        self.burst = burst
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.usage = RateLimitUsage()
+        self._blocked_until = 0.0
+        self._next_slot = 0.0
+        self._in_flight = 0
+        self._listing_waiting = 0
+
+    @property
+    def reserve(self) -> int:
+        return round((self.limit or 0) * (1 - self.share))
+
+    def _usable(self, priority: str) -> Optional[int]:
+        """Requests this priority may still send in the current window; None if unknown."""
+        if self.remaining is None:
+            return None
+        floor = 0 if priority == PRIORITY_LISTING else self.reserve
+        return self.remaining - self._in_flight - floor
+
+    async def acquire(self, priority: str) -> None:
+        """Wait until a request of this priority may be sent."""
+        if priority == PRIORITY_LISTING:
+            self._listing_waiting += 1
+        try:
+            while True:
+                now = time.time()
+                usable = self._usable(priority)
+                paced = False
+                if self._blocked_until > now:
+                    delay = self._blocked_until - now
+                elif usable is not None and usable <= 0:
+                    if not self.reset_at or self.reset_at <= now:
+                        # Numbers of a past window; the next response refreshes them
+                        self.remaining = None
+                        continue
+                    # Window used up for this priority: only the reset helps
+                    delay = self.reset_at - now
+                elif priority == PRIORITY_ENRICHMENT and self._listing_waiting:
+                    # Listing calls go first when a pause ends
+                    await asyncio.sleep(0.05)
+                    continue
+                elif priority == PRIORITY_ENRICHMENT:
+                    delay = self._pace(now, usable)
+                    paced = True
+                else:
+                    delay = 0.0
+                if delay <= 0:
+                    break
+                if delay > self.max_wait:
+                    self.usage.deferred += 1
+                    raise RateLimitExceeded(
+                        f"{self.name} rate limit: {priority} request would wait {delay:.0f}s",
+                        retry_at=now + delay
+                    )
+                self.usage.waited_ms += int(delay * 1000)
+                await asyncio.sleep(delay)
+                if paced:
+                    # The slot reserved by _pace is ours now
+                    break
+        finally:
+            if priority == PRIORITY_LISTING:
+                self._listing_waiting -= 1
+        self._in_flight += 1
+
+    def _pace(self, now: float, usable: Optional[int]) -> float:
+        """Delay before the next enrichment call; 0 while the budget allows bursts."""
+        if usable is None or usable > self.burst or not self.reset_at:
+            self._next_slot = 0.0
+            return 0.0
+        interval = max(self.reset_at - now, 0) / max(usable, 1)
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + interval
+        return slot - now
+
+    def release(self, response: Optional[httpx.Response], priority: str) -> None:
+        self._in_flight -= 1
+        if response is None:
+            return
+        self.usage.requests += 1
+        if priority == PRIORITY_LISTING:
+            self.usage.listing_requests += 1
+        else:
+            self.usage.enrichment_requests += 1
+        headers = response.headers
+        limit = headers.get("X-RateLimit-Limit") or headers.get("RateLimit-Limit")
+        remaining = headers.get("X-RateLimit-Remaining") or headers.get("RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset") or headers.get("RateLimit-Reset")
+        try:
+            if limit is not None:
+                self.limit = int(limit)
+            if remaining is not None:
+                self.remaining = int(remaining)
+            if reset is not None:
+                self.reset_at = float(reset)
+        except ValueError:
+            pass
+
+    def backoff(self, response: httpx.Response, attempt: int) -> Optional[float]:
+        """Seconds to pause everything before retrying, or None if not rate limited."""
+        if response.status_code not in (403, 429):
+            return None
+        now = time.time()
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                delay = self.backoff_base
+        elif self.remaining == 0 and self.reset_at:
+            # Primary limit used up
+            delay = self.reset_at - now + 1
+        elif response.status_code == 429 or _SECONDARY_LIMIT.search(response.content or b""):
+            # Exponential backoff with full jitter, so parallel requests do not retry in lockstep
+            delay = random.uniform(0, self.backoff_base * 2 ** attempt) + self.backoff_base
+        else:
+            # A plain 403 (permissions) is not a rate limit
+            return None
+        self.usage.rate_limited += 1
+        self._blocked_until = max(self._blocked_until, now + delay)
+        logger.warning(f"{self.name} rate limited ({response.status_code}); pausing requests for {delay:.1f}s")
+        return delay
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset_at": self.reset_at,
+            "share": self.share,
+            "reserve": self.reserve,
+            "paused_until": self._blocked_until if self._blocked_until > time.time() else None,
+            **asdict(self.usage),
+        }
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """Sends every request of a client through a RateLimitBudget.
+
+    `classify` tells listing from enrichment requests. Rate limited responses
+    (429, secondary-limit 403) are retried after the pause the budget chose.
+    """
+
+    def __init__(
+        self,
+        budget: RateLimitBudget,
+        classify: Callable[[httpx.Request], str],
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self._budget = budget
+        self._classify = classify
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        priority = self._classify(request)
+        attempt = 0
+        while True:
+            await self._budget.acquire(priority)
+            response = None
+            try:
+                response = await self._transport.handle_async_request(request)
+                if response.status_code in (403, 429):
+                    # Small error bodies; needed to recognise secondary limits
+                    await response.aread()
+            finally:
+                self._budget.release(response, priority)
+            delay = self._budget.backoff(response, attempt)
+            if delay is None or attempt >= self._budget.max_retries or delay > self._budget.max_wait:
+                return response
+            await response.aclose()
+            attempt += 1
+            self._budget.usage.retries += 1
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
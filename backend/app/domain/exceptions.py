@@ -2,10 +2,22 @@ class FileValidationError(Exception):
     """Raised when a file validation fails"""
     pass
 
+class FileTooLargeError(FileValidationError):
+    """Raised when an upload exceeds the maximum file size"""
+    pass
+
 class FileNotFoundError(Exception):
     """Raised when a file is not found"""
     pass
 
 class FileOperationError(Exception):
     """Raised when a file operation fails"""
-    pass 
\ No newline at end of file
+    pass
+
+class UploadOffsetError(FileValidationError):
+    """Raised when a chunk does not continue a resumable upload where it stopped"""
+    pass
+
+class ChecksumMismatchError(FileValidationError):
+    """Raised when a chunk does not match its declared checksum"""
+    pass
@@ -1,7 +1,23 @@
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
+# Keys the file listing can be sorted by
+FILE_SORT_FIELDS = ("name", "size", "created_at")
+
+# Operations of a file batch
+BATCH_MOVE = "move"
+BATCH_DELETE = "delete"
+BATCH_ADD_TAGS = "add_tags"
+BATCH_REMOVE_TAGS = "remove_tags"
+BATCH_OPERATIONS = (BATCH_MOVE, BATCH_DELETE, BATCH_ADD_TAGS, BATCH_REMOVE_TAGS)
+
+# Content that can reference uploads, as recorded in the usage index
+USAGE_PROJECT = "project"
+USAGE_POST = "post"
+USAGE_SECTION = "section"
+
 class File:
     def __init__(
         self,
@@ -15,7 +31,10 @@ class File:
         created_at: Optional[datetime] = None,
         updated_at: Optional[datetime] = None,
         tags: Optional[List[str]] = None,
-        used_in: Optional[Dict[str, str]] = None
+        used_in: Optional[Dict[str, List[int]]] = None,
+        content_hash: Optional[str] = None,
+        variants: Optional[Dict[str, Any]] = None,
+        tree_path: Optional[str] = None
     ):
         self.id = id
         self.name = name
@@ -27,4 +46,64 @@ class File:
         self.created_at = created_at
         self.updated_at = updated_at
         self.tags = tags or []
-        self.used_in = used_in or {} 
\ No newline at end of file
+        self.used_in = used_in or {}
+        self.content_hash = content_hash
+        self.variants = variants
+        self.tree_path = tree_path 
+
+
+@dataclass
+class FileQuery:
+    """One page of a folder listing, continuing after `cursor`."""
+    parent_id: Optional[str] = None
+    sort: str = "name"
+    descending: bool = False
+    limit: int = 100
+    cursor: Optional[str] = None
+    mime_prefix: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+    # Only files that no project, post or section references
+    unused: bool = False
+
+
+@dataclass
+class FileUsage:
+    """A field of a project, post or section that references a file's blob."""
+    owner_type: str
+    owner_id: int
+    field: str
+
+
+@dataclass
+class FilePage:
+    """Listing rows, projected to the columns the file browser shows."""
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str]
+    total: int
+    total_is_estimate: bool
+
+
+@dataclass
+class FileBatchOperation:
+    """One operation of a batch, applied to all `ids` at once."""
+    op: str
+    ids: List[str]
+    parent_id: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+
+
+@dataclass
+class FileBatchItemResult:
+    """Outcome for one id of one batch operation: ok, not_found, skipped or error."""
+    operation: int
+    id: str
+    status: str
+    detail: Optional[str] = None
+
+
+@dataclass
+class FileCreateResult:
+    """Outcome for one file of a multi-file create: the new row or why it failed."""
+    name: str
+    file: Optional[File] = None
+    error: Optional[str] = None
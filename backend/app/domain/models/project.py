@@ -43,6 +43,8 @@ class Project(BaseModel):
     topics: List[str] | None = None
     default_branch: str | None = None
     last_updated: datetime | None = None
+    sync_fingerprint: str | None = None
+    synced_at: datetime | None = None
     
     # Timestamps
     created_at: datetime | None = None
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from app.domain.models.file import File
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from app.domain.models.file import File, FileQuery, FilePage, FileUsage, FileBatchOperation, FileBatchItemResult
 
 class FileManagerRepository(ABC):
     @abstractmethod
@@ -11,18 +12,100 @@ class FileManagerRepository(ABC):
     def list_files(self, parent_id: Optional[str] = None) -> List[File]:
         pass
 
+    @abstractmethod
+    def list_files_page(self, query: FileQuery) -> FilePage:
+        """A sorted, filtered page of a folder, keyset-paginated by cursor."""
+        pass
+
     @abstractmethod
     def create_file(self, file: File) -> File:
         pass
 
+    @abstractmethod
+    def create_files(self, files: List[File]) -> List[File]:
+        """Insert many rows in one transaction, in the given order."""
+        pass
+
+    @abstractmethod
+    def existing_names(self, parent_id: Optional[str], names: Iterable[str]) -> Set[str]:
+        """Those of the names that are already taken in a folder."""
+        pass
+
+    @abstractmethod
+    def get_variants_by_content_hashes(self, content_hashes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Image variants already rendered for the given contents, keyed by hash."""
+        pass
+
+    @abstractmethod
+    def get_by_content_hash(self, content_hash: str) -> Optional[File]:
+        """Get any file row that stores the given content."""
+        pass
+
+    @abstractmethod
+    def unreferenced_content_hashes(self, content_hashes: Iterable[str]) -> Set[str]:
+        """Those of the given hashes that no file row references any more."""
+        pass
+
+    @abstractmethod
+    def list_referenced_paths(self) -> Set[str]:
+        """Paths of all stored blobs that are referenced by a file row."""
+        pass
+
+    @abstractmethod
+    def get_usages(self, path: str) -> List[FileUsage]:
+        """The project, post and section fields that reference a blob."""
+        pass
+
+    @abstractmethod
+    def used_paths(self, paths: Iterable[str]) -> Set[str]:
+        """Those of the blob paths that some content references."""
+        pass
+
+    @abstractmethod
+    def list_unused_files(self, created_before: datetime, limit: int) -> List[File]:
+        """Oldest files, created before the given time, that no content references."""
+        pass
+
+    @abstractmethod
+    def set_variants_by_content_hash(self, content_hash: str, variants: Dict[str, Any]) -> int:
+        """Record generated image variants on every row storing the content."""
+        pass
+
+    @abstractmethod
+    def get_variants_by_paths(self, paths: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Image variants keyed by blob path, for the paths that have any."""
+        pass
+
     @abstractmethod
     def update_file(self, file_id: str, file: File) -> Optional[File]:
         pass
 
     @abstractmethod
-    def delete_file(self, file_id: str) -> bool:
+    def delete_file(self, file_id: str) -> List[File]:
+        """Delete a file or a folder with its whole subtree; returns the removed rows."""
         pass
 
     @abstractmethod
     def move_file(self, file_id: str, new_parent_id: Optional[str] = None) -> Optional[File]:
-        pass 
\ No newline at end of file
+        """Move a file or a folder with its subtree; refuses to create cycles."""
+        pass
+
+    @abstractmethod
+    def list_subtree(self, folder_id: str) -> List[File]:
+        """All descendants of a folder, depth first."""
+        pass
+
+    @abstractmethod
+    def get_subtree_size(self, folder_id: str) -> int:
+        """Total size of the files below a folder."""
+        pass
+
+    @abstractmethod
+    def get_breadcrumbs(self, file_id: str) -> List[File]:
+        """The ancestors of a file from the root down, ending with the file itself."""
+        pass 
+
+    @abstractmethod
+    def apply_batch(self, operations: List[FileBatchOperation]) -> Tuple[List[FileBatchItemResult], List[File]]:
+        """Apply all operations in one transaction; returns per-id results and the deleted rows."""
+        pass
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 from sqlalchemy import and_, or_, Column
 from sqlalchemy.orm import Session
 from app.domain.models.project import Project
@@ -7,37 +8,67 @@ from app.schemas.project import ProjectCreate, ProjectUpdate
 
 class ProjectRepository(ABC):
     @abstractmethod
-    def get_by_id(self, project_id: int) -> Optional[Project]:
+    async def get_by_id(self, project_id: int) -> Optional[Project]:
         """Get a project by its ID."""
         pass
 
     @abstractmethod
-    def get_all(self) -> List[Project]:
+    async def get_all(self) -> List[Project]:
         """Get all projects."""
         pass
 
     @abstractmethod
-    def get_visible(self) -> List[Project]:
+    async def get_visible(self) -> List[Project]:
         """Get all visible projects."""
         pass
 
     @abstractmethod
-    def get_by_name_and_source(self, name: str, source_type: str, source_username: str) -> Optional[Project]:
+    async def get_by_name_and_source(self, name: str, source_type: str, source_username: str) -> Optional[Project]:
         """Get a project by its name and source information."""
         pass
 
     @abstractmethod
-    def create(self, project: Project) -> Project:
+    async def get_by_source(self, source_type: str, source_username: str) -> List[Project]:
+        """Get all projects of a source."""
+        pass
+
+    @abstractmethod
+    async def get_by_names_and_source(self, keys: Iterable[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], Project]:
+        """Get existing projects for many (name, source_type, source_username) keys at once."""
+        pass
+
+    @abstractmethod
+    async def get_sync_fingerprints(self, source_type: str, source_username: str) -> Dict[str, Tuple[int, Optional[str], Optional[datetime]]]:
+        """Get (id, sync fingerprint, synced at) of every project of a source, keyed by name."""
+        pass
+
+    @abstractmethod
+    async def mark_synced(self, project_ids: Iterable[int]) -> None:
+        """Record that these projects were found unchanged against their full remote payload."""
+        pass
+
+    @abstractmethod
+    async def create(self, project: Project) -> Project:
         """Create a new project."""
         pass
 
     @abstractmethod
-    def update(self, project_id: int, project: Project) -> Optional[Project]:
+    async def update(self, project_id: int, project: Project) -> Optional[Project]:
         """Update an existing project."""
         pass
 
     @abstractmethod
-    def delete(self, project_id: int) -> bool:
+    async def bulk_upsert(self, projects: List[Project]) -> List[Project]:
+        """Create or update many projects in one transaction, matched by name and source."""
+        pass
+
+    @abstractmethod
+    async def upsert(self, project: Project) -> Project:
+        """Create or update one project, matched by name and source."""
+        pass
+
+    @abstractmethod
+    async def delete(self, project_id: int) -> bool:
         """Delete a project."""
         pass
 
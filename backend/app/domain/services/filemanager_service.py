@@ -1,16 +1,37 @@
-from datetime import datetime
-from typing import List, Optional, Set
-from app.domain.models.file import File
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from app.domain.models.file import (
+    File, FileQuery, FilePage, FileUsage, FileBatchOperation, FileBatchItemResult, FileCreateResult,
+    FILE_SORT_FIELDS, BATCH_OPERATIONS, BATCH_ADD_TAGS, BATCH_REMOVE_TAGS
+)
 from app.domain.repositories.filemanager_repository import FileManagerRepository
-from app.domain.exceptions import FileValidationError
+from app.domain.exceptions import FileValidationError, FileTooLargeError, FileNotFoundError, FileOperationError
 
 class FileManagerService:
-    def __init__(self, repository: FileManagerRepository):
+    def __init__(
+        self,
+        repository: FileManagerRepository,
+        release_blob: Optional[Callable[[File], None]] = None,
+        on_image_saved: Optional[Callable[[File], None]] = None
+    ):
         self._repository = repository
+        # Called with a deleted file once neither a file row nor content references its blob
+        self._release_blob = release_blob
+        # Called with a newly stored image that has no variants yet
+        self._on_image_saved = on_image_saved
         self.allowed_image_types: Set[str] = {"image/jpeg", "image/png", "image/gif"}
         self.allowed_video_types: Set[str] = {"video/mp4", "video/webm"}
         self.allowed_doc_types: Set[str] = {"application/pdf", "text/plain"}
         self.max_file_size = 10 * 1024 * 1024  # 10MB
+        # Videos arrive in checksummed chunks through resumable uploads
+        self.max_video_size = 2 * 1024 * 1024 * 1024  # 2GB
+
+    @property
+    def allowed_types(self) -> Set[str]:
+        return self.allowed_image_types | self.allowed_video_types | self.allowed_doc_types
+
+    def max_size_for(self, content_type: str) -> int:
+        return self.max_video_size if content_type in self.allowed_video_types else self.max_file_size
 
     def get_file(self, file_id: str) -> Optional[File]:
         return self._repository.get_file(file_id)
@@ -18,30 +39,119 @@ class FileManagerService:
     def list_files(self, parent_id: Optional[str] = None) -> List[File]:
         return self._repository.list_files(parent_id)
 
+    def get_usages(self, file_id: str) -> List[FileUsage]:
+        """Where a file is used, from the usage index."""
+        return self._repository.get_usages(self._repository.get_file(file_id).path)
+
+    def list_unused_files(self, older_than: timedelta, limit: int = 1000) -> List[File]:
+        return self._repository.list_unused_files(datetime.now().astimezone() - older_than, limit)
+
+    def list_files_page(self, query: FileQuery) -> FilePage:
+        if query.sort not in FILE_SORT_FIELDS:
+            raise FileValidationError(f"Cannot sort by {query.sort}. Allowed: {', '.join(FILE_SORT_FIELDS)}")
+        return self._repository.list_files_page(query)
+
     def _validate_file(self, content_type: str, size: int) -> None:
-        if content_type not in self.allowed_image_types | self.allowed_video_types | self.allowed_doc_types:
+        if content_type not in self.allowed_types:
             raise FileValidationError(
                 f"File type {content_type} not allowed. Allowed types: images, videos, documents"
             )
 
-        if size > self.max_file_size:
-            raise FileValidationError(
-                f"File too large. Maximum size is {self.max_file_size / 1024 / 1024}MB"
+        max_size = self.max_size_for(content_type)
+        if size > max_size:
+            raise FileTooLargeError(
+                f"File too large. Maximum size is {max_size / 1024 / 1024}MB"
             )
 
-    async def create_file(self, name: str, content_type: str, size: int, parent_id: Optional[str] = None, path: Optional[str] = None) -> File:
+    def create_file(self, name: str, content_type: str, size: int, parent_id: Optional[str] = None, path: Optional[str] = None, content_hash: Optional[str] = None) -> File:
         self._validate_file(content_type, size)
 
+        # Content that is already stored keeps the variants rendered for it
+        variants = None
+        if content_hash:
+            existing = self._repository.get_by_content_hash(content_hash)
+            variants = existing.variants if existing else None
+
         file_obj = File(
             name=name,
             path=path or f"/files/{name}",  # Use provided path or default
             parent_id=parent_id,
             is_folder=False,
             size=size,
-            mime_type=content_type
+            mime_type=content_type,
+            content_hash=content_hash,
+            variants=variants
         )
 
-        return self._repository.create_file(file_obj)
+        created = self._repository.create_file(file_obj)
+        if not variants and content_type in self.allowed_image_types and self._on_image_saved:
+            self._on_image_saved(created)
+        return created
+
+    def create_files(self, files: List[File]) -> List[FileCreateResult]:
+        """Create many file rows in one transaction.
+
+        Invalid files and name clashes are reported per file instead of failing
+        the others. Results are in the order of `files`.
+        """
+        results = [FileCreateResult(name=file.name) for file in files]
+        accepted: List[Tuple[FileCreateResult, File]] = []
+        names_by_folder: Dict[Optional[str], Set[str]] = {}
+        for result, file in zip(results, files):
+            try:
+                self._validate_file(file.mime_type, file.size)
+            except FileValidationError as e:
+                result.error = str(e)
+                continue
+            file.parent_id = str(file.parent_id) if file.parent_id else None
+            names = names_by_folder.setdefault(file.parent_id, set())
+            if file.name in names:
+                result.error = f"A file named {file.name} already exists in this folder"
+                continue
+            names.add(file.name)
+            accepted.append((result, file))
+
+        # One lookup per target folder, usually just one
+        taken = {
+            parent_id: self._repository.existing_names(parent_id, names)
+            for parent_id, names in names_by_folder.items()
+        }
+        for result, file in accepted:
+            if file.name in taken[file.parent_id]:
+                result.error = f"A file named {file.name} already exists in this folder"
+        accepted = [(result, file) for result, file in accepted if not result.error]
+
+        # Content that is already stored keeps the variants rendered for it
+        variants = self._repository.get_variants_by_content_hashes(file.content_hash for _, file in accepted)
+        for _, file in accepted:
+            file.is_folder = False
+            file.variants = variants.get(file.content_hash)
+        try:
+            created = self._repository.create_files([file for _, file in accepted])
+        except (FileNotFoundError, FileOperationError) as e:
+            for result, _ in accepted:
+                result.error = str(e)
+            return results
+
+        for (result, _), file in zip(accepted, created):
+            result.file = file
+            if not file.variants and file.mime_type in self.allowed_image_types and self._on_image_saved:
+                self._on_image_saved(file)
+        return results
+
+    def create_file_from_hash(self, name: str, content_hash: str, parent_id: Optional[str] = None) -> File:
+        """Add a file row for content that is already stored; no bytes are transferred."""
+        existing = self._repository.get_by_content_hash(content_hash)
+        if not existing:
+            raise FileNotFoundError(f"No stored content with hash {content_hash}")
+        return self.create_file(
+            name=name,
+            content_type=existing.mime_type,
+            size=existing.size,
+            parent_id=parent_id,
+            path=existing.path,
+            content_hash=content_hash
+        )
 
     def create_folder(self, name: str, parent_id: Optional[str] = None) -> File:
         folder_obj = File(
@@ -53,24 +163,57 @@ class FileManagerService:
 
         return self._repository.create_file(folder_obj)
 
-    def update_file(self, file_id: str, file_in: File) -> Optional[File]:
-        existing_file = self.get_file(file_id)
-        if not existing_file:
-            return None
-
-        file_in.id = file_id
-        file_in.created_at = existing_file.created_at
-
-        return self._repository.update_file(file_id, file_in)
-
-    def delete_file(self, file_id: str) -> bool:
-        return self._repository.delete_file(file_id)
+    def update_file(self, file_id: str, name: Optional[str] = None, parent_id: Optional[str] = None) -> File:
+        file = self._repository.get_file(file_id)
+        if parent_id is not None and str(parent_id) != str(file.parent_id):
+            file = self._repository.move_file(file_id, str(parent_id))
+        if name is not None and name != file.name:
+            file.name = name
+            file = self._repository.update_file(file_id, file)
+        return file
+
+    def delete_file(self, file_id: str) -> List[File]:
+        """Delete a file, or a folder with everything below it."""
+        removed = self._repository.delete_file(file_id)
+        self.release_blobs(self.unreferenced_blobs(removed))
+        return removed
+
+    def apply_batch(self, operations: List[FileBatchOperation]) -> Tuple[List[FileBatchItemResult], List[File]]:
+        """Apply a batch in one transaction.
+
+        Returns per-id results and one file per stored blob that lost its last
+        reference; pass those to `release_blobs` once the response is out.
+        """
+        for operation in operations:
+            if operation.op not in BATCH_OPERATIONS:
+                raise FileValidationError(f"Unknown operation {operation.op}. Allowed: {', '.join(BATCH_OPERATIONS)}")
+            if operation.op in (BATCH_ADD_TAGS, BATCH_REMOVE_TAGS) and not operation.tags:
+                raise FileValidationError(f"Operation {operation.op} needs at least one tag")
+        results, removed = self._repository.apply_batch(operations)
+        return results, self.unreferenced_blobs(removed)
+
+    def unreferenced_blobs(self, removed: List[File]) -> List[File]:
+        """One of the removed files per stored blob that nothing references any more."""
+        by_hash = {file.content_hash: file for file in removed if file.content_hash}
+        candidates = [by_hash[content_hash] for content_hash in self._repository.unreferenced_content_hashes(by_hash)]
+        # Projects, posts or sections may still link the blob directly
+        in_use = self._repository.used_paths(file.path for file in candidates)
+        return [file for file in candidates if file.path not in in_use]
+
+    def release_blobs(self, files: List[File]) -> None:
+        # Drop blobs together with their last reference
+        if self._release_blob:
+            for file in files:
+                self._release_blob(file)
 
     def move_file(self, file_id: str, new_parent_id: Optional[str] = None) -> Optional[File]:
-        file = self.get_file(file_id)
-        if not file:
-            return None
+        return self._repository.move_file(file_id, new_parent_id)
+
+    def list_subtree(self, folder_id: str) -> List[File]:
+        return self._repository.list_subtree(folder_id)
 
-        file.parent_id = new_parent_id
+    def get_folder_size(self, folder_id: str) -> int:
+        return self._repository.get_subtree_size(folder_id)
 
-        return self._repository.move_file(file_id, new_parent_id) 
\ No newline at end of file
+    def get_breadcrumbs(self, file_id: str) -> List[File]:
+        return self._repository.get_breadcrumbs(file_id)
@@ -12,30 +12,31 @@ class GitLabService:
         repos = fetch_user_repositories(username)
         projects = []
 
+        # One query for all repositories instead of one lookup per repo
+        existing_projects = await self._project_repository.get_by_names_and_source(
+            (repo["name"], "gitlab", username) for repo in repos
+        )
+
         for repo in repos:
             project_data = create_project_from_repo(repo)
-            existing = self._project_repository.get_by_name_and_source(
-                name=repo["name"],
-                source_type="gitlab",
-                source_username=username
-            )
+            existing = existing_projects.get((repo["name"], "gitlab", username))
 
             if existing:
                 # Update existing project
                 for key, value in project_data.items():
                     setattr(existing, key, value)
-                self._project_repository.update(existing.id, existing)
+                await self._project_repository.update(existing.id, existing)
             else:
                 # Create new project
                 project = Project(**project_data)
-                self._project_repository.create(project)
+                await self._project_repository.create(project)
             projects.append(project_data)
 
         return projects
 
     async def get_projects(self, username: str) -> List[Project]:
         """Get all GitLab projects for a user."""
-        return self._project_repository.get_by_source(
+        return await self._project_repository.get_by_source(
             source_type="gitlab",
             source_username=username
         ) 
\ No newline at end of file
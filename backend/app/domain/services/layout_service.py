@@ -14,7 +14,7 @@ class LayoutService:
 
     async def get_layout(self) -> Optional[Layout]:
         """Get the current layout configuration."""
-        layout = self._layout_repository.get()
+        layout = await self._layout_repository.get()
         if not layout:
             # Create default layout if none exists
             default_layout = Layout(
@@ -23,12 +23,12 @@ class LayoutService:
                 show_sidebar=True,
                 sidebar_position="left"
             )
-            layout = self._layout_repository.create(default_layout)
+            layout = await self._layout_repository.create(default_layout)
         return layout
 
     async def update_layout(self, layout_id: int, layout: LayoutUpdate) -> Optional[Layout]:
         """Update the layout configuration."""
-        existing_layout = self._layout_repository.get()
+        existing_layout = await self._layout_repository.get()
         if not existing_layout:
             return None
 
@@ -37,24 +37,24 @@ class LayoutService:
         for key, value in update_data.items():
             setattr(existing_layout, key, value)
 
-        return self._layout_repository.update(layout_id, existing_layout)
+        return await self._layout_repository.update(layout_id, existing_layout)
 
     async def get_templates(self) -> List[LayoutTemplate]:
         """Get all available layout templates."""
-        return self._layout_repository.get_templates()
+        return await self._layout_repository.get_templates()
 
     async def get_template(self, template_id: int) -> Optional[LayoutTemplate]:
         """Get a specific layout template by ID."""
-        return self._layout_repository.get_template(template_id)
+        return await self._layout_repository.get_template(template_id)
 
     async def apply_template(self, template_id: int) -> Optional[Layout]:
         """Apply a layout template."""
-        template = self._layout_repository.get_template(template_id)
+        template = await self._layout_repository.get_template(template_id)
         if not template:
             return None
 
         # Get current layout
-        layout = self._layout_repository.get()
+        layout = await self._layout_repository.get()
         if not layout:
             # Create new layout if none exists
             layout = Layout(
@@ -63,11 +63,11 @@ class LayoutService:
                 show_sidebar=template.show_sidebar,
                 sidebar_position=template.sidebar_position
             )
-            return self._layout_repository.create(layout)
+            return await self._layout_repository.create(layout)
         else:
             # Update existing layout
             layout.sections_order = template.sections_order
             layout.layout_type = template.layout_type
             layout.show_sidebar = template.show_sidebar
             layout.sidebar_position = template.sidebar_position
-            return self._layout_repository.update(layout.id, layout) 
\ No newline at end of file
+            return await self._layout_repository.update(layout.id, layout) 
\ No newline at end of file
@@ -10,19 +10,19 @@ class ThemeService:
     async def create_theme(self, theme: ThemeCreate) -> Theme:
         """Create a new theme."""
         theme_model = Theme(**theme.model_dump())
-        return self._theme_repository.create(theme_model)
+        return await self._theme_repository.create(theme_model)
 
     async def get_theme(self, theme_id: int) -> Optional[Theme]:
         """Get a theme by ID."""
-        return self._theme_repository.get(theme_id)
+        return await self._theme_repository.get(theme_id)
 
     async def get_all_themes(self) -> List[Theme]:
         """Get all themes."""
-        return self._theme_repository.get_all()
+        return await self._theme_repository.get_all()
 
     async def update_theme(self, theme_id: int, theme: ThemeUpdate) -> Optional[Theme]:
         """Update a theme."""
-        existing_theme = self._theme_repository.get(theme_id)
+        existing_theme = await self._theme_repository.get(theme_id)
         if not existing_theme:
             return None
 
@@ -31,27 +31,27 @@ class ThemeService:
         for key, value in update_data.items():
             setattr(existing_theme, key, value)
 
-        return self._theme_repository.update(theme_id, existing_theme)
+        return await self._theme_repository.update(theme_id, existing_theme)
 
     async def delete_theme(self, theme_id: int) -> bool:
         """Delete a theme."""
-        return self._theme_repository.delete(theme_id)
+        return await self._theme_repository.delete(theme_id)
 
     async def get_theme_by_name(self, name: str) -> Optional[Theme]:
         """Get a theme by name."""
-        return self._theme_repository.get_by_name(name)
+        return await self._theme_repository.get_by_name(name)
 
     async def get_active_themes(self) -> List[Theme]:
         """Get all active themes."""
-        return self._theme_repository.get_active()
+        return await self._theme_repository.get_active()
 
     async def get_default_theme(self) -> Optional[Theme]:
         """Get the default theme."""
-        return self._theme_repository.get_default()
+        return await self._theme_repository.get_default()
 
     async def set_default_theme(self, theme_id: int) -> Optional[Theme]:
         """Set a theme as default."""
-        return self._theme_repository.set_default(theme_id)
+        return await self._theme_repository.set_default(theme_id)
 
     async def get_active_theme(self) -> Optional[Theme]:
         """Get the currently active theme."""
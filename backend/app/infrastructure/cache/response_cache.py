@@ -0,0 +1,246 @@
+import os
+import gzip
+import time
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple, Union
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from app.infrastructure.cache.tag_versions import DatabaseTagVersions, LocalTagVersions
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Resource tags of the public API. Writes invalidate every entry built from a tag.
+PROJECTS = "projects"
+SKILLS = "skills"
+SECTIONS = "sections"
+THEMES = "themes"
+LAYOUT = "layout"
+# Finer project tags, so a change to one project leaves the other detail
+# entries alone: the listing, and one tag per project. PROJECTS covers both.
+PROJECT_LIST = "projects:list"
+
+ALL_TAGS = (PROJECTS, PROJECT_LIST, SKILLS, SECTIONS, THEMES, LAYOUT)
+
+
+def project_tag(project_id: int) -> str:
+    return f"projects:{project_id}"
+
+
+async def invalidate_project(cache: "ResponseCache", project_id: int) -> None:
+    """Drop the listings and the detail entry of one project."""
+    await cache.invalidate(PROJECT_LIST, project_tag(project_id))
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 512
+
+# Upper bound on the age of an entry, should an invalidation not reach the
+# shared tag versions (database unreachable while writing)
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "300"))
+
+# Default for the revalidating endpoints; browsers always ask before reuse
+NO_CACHE = "no-cache"
+
+Versions = Tuple[Tuple[str, int], ...]
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=11)
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    return ("br", "gzip") if brotli else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best encoding we support from an Accept-Encoding header."""
+    if not accept_encoding:
+        return None
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for encoding in supported_encodings():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    versions: Versions
+    expires_at: float
+    # Compressed variants are built on first request and live as long as the entry
+    _encoded: Dict[str, bytes] = field(default_factory=dict, compare=False, repr=False)
+
+    def encoded(self, encoding: str) -> bytes:
+        variant = self._encoded.get(encoding)
+        if variant is None:
+            variant = _compress(self.body, encoding)
+            self._encoded[encoding] = variant
+        return variant
+
+    def variant_etag(self, encoding: Optional[str]) -> str:
+        """Strong validators must differ per representation."""
+        if not encoding:
+            return self.etag
+        return f'{self.etag[:-1]}-{encoding}"'
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the serialized body."""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def to_json_bytes(response_type: Any, value: Any) -> bytes:
+    """Serialize `value` the way FastAPI would for `response_model=response_type`."""
+    adapter = _adapter(response_type)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True), by_alias=True)
+
+
+class ResponseCache:
+    """Versioned cache of pre-serialized JSON responses.
+
+    Every entry records the version of the tags it was built from. Tag
+    versions live in a store shared by all workers (`DatabaseTagVersions`),
+    which each worker reloads at most once a second, so an invalidation in one
+    worker makes every other worker rebuild its entry within about a second.
+    An entry filled while an invalidation happened carries the old versions
+    and is never served. Entries also expire after `ttl` seconds, in case an
+    invalidation could not be recorded.
+    """
+
+    def __init__(
+        self,
+        versions: Optional[Union[LocalTagVersions, DatabaseTagVersions]] = None,
+        ttl: float = CACHE_TTL_SECONDS
+    ):
+        self._store = versions if versions is not None else LocalTagVersions()
+        self._ttl = ttl
+        self._entries: Dict[str, CachedResponse] = {}
+
+    async def versions(self, tags: Iterable[str]) -> Versions:
+        current = await self._store.read(sorted(set(tags)))
+        return tuple(sorted(current.items()))
+
+    def get(self, key: str, versions: Versions) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.versions != versions or entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry
+
+    def put(self, key: str, body: bytes, versions: Versions) -> CachedResponse:
+        entry = CachedResponse(
+            body=body,
+            etag=make_etag(body),
+            versions=versions,
+            expires_at=time.monotonic() + self._ttl
+        )
+        self._entries[key] = entry
+        return entry
+
+    def _drop(self, tags: Iterable[str]) -> int:
+        tags = set(tags)
+        stale = [
+            key for key, entry in self._entries.items()
+            if any(tag in tags for tag, _ in entry.versions)
+        ]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    async def invalidate(self, *tags: str) -> None:
+        try:
+            await self._store.bump(tags)
+        except Exception as e:
+            # Other workers keep their entries until the TTL runs out
+            logger.error(f"Failed to record invalidation of {', '.join(tags)}: {str(e)}")
+        dropped = self._drop(tags)
+        logger.debug(f"Invalidated response cache for {', '.join(tags)} ({dropped} local entries)")
+
+    async def clear(self) -> None:
+        # Every entry carries at least one of these tags
+        await self.invalidate(*ALL_TAGS)
+        self._entries.clear()
+
+    async def respond(
+        self,
+        request: Request,
+        tags: Iterable[str],
+        loader: Callable[[], Awaitable[bytes]],
+        cache_control: str = NO_CACHE,
+        compress: bool = False,
+    ) -> Response:
+        """Serve the cached body for this path, filling it with `loader` on a miss.
+
+        Answers `If-None-Match` with 304. The query string is ignored so the
+        cache cannot be grown with arbitrary parameters. With `compress`, the
+        body is served gzip/brotli encoded according to Accept-Encoding.
+        """
+        key = request.url.path
+        try:
+            versions = await self.versions(tags)
+        except Exception as e:
+            logger.warning(f"Response cache bypassed for {key}, tag versions unavailable: {str(e)}")
+            versions = None
+        entry = self.get(key, versions) if versions is not None else None
+        if entry is None:
+            body = await loader()
+            if versions is None:
+                entry = CachedResponse(body=body, etag=make_etag(body), versions=(), expires_at=0.0)
+            else:
+                entry = self.put(key, body, versions)
+
+        encoding = None
+        if compress and len(entry.body) >= MIN_COMPRESS_SIZE:
+            encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+
+        etag = entry.variant_etag(encoding)
+        headers = {"ETag": etag, "Cache-Control": cache_control}
+        if compress:
+            headers["Vary"] = "Accept-Encoding"
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        body = entry.body
+        if encoding:
+            body = entry.encoded(encoding)
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Shared by the public router; invalidated by admin writes, the sync and webhooks
+public_cache = ResponseCache(DatabaseTagVersions())
@@ -0,0 +1,93 @@
+import os
+import time
+import logging
+from typing import Dict, Iterable, Optional
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.infrastructure.database.models.cache_tag_version import CacheTagVersionModel
+
+logger = logging.getLogger(__name__)
+
+# How stale another worker's view of an invalidation may be, at most
+CACHE_TAG_REFRESH_SECONDS = float(os.getenv("CACHE_TAG_REFRESH_SECONDS", "1"))
+
+
+def _merge(current: Dict[str, int], newer: Dict[str, int]) -> Dict[str, int]:
+    # Versions only grow, so the larger one is always the more recent
+    merged = dict(current)
+    for tag, version in newer.items():
+        merged[tag] = max(version, merged.get(tag, 0))
+    return merged
+
+
+class LocalTagVersions:
+    """Tag versions in this process only; enough for a single worker."""
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+
+    async def read(self, tags: Iterable[str]) -> Dict[str, int]:
+        return {tag: self._versions.get(tag, 0) for tag in tags}
+
+    async def bump(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            self._versions[tag] = self._versions.get(tag, 0) + 1
+
+
+class DatabaseTagVersions:
+    """Tag versions in the `cache_tag_versions` table, shared by every worker and replica.
+
+    Reads are served from a snapshot of the (small) table, reloaded at most
+    once every `refresh_interval` seconds, so a cache hit costs no query.
+    Bumps are one upsert whose new versions go straight into the snapshot;
+    other workers see them on their next reload. While the database is
+    unreachable the last snapshot is kept: nobody can record an invalidation
+    then either.
+    """
+
+    def __init__(self, refresh_interval: float = CACHE_TAG_REFRESH_SECONDS):
+        self._refresh_interval = refresh_interval
+        self._versions: Optional[Dict[str, int]] = None
+        self._next_refresh = 0.0
+        self._refreshing = False
+
+    async def read(self, tags: Iterable[str]) -> Dict[str, int]:
+        now = time.monotonic()
+        if self._versions is None or (now >= self._next_refresh and not self._refreshing):
+            await self._refresh(now)
+        versions = self._versions
+        return {tag: versions.get(tag, 0) for tag in tags}
+
+    async def _refresh(self, now: float) -> None:
+        # Imported here so the cache module stays importable without DATABASE_URL
+        from app.infrastructure.database.session import async_engine
+        # Concurrent requests keep using the current snapshot meanwhile
+        self._refreshing = True
+        self._next_refresh = now + self._refresh_interval
+        try:
+            async with async_engine.connect() as connection:
+                stored = dict((await connection.execute(
+                    select(CacheTagVersionModel.tag, CacheTagVersionModel.version)
+                )).all())
+        except Exception as e:
+            if self._versions is None:
+                raise
+            logger.warning(f"Failed to reload cache tag versions, keeping the last ones: {str(e)}")
+            return
+        finally:
+            self._refreshing = False
+        self._versions = _merge(self._versions or {}, stored)
+
+    async def bump(self, tags: Iterable[str]) -> None:
+        from app.infrastructure.database.session import async_engine
+        rows = [{"tag": tag, "version": 1} for tag in dict.fromkeys(tags)]
+        if not rows:
+            return
+        stmt = pg_insert(CacheTagVersionModel).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CacheTagVersionModel.tag],
+            set_={"version": CacheTagVersionModel.version + 1}
+        ).returning(CacheTagVersionModel.tag, CacheTagVersionModel.version)
+        async with async_engine.begin() as connection:
+            bumped = dict((await connection.execute(stmt)).all())
+        self._versions = _merge(self._versions or {}, bumped)
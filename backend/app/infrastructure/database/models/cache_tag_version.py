@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, BigInteger
+from app.infrastructure.database.base import Base
+
+class CacheTagVersionModel(Base):
+    """Current version of each response cache tag, shared by all workers."""
+    __tablename__ = "cache_tag_versions"
+    __table_args__ = {'extend_existing': True}
+
+    tag = Column(String(191), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, DateTime, ARRAY, JSON
+from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime, JSON
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.infrastructure.database.base import Base
@@ -7,17 +8,21 @@ class FileModel(Base):
     __tablename__ = "files"
     __table_args__ = {'extend_existing': True}
 
-    id = Column(String, primary_key=True)
+    # UUID as in init.sql, handed to and from the domain as str
+    id = Column(UUID(as_uuid=False), primary_key=True)
     name = Column(String, nullable=False)
     path = Column(String, nullable=False)
-    parent_id = Column(String, ForeignKey("files.id"), nullable=True)
+    parent_id = Column(UUID(as_uuid=False), ForeignKey("files.id"), nullable=True)
+    # "/<root id>/.../<own id>/"; the "C" collation keeps prefix ranges index-friendly
+    tree_path = Column(String(collation="C"), nullable=False, index=True)
     is_folder = Column(Boolean, default=False)
     size = Column(Integer, nullable=True)
     mime_type = Column(String, nullable=True)
+    content_hash = Column(String(64), nullable=True, index=True)
+    variants = Column(JSON(none_as_null=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    tags = Column(ARRAY(String), default=[])
-    used_in = Column(JSON, default={})
+    tags = Column(ARRAY(Text), default=[])  # TEXT[] in init.sql; @> needs matching element types
 
     # Relationships
     parent = relationship("FileModel", remote_side=[id], backref="children") 
\ No newline at end of file
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, Integer, Text
+from app.infrastructure.database.base import Base
+
+class FileUsageModel(Base):
+    """Reverse index: which field of which project, post or section references an upload."""
+    __tablename__ = "file_usages"
+    __table_args__ = {'extend_existing': True}
+
+    # The primary key leads with the owner, so re-indexing one entity is a range delete
+    owner_type = Column(String(16), primary_key=True)
+    owner_id = Column(Integer, primary_key=True)
+    field = Column(String(64), primary_key=True)
+    # Blob URL as stored on files.path, e.g. /static/uploads/ab/<sha256>.png
+    path = Column(Text, primary_key=True, index=True)
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import String, Text, Integer, Boolean, DateTime, ForeignKey, JSON, ARRAY, Numeric
+from sqlalchemy import String, Text, Integer, Boolean, DateTime, ForeignKey, JSON, ARRAY, Numeric, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.types import TypeDecorator
 from app.infrastructure.database.base import Base
@@ -23,6 +23,10 @@ class ArrayOfStrings(TypeDecorator):
 
 class ProjectModel(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Natural key of synced projects, used by bulk upserts
+        Index("uq_projects_source_name", "source_type", "source_username", "name", unique=True),
+    )
     
     # Basic Info
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -49,6 +53,8 @@ class ProjectModel(Base):
     topics: Mapped[Optional[List[str]]] = mapped_column(ArrayOfStrings, nullable=True)
     default_branch: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     last_updated: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    sync_fingerprint: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # Hash of the last synced remote payload
+    synced_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)  # Last comparison with the enriched payload
     
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
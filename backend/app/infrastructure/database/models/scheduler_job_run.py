@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime
+from app.infrastructure.database.base import Base
+
+class SchedulerJobRunModel(Base):
+    """Outcome of the latest run of each scheduled job, whichever worker ran it."""
+    __tablename__ = "scheduler_job_runs"
+    __table_args__ = {'extend_existing': True}
+
+    job_id = Column(String(191), primary_key=True)
+    # running, success, error or missed
+    status = Column(String(16), nullable=False)
+    instance = Column(String(255), nullable=False)
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    duration_ms = Column(Integer)
+    error = Column(Text)
+    run_count = Column(Integer, nullable=False, default=0)
+    failure_count = Column(Integer, nullable=False, default=0)
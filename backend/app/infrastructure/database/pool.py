@@ -0,0 +1,234 @@
+import os
+import time
+import logging
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Defaults per engine role. The API serves concurrent requests; the scheduler
+# runs one sync at a time and must not starve the API of connections; it also
+# holds the job store and job run bookkeeping, and is only used by the leader.
+ROLE_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "api": {"pool_size": 10, "max_overflow": 10},
+    "api_async": {"pool_size": 10, "max_overflow": 10},
+    "scheduler": {"pool_size": 4, "max_overflow": 0},
+}
+
+
+def _env(role: str, name: str, default: Any) -> str:
+    """Read DB_<ROLE>_<NAME>, falling back to DB_<NAME> and the default."""
+    value = os.getenv(f"DB_{role.upper()}_{name}")
+    if value is None:
+        value = os.getenv(f"DB_{name}")
+    return default if value is None or value == "" else value
+
+
+def _env_bool(role: str, name: str, default: bool) -> bool:
+    return str(_env(role, name, default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    role: str
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    pool_recycle: int
+    pool_pre_ping: bool
+    statement_timeout_ms: int
+    slow_checkout_ms: float
+
+    @classmethod
+    def from_env(cls, role: str) -> "PoolConfig":
+        defaults = ROLE_DEFAULTS.get(role, ROLE_DEFAULTS["api"])
+        return cls(
+            role=role,
+            pool_size=int(_env(role, "POOL_SIZE", defaults["pool_size"])),
+            max_overflow=int(_env(role, "MAX_OVERFLOW", defaults["max_overflow"])),
+            pool_timeout=float(_env(role, "POOL_TIMEOUT", 30)),
+            # Recycle before typical server / proxy idle timeouts close the socket
+            pool_recycle=int(_env(role, "POOL_RECYCLE", 1800)),
+            pool_pre_ping=_env_bool(role, "POOL_PRE_PING", True),
+            statement_timeout_ms=int(_env(role, "STATEMENT_TIMEOUT_MS", 0)),
+            slow_checkout_ms=float(_env(role, "POOL_SLOW_CHECKOUT_MS", 100)),
+        )
+
+
+class PoolStats:
+    """Checkout and wait counters of one connection pool."""
+
+    def __init__(self, role: str = "default", slow_checkout_ms: float = 100):
+        self.role = role
+        self.slow_checkout_ms = slow_checkout_ms
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.slow_checkouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def record_checkout(self, wait_ms: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            slow = wait_ms >= self.slow_checkout_ms
+            if slow:
+                self.slow_checkouts += 1
+        if slow:
+            logger.warning(f"Slow DB connection checkout on '{self.role}' pool: waited {wait_ms:.1f} ms")
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def record_timeout(self, wait_ms: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        logger.error(f"DB connection checkout on '{self.role}' pool timed out after {wait_ms:.1f} ms")
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "slow_checkouts": self.slow_checkouts,
+                "slow_checkout_threshold_ms": self.slow_checkout_ms,
+                "avg_wait_ms": round(self.total_wait_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait_ms, 3),
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Measures how long callers wait for a connection from a queue pool."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_timeout((time.perf_counter() - started) * 1000)
+            raise
+        self.stats.record_checkout((time.perf_counter() - started) * 1000)
+        return connection
+
+    def _do_return_conn(self, record):
+        self.stats.record_checkin()
+        super()._do_return_conn(record)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same stats
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# Engines created by create_pooled_engine and their settings, by role
+_engines: Dict[str, Tuple[Engine, PoolConfig]] = {}
+
+
+def _pool_arguments(config: PoolConfig) -> Dict[str, Any]:
+    return {
+        "pool_size": config.pool_size,
+        "max_overflow": config.max_overflow,
+        "pool_timeout": config.pool_timeout,
+        "pool_recycle": config.pool_recycle,
+        "pool_pre_ping": config.pool_pre_ping,
+        "pool_logging_name": config.role,
+    }
+
+
+def _register(engine: Engine, config: PoolConfig) -> None:
+    engine.pool.stats = PoolStats(config.role, config.slow_checkout_ms)
+    _engines[config.role] = (engine, config)
+    logger.info(
+        f"Created '{config.role}' DB engine: pool_size={config.pool_size}, max_overflow={config.max_overflow}, "
+        f"recycle={config.pool_recycle}s, pre_ping={config.pool_pre_ping}, "
+        f"statement_timeout={config.statement_timeout_ms or 'off'}"
+    )
+
+
+def create_pooled_engine(url: str, role: str, config: Optional[PoolConfig] = None) -> Engine:
+    """Create an engine with an instrumented, environment-tuned pool.
+
+    Settings are read from DB_<ROLE>_* and DB_* variables, e.g.
+    DB_API_POOL_SIZE, DB_SCHEDULER_MAX_OVERFLOW or DB_STATEMENT_TIMEOUT_MS.
+    """
+    config = config or PoolConfig.from_env(role)
+    connect_args: Dict[str, Any] = {}
+    if config.statement_timeout_ms > 0 and url.startswith("postgresql"):
+        connect_args["options"] = f"-c statement_timeout={config.statement_timeout_ms}"
+
+    engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        connect_args=connect_args,
+        **_pool_arguments(config),
+    )
+    _register(engine, config)
+    return engine
+
+
+def to_async_url(url: str) -> str:
+    """Switch a PostgreSQL URL to the asyncpg driver."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "postgresql":
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    return parsed.render_as_string(hide_password=False)
+
+
+def create_pooled_async_engine(url: str, role: str, config: Optional[PoolConfig] = None) -> AsyncEngine:
+    """Async counterpart of create_pooled_engine, using asyncpg for PostgreSQL."""
+    config = config or PoolConfig.from_env(role)
+    url = to_async_url(url)
+    connect_args: Dict[str, Any] = {}
+    if config.statement_timeout_ms > 0 and url.startswith("postgresql+asyncpg"):
+        connect_args["server_settings"] = {"statement_timeout": str(config.statement_timeout_ms)}
+
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        connect_args=connect_args,
+        **_pool_arguments(config),
+    )
+    _register(engine.sync_engine, config)
+    return engine
+
+
+def pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """Current occupancy and counters of every pooled engine."""
+    metrics = {}
+    for role, (engine, config) in _engines.items():
+        pool = engine.pool
+        metrics[role] = {
+            "config": {key: value for key, value in asdict(config).items() if key != "role"},
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            **pool.stats.snapshot(),
+        }
+    return metrics
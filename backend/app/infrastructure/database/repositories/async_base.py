@@ -0,0 +1,22 @@
+from typing import Any
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+class AsyncRepositoryAdapter:
+    """Base for the async repositories used on the request path.
+
+    Each call runs the blocking implementation through `AsyncSession.run_sync`:
+    its statements go through the async driver inside a greenlet, so the event
+    loop is never blocked, while the SQL stays shared with the sync repositories
+    used by the scheduler and the scripts.
+    """
+    sync_repository_class: type
+
+    def __init__(self, db: AsyncSession):
+        self._db = db
+
+    async def _run(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        def call(session: Session) -> Any:
+            return getattr(self.sync_repository_class(session), method)(*args, **kwargs)
+        return await self._db.run_sync(call)
@@ -1,11 +1,134 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from app.domain.models.file import File
+import json
+import base64
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+from sqlalchemy import String, Text, all_, and_, any_, case, cast, delete, exists, func, insert, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql.elements import ColumnElement
+from app.domain.models.file import (
+    File, FileQuery, FilePage, FileUsage, FileBatchOperation, FileBatchItemResult,
+    BATCH_MOVE, BATCH_DELETE, BATCH_ADD_TAGS, BATCH_REMOVE_TAGS
+)
 from app.domain.repositories.filemanager_repository import FileManagerRepository
 from app.infrastructure.database.models.file import FileModel
-from app.domain.exceptions import FileNotFoundError, FileOperationError
+from app.infrastructure.database.models.file_usage import FileUsageModel
+from app.domain.exceptions import FileNotFoundError, FileOperationError, FileValidationError
+from app.infrastructure.storage.derivatives import variant_urls
 import uuid
 
+# Sorts after every character of a tree path (hex digits, '-' and '/'), so
+# [prefix, prefix + PATH_END) is exactly the subtree below prefix
+PATH_END = "~"
+
+
+def _within(prefix: Union[str, ColumnElement]) -> ColumnElement:
+    """Rows whose tree_path starts with `prefix`, as a range the path index can serve."""
+    if isinstance(prefix, str):
+        prefix = literal(prefix)
+    return and_(FileModel.tree_path >= prefix, FileModel.tree_path < prefix + PATH_END)
+
+
+def _text_array(values: List[str]) -> ColumnElement:
+    return cast(literal(list(values), ARRAY(Text)), ARRAY(Text))
+
+
+def _current_tags(current: Optional[ColumnElement] = None) -> ColumnElement:
+    """The row's tags, or `current` (e.g. a literal array to check the expressions), NULL as empty."""
+    return func.coalesce(FileModel.tags if current is None else current, _text_array([]))
+
+
+def _with_tags_added(tags: List[str], current: Optional[ColumnElement] = None) -> ColumnElement:
+    """The row's tags followed by those of `tags` it does not have yet."""
+    new_tag = func.unnest(_text_array(tags)).table_valued("tag").render_derived()
+    missing = (
+        select(func.array_agg(new_tag.c.tag.distinct()))
+        # tag <> ALL(tags): not `~(tag == ANY(...))`, which SQLAlchemy turns
+        # into tag <> ANY(...), true for any row with two or more tags
+        .where(new_tag.c.tag != all_(_current_tags(current)))
+        .scalar_subquery()
+    )
+    return func.array_cat(_current_tags(current), func.coalesce(missing, _text_array([])))
+
+
+def _with_tags_removed(tags: List[str], current: Optional[ColumnElement] = None) -> ColumnElement:
+    expression = _current_tags(current)
+    for tag in dict.fromkeys(tags):
+        expression = func.array_remove(expression, tag)
+    return expression
+
+
+def _is_used() -> ColumnElement:
+    """Whether any content references the row's blob; one probe of ix_file_usages_path."""
+    return exists().where(FileUsageModel.path == FileModel.path)
+
+
+def _usage_count() -> ColumnElement:
+    return (
+        select(func.count())
+        .where(FileUsageModel.path == FileModel.path)
+        .correlate(FileModel)
+        .scalar_subquery()
+    )
+
+
+# Columns of the listing payload; variants and tree paths are left out
+_LISTING_COLUMNS = (
+    FileModel.id,
+    FileModel.name,
+    FileModel.path,
+    FileModel.parent_id,
+    FileModel.is_folder,
+    FileModel.size,
+    FileModel.mime_type,
+    FileModel.tags,
+    _usage_count().label("usage_count"),
+    FileModel.content_hash,
+    FileModel.created_at,
+    FileModel.updated_at,
+)
+
+# Up to this many matches an exact count is cheap; above it the planner's estimate is returned
+EXACT_COUNT_LIMIT = 10_000
+
+
+def _sort_key(sort: str) -> ColumnElement:
+    if sort == "size":
+        # Folders have no size; matches the ix_files_parent_size expression index
+        return func.coalesce(FileModel.size, 0)
+    if sort == "created_at":
+        return FileModel.created_at
+    return FileModel.name
+
+
+def _encode_cursor(value: Any, file_id: Any) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, str(file_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str) -> Tuple[Any, str]:
+    try:
+        value, file_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if sort == "created_at":
+            value = datetime.fromisoformat(value)
+        elif sort == "size":
+            value = int(value)
+        else:
+            value = str(value)
+        return value, str(uuid.UUID(file_id))
+    except (ValueError, TypeError):
+        raise FileValidationError("Invalid cursor")
+
+
+def _tree_path_of(file_id: str) -> ColumnElement:
+    # Aliased so the subquery is not correlated with an outer UPDATE / DELETE on files
+    node = aliased(FileModel)
+    return select(node.tree_path).where(node.id == file_id).scalar_subquery()
+
+
 class SQLAlchemyFileManagerRepository(FileManagerRepository):
     def __init__(self, db: Session):
         self.db = db
@@ -14,7 +137,40 @@ class SQLAlchemyFileManagerRepository(FileManagerRepository):
         file_model = self.db.query(FileModel).filter(FileModel.id == file_id).first()
         if not file_model:
             raise FileNotFoundError(f"File with id {file_id} not found")
-        return self._to_domain(file_model)
+        file = self._to_domain(file_model)
+        used_in: Dict[str, List[int]] = {}
+        for usage in self.get_usages(file.path):
+            owners = used_in.setdefault(usage.owner_type, [])
+            if usage.owner_id not in owners:
+                owners.append(usage.owner_id)
+        file.used_in = used_in
+        return file
+
+    def get_usages(self, path: str) -> List[FileUsage]:
+        stmt = select(FileUsageModel.owner_type, FileUsageModel.owner_id, FileUsageModel.field).where(
+            FileUsageModel.path == path
+        ).order_by(FileUsageModel.owner_type, FileUsageModel.owner_id, FileUsageModel.field)
+        return [FileUsage(owner_type, owner_id, field) for owner_type, owner_id, field in self.db.execute(stmt)]
+
+    def used_paths(self, paths: Iterable[str]) -> Set[str]:
+        paths = {path for path in paths if path}
+        if not paths:
+            return set()
+        stmt = select(FileUsageModel.path).where(FileUsageModel.path.in_(paths)).distinct()
+        return set(self.db.execute(stmt).scalars())
+
+    def list_unused_files(self, created_before: datetime, limit: int) -> List[File]:
+        stmt = (
+            select(FileModel)
+            .where(
+                FileModel.is_folder.is_(False),
+                FileModel.created_at < created_before,
+                ~_is_used()
+            )
+            .order_by(FileModel.created_at)
+            .limit(limit)
+        )
+        return [self._to_domain(model) for model in self.db.execute(stmt).scalars()]
 
     def list_files(self, parent_id: Optional[str] = None) -> List[File]:
         query = self.db.query(FileModel)
@@ -24,18 +180,72 @@ class SQLAlchemyFileManagerRepository(FileManagerRepository):
             query = query.filter(FileModel.parent_id.is_(None))
         return [self._to_domain(f) for f in query.all()]
 
+    def list_files_page(self, query: FileQuery) -> FilePage:
+        filters = self._listing_filters(query)
+        key = _sort_key(query.sort)
+        stmt = select(*_LISTING_COLUMNS, key.label("sort_key")).where(*filters)
+        if query.cursor:
+            # Keyset: continue strictly after the last row of the previous page
+            value, after_id = _decode_cursor(query.cursor, query.sort)
+            position = tuple_(key, FileModel.id)
+            stmt = stmt.where(position < tuple_(value, after_id) if query.descending else position > tuple_(value, after_id))
+        order = (key.desc(), FileModel.id.desc()) if query.descending else (key, FileModel.id)
+        rows = self.db.execute(stmt.order_by(*order).limit(query.limit + 1)).mappings().all()
+
+        next_cursor = None
+        if len(rows) > query.limit:
+            rows = rows[:query.limit]
+            next_cursor = _encode_cursor(rows[-1]["sort_key"], rows[-1]["id"])
+        total, is_estimate = self._count(filters)
+        return FilePage(
+            items=[{name: value for name, value in row.items() if name != "sort_key"} for row in rows],
+            next_cursor=next_cursor,
+            total=total,
+            total_is_estimate=is_estimate
+        )
+
+    def _listing_filters(self, query: FileQuery) -> List[ColumnElement]:
+        filters = [FileModel.parent_id == query.parent_id if query.parent_id else FileModel.parent_id.is_(None)]
+        if query.mime_prefix:
+            filters.append(FileModel.mime_type.startswith(query.mime_prefix, autoescape=True))
+        if query.tags:
+            # tags @> ARRAY[...], served by the GIN index
+            filters.append(FileModel.tags.contains(query.tags))
+        if query.unused:
+            filters.extend([FileModel.is_folder.is_(False), ~_is_used()])
+        return filters
+
+    def _count(self, filters: List[ColumnElement]) -> Tuple[int, bool]:
+        """Number of matching rows, exact for small results and estimated for large ones."""
+        stmt = select(FileModel.id).where(*filters)
+        compiled = stmt.compile(dialect=self.db.get_bind().dialect)
+        plan = self.db.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+        if estimate > EXACT_COUNT_LIMIT:
+            return estimate, True
+        return self.db.execute(select(func.count()).select_from(stmt.subquery())).scalar_one(), False
+
     def create_file(self, file: File) -> File:
         try:
+            file_id = str(uuid.uuid4())  # Generate UUID for new files
+            # Parent's path is resolved inside the INSERT
+            parent_path = _tree_path_of(file.parent_id) if file.parent_id else literal("/")
             db_file = FileModel(
-                id=uuid.uuid4(),  # Generate UUID for new files
+                id=file_id,
                 name=file.name,
                 path=file.path,
                 parent_id=file.parent_id,
+                tree_path=parent_path + f"{file_id}/",
                 is_folder=file.is_folder,
                 size=file.size,
                 mime_type=file.mime_type,
-                tags=file.tags or [],
-                used_in=file.used_in or {}
+                content_hash=file.content_hash,
+                variants=file.variants,
+                tags=file.tags or []
             )
             self.db.add(db_file)
             self.db.commit()
@@ -45,20 +255,134 @@ class SQLAlchemyFileManagerRepository(FileManagerRepository):
             self.db.rollback()
             raise FileOperationError(f"Failed to create file: {str(e)}")
 
-    def update_file(self, file: File) -> File:
+    def create_files(self, files: List[File]) -> List[File]:
+        if not files:
+            return []
+        try:
+            parent_ids = {str(file.parent_id) for file in files if file.parent_id}
+            parent_paths = {
+                str(folder_id): tree_path
+                for folder_id, tree_path in self.db.execute(
+                    select(FileModel.id, FileModel.tree_path).where(
+                        FileModel.id.in_(parent_ids),
+                        FileModel.is_folder.is_(True)
+                    )
+                )
+            } if parent_ids else {}
+            rows = []
+            for file in files:
+                parent_id = str(file.parent_id) if file.parent_id else None
+                if parent_id and parent_id not in parent_paths:
+                    raise FileNotFoundError(f"Folder with id {parent_id} not found")
+                file_id = str(uuid.uuid4())
+                rows.append({
+                    "id": file_id,
+                    "name": file.name,
+                    "path": file.path,
+                    "parent_id": parent_id,
+                    "tree_path": parent_paths.get(parent_id, "/") + f"{file_id}/",
+                    "is_folder": file.is_folder,
+                    "size": file.size,
+                    "mime_type": file.mime_type,
+                    "content_hash": file.content_hash,
+                    "variants": file.variants,
+                    "tags": file.tags or [],
+                })
+            # One multi-row INSERT ... RETURNING for the whole batch. Rows are put
+            # back in order by id: sort_by_parameter_order cannot match UUID
+            # sentinels sent as str on SQLAlchemy 2.0.23
+            created = {
+                model.id: model
+                for model in self.db.scalars(insert(FileModel).returning(FileModel), rows)
+            }
+            # Before the commit expires the models, which would reload each one
+            files = [self._to_domain(created[row["id"]]) for row in rows]
+            self.db.commit()
+            return files
+        except FileNotFoundError:
+            self.db.rollback()
+            raise
+        except Exception as e:
+            self.db.rollback()
+            raise FileOperationError(f"Failed to create files: {str(e)}")
+
+    def existing_names(self, parent_id: Optional[str], names: Iterable[str]) -> Set[str]:
+        names = set(names)
+        if not names:
+            return set()
+        parent_filter = FileModel.parent_id == parent_id if parent_id else FileModel.parent_id.is_(None)
+        stmt = select(FileModel.name).where(parent_filter, FileModel.name.in_(names))
+        return set(self.db.execute(stmt).scalars())
+
+    def get_variants_by_content_hashes(self, content_hashes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        content_hashes = {content_hash for content_hash in content_hashes if content_hash}
+        if not content_hashes:
+            return {}
+        stmt = select(FileModel.content_hash, FileModel.variants).where(
+            FileModel.content_hash.in_(content_hashes),
+            FileModel.variants.is_not(None)
+        )
+        return {content_hash: variants for content_hash, variants in self.db.execute(stmt) if variants}
+
+    def get_by_content_hash(self, content_hash: str) -> Optional[File]:
+        file_model = self.db.query(FileModel).filter(
+            FileModel.content_hash == content_hash,
+            FileModel.is_folder.is_(False)
+        ).first()
+        return self._to_domain(file_model) if file_model else None
+
+    def unreferenced_content_hashes(self, content_hashes: Iterable[str]) -> Set[str]:
+        content_hashes = {content_hash for content_hash in content_hashes if content_hash}
+        if not content_hashes:
+            return set()
+        stmt = select(FileModel.content_hash).where(FileModel.content_hash.in_(content_hashes)).distinct()
+        return content_hashes - set(self.db.execute(stmt).scalars())
+
+    def list_referenced_paths(self) -> Set[str]:
+        stmt = select(FileModel.path, FileModel.variants).where(FileModel.is_folder.is_(False))
+        paths = set()
+        for path, variants in self.db.execute(stmt):
+            paths.add(path)
+            paths.update(variant_urls(variants))
+        # Content may still point at a blob whose file rows are gone
+        paths.update(self.db.execute(select(FileUsageModel.path).distinct()).scalars())
+        return paths
+
+    def set_variants_by_content_hash(self, content_hash: str, variants: Dict[str, Any]) -> int:
+        try:
+            result = self.db.execute(
+                update(FileModel).where(FileModel.content_hash == content_hash).values(variants=variants)
+            )
+            self.db.commit()
+            return result.rowcount
+        except Exception as e:
+            self.db.rollback()
+            raise FileOperationError(f"Failed to store image variants: {str(e)}")
+
+    def get_variants_by_paths(self, paths: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        paths = list(paths)
+        if not paths:
+            return {}
+        stmt = select(FileModel.path, FileModel.variants).where(
+            FileModel.path.in_(paths),
+            FileModel.variants.is_not(None)
+        )
+        return {path: variants for path, variants in self.db.execute(stmt) if variants}
+
+    def update_file(self, file_id: str, file: File) -> File:
+        # The position in the tree only changes through move_file
         try:
-            file_model = self.db.query(FileModel).filter(FileModel.id == file.id).first()
+            file_model = self.db.query(FileModel).filter(FileModel.id == file_id).first()
             if not file_model:
-                raise FileNotFoundError(f"File with id {file.id} not found")
+                raise FileNotFoundError(f"File with id {file_id} not found")
             
             file_model.name = file.name
             file_model.path = file.path
-            file_model.parent_id = file.parent_id
             file_model.is_folder = file.is_folder
             file_model.size = file.size
             file_model.mime_type = file.mime_type
+            file_model.content_hash = file.content_hash
             file_model.tags = file.tags or []
-            file_model.used_in = file.used_in or {}
             
             self.db.commit()
             self.db.refresh(file_model)
@@ -69,14 +393,15 @@ class SQLAlchemyFileManagerRepository(FileManagerRepository):
             self.db.rollback()
             raise FileOperationError(f"Failed to update file: {str(e)}")
 
-    def delete_file(self, file_id: str) -> None:
+    def delete_file(self, file_id: str) -> List[File]:
         try:
-            file_model = self.db.query(FileModel).filter(FileModel.id == file_id).first()
-            if not file_model:
+            removed = self._delete_subtrees([file_id])
+            if not removed:
                 raise FileNotFoundError(f"File with id {file_id} not found")
-            self.db.delete(file_model)
             self.db.commit()
+            return removed
         except FileNotFoundError:
+            self.db.rollback()
             raise
         except Exception as e:
             self.db.rollback()
@@ -84,19 +409,193 @@ class SQLAlchemyFileManagerRepository(FileManagerRepository):
 
     def move_file(self, file_id: str, new_parent_id: Optional[str]) -> File:
         try:
-            file_model = self.db.query(FileModel).filter(FileModel.id == file_id).first()
-            if not file_model:
+            moved, skipped = self._move_subtrees([file_id], new_parent_id)
+            if file_id in skipped:
+                raise FileOperationError(skipped[file_id])
+            if not moved:
                 raise FileNotFoundError(f"File with id {file_id} not found")
-            
-            file_model.parent_id = new_parent_id
             self.db.commit()
-            self.db.refresh(file_model)
-            return self._to_domain(file_model)
-        except FileNotFoundError:
+        except (FileNotFoundError, FileOperationError):
+            self.db.rollback()
             raise
+        except IntegrityError:
+            self.db.rollback()
+            raise FileOperationError("A file with this name already exists in the target folder")
         except Exception as e:
             self.db.rollback()
             raise FileOperationError(f"Failed to move file: {str(e)}")
+        self.db.expire_all()
+        return self.get_file(file_id)
+
+    def apply_batch(self, operations: List[FileBatchOperation]) -> Tuple[List[FileBatchItemResult], List[File]]:
+        results: List[FileBatchItemResult] = []
+        removed: List[File] = []
+        try:
+            for index, operation in enumerate(operations):
+                ids = list(dict.fromkeys(str(file_id) for file_id in operation.ids))
+                try:
+                    # A savepoint per operation: a failing one is undone without losing the others
+                    with self.db.begin_nested():
+                        done, skipped, deleted = self._apply_operation(operation, ids)
+                except IntegrityError:
+                    results.extend(
+                        FileBatchItemResult(index, file_id, "error", "A file with this name already exists in the target folder")
+                        for file_id in ids
+                    )
+                    continue
+                except FileOperationError as e:
+                    results.extend(FileBatchItemResult(index, file_id, "error", str(e)) for file_id in ids)
+                    continue
+                removed.extend(deleted)
+                for file_id in ids:
+                    if file_id in skipped:
+                        results.append(FileBatchItemResult(index, file_id, "skipped", skipped[file_id]))
+                    elif file_id in done:
+                        results.append(FileBatchItemResult(index, file_id, "ok"))
+                    else:
+                        results.append(FileBatchItemResult(index, file_id, "not_found", f"File with id {file_id} not found"))
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise FileOperationError(f"Failed to apply batch: {str(e)}")
+        return results, removed
+
+    def _apply_operation(self, operation: FileBatchOperation, ids: List[str]) -> Tuple[Set[str], Dict[str, str], List[File]]:
+        """Run one batch operation as a single statement; returns done ids, skipped ids and deleted rows."""
+        if operation.op == BATCH_DELETE:
+            deleted = self._delete_subtrees(ids)
+            return {str(file.id) for file in deleted}, {}, deleted
+        if operation.op == BATCH_MOVE:
+            moved, skipped = self._move_subtrees(ids, operation.parent_id)
+            return moved, skipped, []
+        if operation.op == BATCH_ADD_TAGS:
+            return self._update_tags(ids, _with_tags_added(operation.tags)), {}, []
+        if operation.op == BATCH_REMOVE_TAGS:
+            return self._update_tags(ids, _with_tags_removed(operation.tags)), {}, []
+        raise FileOperationError(f"Unknown batch operation {operation.op}")
+
+    def _delete_subtrees(self, ids: List[str]) -> List[File]:
+        """Delete the given files and folders with everything below them in one statement."""
+        node = aliased(FileModel)
+        stmt = (
+            delete(FileModel)
+            .where(exists().where(
+                node.id.in_(ids),
+                FileModel.tree_path >= node.tree_path,
+                FileModel.tree_path < node.tree_path + PATH_END
+            ))
+            .returning(
+                FileModel.id,
+                FileModel.name,
+                FileModel.path,
+                FileModel.is_folder,
+                FileModel.content_hash,
+                FileModel.variants
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return [
+            File(
+                id=row.id,
+                name=row.name,
+                path=row.path,
+                is_folder=row.is_folder,
+                content_hash=row.content_hash,
+                variants=row.variants
+            )
+            for row in self.db.execute(stmt)
+        ]
+
+    def _move_subtrees(self, ids: List[str], new_parent_id: Optional[str]) -> Tuple[Set[str], Dict[str, str]]:
+        """Re-root the subtrees of the given ids below a folder in one statement.
+
+        Returns the moved ids and, for ids left in place, the reason.
+        """
+        nodes = {
+            str(file_id): tree_path
+            for file_id, tree_path in self.db.execute(
+                select(FileModel.id, FileModel.tree_path).where(FileModel.id.in_(ids))
+            )
+        }
+        target_path = "/"
+        if new_parent_id:
+            target = self.db.execute(
+                select(FileModel.tree_path, FileModel.is_folder).where(FileModel.id == new_parent_id)
+            ).first()
+            if not target or not target.is_folder:
+                raise FileOperationError(f"Target folder {new_parent_id} not found")
+            target_path = target.tree_path
+
+        skipped: Dict[str, str] = {}
+        for file_id, tree_path in nodes.items():
+            if target_path.startswith(tree_path):
+                skipped[file_id] = "Cannot move a folder into itself or one of its subfolders"
+        movable = {file_id for file_id in nodes if file_id not in skipped}
+        for file_id in list(movable):
+            # Selected together with an ancestor: it keeps its place inside that folder
+            if any(ancestor in movable for ancestor in nodes[file_id].strip("/").split("/")[:-1]):
+                skipped[file_id] = "Moved along with its parent folder"
+        movable -= skipped.keys()
+        if not movable:
+            return set(), skipped
+
+        node = aliased(FileModel)
+        # Each row keeps the part of its path from the moved node downwards
+        node_offset = func.length(node.tree_path) - func.length(cast(node.id, String))
+        stmt = (
+            update(FileModel)
+            .where(
+                node.id.in_(movable),
+                FileModel.tree_path >= node.tree_path,
+                FileModel.tree_path < node.tree_path + PATH_END
+            )
+            .values(
+                tree_path=literal(target_path) + func.substr(FileModel.tree_path, node_offset),
+                parent_id=case((FileModel.id == node.id, new_parent_id), else_=FileModel.parent_id)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if new_parent_id:
+            # Re-checked by the statement itself, so a concurrent move cannot sneak in a cycle
+            parent = aliased(FileModel)
+            stmt = stmt.where(exists().where(parent.id == new_parent_id, parent.tree_path == target_path))
+        if self.db.execute(stmt).rowcount == 0:
+            raise FileOperationError("Folder tree changed during the move, please retry")
+        return movable, skipped
+
+    def _update_tags(self, ids: List[str], tags: ColumnElement) -> Set[str]:
+        stmt = (
+            update(FileModel)
+            .where(FileModel.id.in_(ids))
+            .values(tags=tags)
+            .returning(FileModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        return {str(file_id) for file_id in self.db.execute(stmt).scalars()}
+
+    def list_subtree(self, folder_id: str) -> List[File]:
+        files = self.db.query(FileModel).filter(
+            _within(_tree_path_of(folder_id)),
+            FileModel.id != folder_id
+        ).order_by(FileModel.tree_path).all()
+        return [self._to_domain(f) for f in files]
+
+    def get_subtree_size(self, folder_id: str) -> int:
+        stmt = select(func.coalesce(func.sum(FileModel.size), 0)).where(
+            _within(_tree_path_of(folder_id)),
+            FileModel.is_folder.is_(False)
+        )
+        return self.db.execute(stmt).scalar_one()
+
+    def get_breadcrumbs(self, file_id: str) -> List[File]:
+        # The file's own path lists its ancestors' ids, which are looked up by primary key
+        ancestor_ids = cast(func.string_to_array(func.btrim(_tree_path_of(file_id), "/"), "/"), ARRAY(UUID))
+        files = self.db.query(FileModel).filter(
+            FileModel.id == any_(ancestor_ids)
+        ).order_by(func.length(FileModel.tree_path)).all()
+        if not files:
+            raise FileNotFoundError(f"File with id {file_id} not found")
+        return [self._to_domain(f) for f in files]
 
     def _to_domain(self, model: FileModel) -> File:
         return File(
@@ -110,5 +609,7 @@ class SQLAlchemyFileManagerRepository(FileManagerRepository):
             created_at=model.created_at,
             updated_at=model.updated_at,
             tags=model.tags or [],
-            used_in=model.used_in or {}
+            content_hash=model.content_hash,
+            variants=model.variants,
+            tree_path=model.tree_path
         ) 
\ No newline at end of file
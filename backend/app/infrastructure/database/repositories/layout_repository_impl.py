@@ -5,8 +5,11 @@ from app.domain.models.layout import Layout
 from app.domain.models.layout_template import LayoutTemplate
 from app.infrastructure.database.models.layout import LayoutModel
 from app.infrastructure.database.models.layout_template import LayoutTemplateModel
+from app.infrastructure.database.repositories.async_base import AsyncRepositoryAdapter
+
+class SQLAlchemyLayoutRepository:
+    """Blocking implementation for the scheduler and scripts, shared by the async one."""
 
-class SQLAlchemyLayoutRepository(LayoutRepository):
     def __init__(self, db: Session):
         self._db = db
 
@@ -48,4 +51,23 @@ class SQLAlchemyLayoutRepository(LayoutRepository):
         db_template = self._db.query(LayoutTemplateModel).filter(LayoutTemplateModel.id == template_id).first()
         if not db_template:
             return None
-        return LayoutTemplate.model_validate(db_template) 
\ No newline at end of file
+        return LayoutTemplate.model_validate(db_template)
+
+
+class AsyncSQLAlchemyLayoutRepository(AsyncRepositoryAdapter, LayoutRepository):
+    sync_repository_class = SQLAlchemyLayoutRepository
+
+    async def get(self) -> Optional[Layout]:
+        return await self._run("get")
+
+    async def create(self, layout: Layout) -> Layout:
+        return await self._run("create", layout)
+
+    async def update(self, layout_id: int, layout: Layout) -> Optional[Layout]:
+        return await self._run("update", layout_id, layout)
+
+    async def get_templates(self) -> List[LayoutTemplate]:
+        return await self._run("get_templates")
+
+    async def get_template(self, template_id: int) -> Optional[LayoutTemplate]:
+        return await self._run("get_template", template_id)
@@ -4,11 +4,14 @@ from sqlalchemy.orm import Session
 from app.domain.models.post import Post
 from app.domain.repositories.post_repository import PostRepository
 from app.infrastructure.database.models.post import PostModel
+from app.infrastructure.database.usage_index import FileUsageIndex
+from app.domain.models.file import USAGE_POST
 import json
 
 class SQLAlchemyPostRepository(PostRepository):
     def __init__(self, db: Session):
         self._db = db
+        self._usages = FileUsageIndex(db)
 
     def _to_db(self, post: Post) -> dict:
         """Convert domain model to database model."""
@@ -75,6 +78,8 @@ class SQLAlchemyPostRepository(PostRepository):
     def create(self, post: Post) -> Post:
         db_post = PostModel(**self._to_db(post))
         self._db.add(db_post)
+        self._db.flush()
+        self._usages.index(USAGE_POST, [db_post])
         self._db.commit()
         self._db.refresh(db_post)
         return self._to_domain(db_post)
@@ -87,6 +92,7 @@ class SQLAlchemyPostRepository(PostRepository):
         update_data = self._to_db(post)
         for key, value in update_data.items():
             setattr(db_post, key, value)
+        self._usages.index(USAGE_POST, [db_post])
         
         self._db.commit()
         self._db.refresh(db_post)
@@ -97,6 +103,7 @@ class SQLAlchemyPostRepository(PostRepository):
         if not db_post:
             return False
         
+        self._usages.remove(USAGE_POST, [db_post.id])
         self._db.delete(db_post)
         self._db.commit()
         return True
@@ -1,15 +1,31 @@
-from typing import List, Optional
-from sqlalchemy import select
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import select, insert, update, tuple_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from app.domain.models.project import Project
 from app.domain.repositories.project_repository import ProjectRepository
 from app.infrastructure.database.models.project import ProjectModel
+from app.infrastructure.database.repositories.async_base import AsyncRepositoryAdapter
+from app.infrastructure.database.usage_index import FileUsageIndex
+from app.domain.models.file import USAGE_PROJECT
 from app.schemas.project import ProjectCreate, ProjectUpdate
 import json
 
-class SQLAlchemyProjectRepository(ProjectRepository):
+# Natural key of synced projects, backed by the uq_projects_source_name index
+UPSERT_KEY = ("source_type", "source_username", "name")
+UPSERT_BATCH_SIZE = 500
+
+def _batches(rows: List[Any], size: int = UPSERT_BATCH_SIZE) -> Iterator[List[Any]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+class SQLAlchemyProjectRepository:
+    """Blocking implementation for the scheduler and scripts, shared by the async one."""
+
     def __init__(self, db: Session):
         self._db = db
+        self._usages = FileUsageIndex(db)
 
     def _to_db(self, project: Project) -> dict:
         """Convert domain model to database model."""
@@ -24,7 +40,8 @@ class SQLAlchemyProjectRepository(ProjectRepository):
 
     def _to_domain(self, db_project: ProjectModel) -> Project:
         """Convert database model to domain model."""
-        return Project.model_validate(db_project.__dict__)
+        # Attributes, not __dict__: expired after a commit, they are loaded again
+        return Project.model_validate(db_project)
 
     def get_by_id(self, project_id: int) -> Optional[Project]:
         stmt = select(ProjectModel).where(ProjectModel.id == project_id)
@@ -49,9 +66,48 @@ class SQLAlchemyProjectRepository(ProjectRepository):
         ).first()
         return self._to_domain(db_project) if db_project else None
 
+    def get_by_source(self, source_type: str, source_username: str) -> List[Project]:
+        stmt = select(ProjectModel).where(
+            ProjectModel.source_type == source_type,
+            ProjectModel.source_username == source_username
+        )
+        return [self._to_domain(model) for model in self._db.scalars(stmt)]
+
+    def get_by_names_and_source(self, keys: Iterable[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], Project]:
+        keys = list(set(keys))
+        key_columns = (ProjectModel.name, ProjectModel.source_type, ProjectModel.source_username)
+        found: Dict[Tuple[str, str, str], Project] = {}
+        for batch in _batches(keys):
+            stmt = select(ProjectModel).where(tuple_(*key_columns).in_(batch))
+            for model in self._db.scalars(stmt):
+                found[(model.name, model.source_type, model.source_username)] = self._to_domain(model)
+        return found
+
+    def get_sync_fingerprints(self, source_type: str, source_username: str) -> Dict[str, Tuple[int, Optional[str], Optional[datetime]]]:
+        stmt = select(ProjectModel.name, ProjectModel.id, ProjectModel.sync_fingerprint, ProjectModel.synced_at).where(
+            ProjectModel.source_type == source_type,
+            ProjectModel.source_username == source_username
+        )
+        return {name: (project_id, fingerprint, synced_at) for name, project_id, fingerprint, synced_at in self._db.execute(stmt)}
+
+    def mark_synced(self, project_ids: Iterable[int]) -> None:
+        project_ids = list(project_ids)
+        if not project_ids:
+            return
+        for batch in _batches(project_ids):
+            # Not a change of the project itself: updated_at is kept instead of its onupdate
+            self._db.execute(
+                update(ProjectModel)
+                .where(ProjectModel.id.in_(batch))
+                .values(synced_at=func.now(), updated_at=ProjectModel.updated_at)
+            )
+        self._db.commit()
+
     def create(self, project: Project) -> Optional[Project]:
         db_project = ProjectModel(**self._to_db(project))
         self._db.add(db_project)
+        self._db.flush()
+        self._usages.index(USAGE_PROJECT, [db_project])
         self._db.commit()
         self._db.refresh(db_project)
         return self._to_domain(db_project)
@@ -63,16 +119,146 @@ class SQLAlchemyProjectRepository(ProjectRepository):
         
         for key, value in self._to_db(project).items():
             setattr(db_project, key, value)
+        self._usages.index(USAGE_PROJECT, [db_project])
         
         self._db.commit()
         self._db.refresh(db_project)
         return self._to_domain(db_project)
 
+    def bulk_upsert(self, projects: List[Project]) -> List[Project]:
+        """Insert or update many projects, matched on (source_type, source_username, name).
+
+        Everything happens in a single transaction. Only fields that were
+        explicitly set on a project are written to its existing row, so
+        curated fields (display order, visibility, own description, media,
+        ...) survive a sync. Projects that set different fields are written
+        in separate statements; new rows get the defaults for the rest.
+        Results are in the order of the first occurrence of each key.
+        """
+        if not projects:
+            return []
+
+        # ON CONFLICT cannot touch the same row twice in one statement: last one wins
+        latest: Dict[Tuple[Any, ...], Project] = {}
+        for project in projects:
+            latest[tuple(getattr(project, name) for name in UPSERT_KEY)] = project
+
+        # Same set fields -> one group, one statement per batch
+        groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+        for project in latest.values():
+            fields = (project.model_fields_set | set(UPSERT_KEY)) - {"id", "created_at", "updated_at"}
+            data = self._to_db(project)
+            groups.setdefault(frozenset(fields), []).append({name: data[name] for name in fields})
+
+        try:
+            by_key: Dict[Tuple[Any, ...], ProjectModel] = {}
+            for fields, rows in groups.items():
+                if self._db.get_bind().dialect.name == "postgresql":
+                    models = self._upsert_on_conflict(rows, set(fields))
+                else:
+                    models = self._upsert_executemany(rows)
+                if self._usages.touches(USAGE_PROJECT, fields):
+                    self._usages.index(USAGE_PROJECT, models)
+                for model in models:
+                    by_key[tuple(getattr(model, name) for name in UPSERT_KEY)] = model
+            self._db.commit()
+        except Exception:
+            self._db.rollback()
+            raise
+        return [self._to_domain(by_key[key]) for key in latest if key in by_key]
+
+    def upsert(self, project: Project) -> Project:
+        """Single-project bulk_upsert, e.g. for a webhook; curated fields survive the same way."""
+        return self.bulk_upsert([project])[0]
+
+    def _upsert_on_conflict(self, rows: List[Dict[str, Any]], fields: set) -> List[ProjectModel]:
+        """PostgreSQL: INSERT ... ON CONFLICT (source_type, source_username, name) DO UPDATE."""
+        models: List[ProjectModel] = []
+        for batch in _batches(rows):
+            stmt = pg_insert(ProjectModel).values(batch)
+            update_columns = {name: stmt.excluded[name] for name in fields if name not in UPSERT_KEY}
+            update_columns["updated_at"] = func.now()
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(UPSERT_KEY),
+                set_=update_columns
+            ).returning(ProjectModel)
+            models.extend(self._db.scalars(stmt, execution_options={"populate_existing": True}))
+        return models
+
+    def _upsert_executemany(self, rows: List[Dict[str, Any]]) -> List[ProjectModel]:
+        """Portable fallback: look up existing ids, then batched executemany INSERT/UPDATE."""
+        key_columns = [getattr(ProjectModel, name) for name in UPSERT_KEY]
+        keys = [tuple(row[name] for name in UPSERT_KEY) for row in rows]
+
+        existing: Dict[Tuple[Any, ...], int] = {}
+        for batch in _batches(keys):
+            stmt = select(ProjectModel.id, *key_columns).where(tuple_(*key_columns).in_(batch))
+            for project_id, *key in self._db.execute(stmt):
+                existing[tuple(key)] = project_id
+
+        to_update = [{**row, "id": existing[key]} for key, row in zip(keys, rows) if key in existing]
+        to_insert = [row for key, row in zip(keys, rows) if key not in existing]
+        for batch in _batches(to_update):
+            self._db.execute(update(ProjectModel), batch)
+        for batch in _batches(to_insert):
+            self._db.execute(insert(ProjectModel), batch)
+        self._db.flush()
+
+        models: List[ProjectModel] = []
+        for batch in _batches(keys):
+            stmt = select(ProjectModel).where(tuple_(*key_columns).in_(batch))
+            models.extend(self._db.scalars(stmt, execution_options={"populate_existing": True}))
+        return models
+
     def delete(self, project_id: int) -> bool:
         stmt = select(ProjectModel).where(ProjectModel.id == project_id)
         model = self._db.execute(stmt).scalar_one_or_none()
         if model:
+            self._usages.remove(USAGE_PROJECT, [model.id])
             self._db.delete(model)
             self._db.commit()
             return True
-        return False 
\ No newline at end of file
+        return False
+
+
+class AsyncSQLAlchemyProjectRepository(AsyncRepositoryAdapter, ProjectRepository):
+    sync_repository_class = SQLAlchemyProjectRepository
+
+    async def get_by_id(self, project_id: int) -> Optional[Project]:
+        return await self._run("get_by_id", project_id)
+
+    async def get_all(self) -> List[Project]:
+        return await self._run("get_all")
+
+    async def get_visible(self) -> List[Project]:
+        return await self._run("get_visible")
+
+    async def get_by_name_and_source(self, name: str, source_type: str, source_username: str) -> Optional[Project]:
+        return await self._run("get_by_name_and_source", name, source_type, source_username)
+
+    async def get_by_source(self, source_type: str, source_username: str) -> List[Project]:
+        return await self._run("get_by_source", source_type, source_username)
+
+    async def get_by_names_and_source(self, keys: Iterable[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], Project]:
+        return await self._run("get_by_names_and_source", list(keys))
+
+    async def get_sync_fingerprints(self, source_type: str, source_username: str) -> Dict[str, Tuple[int, Optional[str], Optional[datetime]]]:
+        return await self._run("get_sync_fingerprints", source_type, source_username)
+
+    async def mark_synced(self, project_ids: Iterable[int]) -> None:
+        return await self._run("mark_synced", list(project_ids))
+
+    async def create(self, project: Project) -> Project:
+        return await self._run("create", project)
+
+    async def update(self, project_id: int, project: Project) -> Optional[Project]:
+        return await self._run("update", project_id, project)
+
+    async def bulk_upsert(self, projects: List[Project]) -> List[Project]:
+        return await self._run("bulk_upsert", projects)
+
+    async def upsert(self, project: Project) -> Project:
+        return await self._run("upsert", project)
+
+    async def delete(self, project_id: int) -> bool:
+        return await self._run("delete", project_id)
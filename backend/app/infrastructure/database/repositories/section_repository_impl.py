@@ -1,13 +1,19 @@
 from typing import List, Optional
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from app.domain.models.section import Section
 from app.domain.repositories.section_repository import SectionRepository
 from app.infrastructure.database.models.section import SectionModel
+from app.infrastructure.database.repositories.async_base import AsyncRepositoryAdapter
+from app.infrastructure.database.usage_index import FileUsageIndex
+from app.domain.models.file import USAGE_SECTION
+
+class SQLAlchemySectionRepository:
+    """Blocking implementation for the scheduler and scripts, shared by the async one."""
 
-class SQLAlchemySectionRepository(SectionRepository):
     def __init__(self, db: Session):
         self._db = db
+        self._usages = FileUsageIndex(db)
 
     def get(self, section_id: int) -> Optional[Section]:
         """Get a section by ID"""
@@ -31,25 +37,29 @@ class SQLAlchemySectionRepository(SectionRepository):
     def create(self, section: Section) -> Section:
         model = SectionModel(**section.model_dump(exclude={'id'}))
         self._db.add(model)
+        self._db.flush()
+        self._usages.index(USAGE_SECTION, [model])
         self._db.commit()
         self._db.refresh(model)
         return Section.model_validate(model)
 
-    def update(self, section: Section) -> Section:
-        stmt = select(SectionModel).where(SectionModel.id == section.id)
+    def update(self, section_id: int, section: Section) -> Optional[Section]:
+        stmt = select(SectionModel).where(SectionModel.id == section_id)
         model = self._db.execute(stmt).scalar_one_or_none()
         if model:
             for key, value in section.model_dump(exclude={'id'}).items():
                 setattr(model, key, value)
+            self._usages.index(USAGE_SECTION, [model])
             self._db.commit()
             self._db.refresh(model)
             return Section.model_validate(model)
-        return section
+        return None
 
     def delete(self, section_id: int) -> bool:
         stmt = select(SectionModel).where(SectionModel.id == section_id)
         model = self._db.execute(stmt).scalar_one_or_none()
         if model:
+            self._usages.remove(USAGE_SECTION, [model.id])
             self._db.delete(model)
             self._db.commit()
             return True
@@ -74,20 +84,48 @@ class SQLAlchemySectionRepository(SectionRepository):
         # Update other sections' orders
         if new_order > model.display_order:
             self._db.execute(
-                select(SectionModel).where(
+                update(SectionModel).where(
                     SectionModel.display_order > model.display_order,
                     SectionModel.display_order <= new_order
-                ).update({SectionModel.display_order: SectionModel.display_order - 1})
+                ).values(display_order=SectionModel.display_order - 1)
             )
         else:
             self._db.execute(
-                select(SectionModel).where(
+                update(SectionModel).where(
                     SectionModel.display_order >= new_order,
                     SectionModel.display_order < model.display_order
-                ).update({SectionModel.display_order: SectionModel.display_order + 1})
+                ).values(display_order=SectionModel.display_order + 1)
             )
 
         model.display_order = new_order
         self._db.commit()
         self._db.refresh(model)
-        return Section.model_validate(model) 
\ No newline at end of file
+        return Section.model_validate(model)
+
+
+class AsyncSQLAlchemySectionRepository(AsyncRepositoryAdapter, SectionRepository):
+    sync_repository_class = SQLAlchemySectionRepository
+
+    async def get(self, section_id: int) -> Optional[Section]:
+        return await self._run("get", section_id)
+
+    async def get_by_name(self, name: str) -> Optional[Section]:
+        return await self._run("get_by_name", name)
+
+    async def list(self) -> List[Section]:
+        return await self._run("list")
+
+    async def get_visible(self) -> List[Section]:
+        return await self._run("get_visible")
+
+    async def create(self, section: Section) -> Section:
+        return await self._run("create", section)
+
+    async def update(self, section_id: int, section: Section) -> Optional[Section]:
+        return await self._run("update", section_id, section)
+
+    async def delete(self, section_id: int) -> bool:
+        return await self._run("delete", section_id)
+
+    async def reorder(self, section_id: int, new_order: int) -> Optional[Section]:
+        return await self._run("reorder", section_id, new_order)
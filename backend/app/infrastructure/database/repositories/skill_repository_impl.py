@@ -1,12 +1,15 @@
 from typing import List, Optional
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from sqlalchemy import distinct
 from app.domain.models.skill import Skill
 from app.domain.repositories.skill_repository import SkillRepository
 from app.infrastructure.database.models.skill import SkillModel
+from app.infrastructure.database.repositories.async_base import AsyncRepositoryAdapter
+
+class SQLAlchemySkillRepository:
+    """Blocking implementation for the scheduler and scripts, shared by the async one."""
 
-class SQLAlchemySkillRepository(SkillRepository):
     def __init__(self, db: Session):
         self._db = db
 
@@ -15,6 +18,10 @@ class SQLAlchemySkillRepository(SkillRepository):
         model = self._db.execute(stmt).scalar_one_or_none()
         return Skill.model_validate(model) if model else None
 
+    def get(self, skill_id: int) -> Optional[Skill]:
+        """Get a skill by ID"""
+        return self.get_by_id(skill_id)
+
     def get_all(self) -> List[Skill]:
         stmt = select(SkillModel)
         models = self._db.execute(stmt).scalars().all()
@@ -32,8 +39,8 @@ class SQLAlchemySkillRepository(SkillRepository):
         self._db.refresh(model)
         return Skill.model_validate(model)
 
-    def update(self, skill: Skill) -> Skill:
-        stmt = select(SkillModel).where(SkillModel.id == skill.id)
+    def update(self, skill_id: int, skill: Skill) -> Optional[Skill]:
+        stmt = select(SkillModel).where(SkillModel.id == skill_id)
         model = self._db.execute(stmt).scalar_one_or_none()
         if model:
             for key, value in skill.model_dump(exclude={'id'}).items():
@@ -41,7 +48,7 @@ class SQLAlchemySkillRepository(SkillRepository):
             self._db.commit()
             self._db.refresh(model)
             return Skill.model_validate(model)
-        return skill
+        return None
 
     def delete(self, skill_id: int) -> bool:
         stmt = select(SkillModel).where(SkillModel.id == skill_id)
@@ -76,17 +83,17 @@ class SQLAlchemySkillRepository(SkillRepository):
         # Update other skills' orders
         if new_order > model.order:
             self._db.execute(
-                select(SkillModel).where(
+                update(SkillModel).where(
                     SkillModel.order > model.order,
                     SkillModel.order <= new_order
-                ).update({SkillModel.order: SkillModel.order - 1})
+                ).values(order=SkillModel.order - 1)
             )
         else:
             self._db.execute(
-                select(SkillModel).where(
+                update(SkillModel).where(
                     SkillModel.order >= new_order,
                     SkillModel.order < model.order
-                ).update({SkillModel.order: SkillModel.order + 1})
+                ).values(order=SkillModel.order + 1)
             )
 
         model.order = new_order
@@ -98,4 +105,35 @@ class SQLAlchemySkillRepository(SkillRepository):
         """Get all skill categories"""
         stmt = select(distinct(SkillModel.category)).order_by(SkillModel.category)
         categories = self._db.execute(stmt).scalars().all()
-        return [category[0] for category in categories if category[0]] 
\ No newline at end of file
+        return [category for category in categories if category]
+
+
+class AsyncSQLAlchemySkillRepository(AsyncRepositoryAdapter, SkillRepository):
+    sync_repository_class = SQLAlchemySkillRepository
+
+    async def get(self, skill_id: int) -> Optional[Skill]:
+        return await self._run("get", skill_id)
+
+    async def get_by_name(self, name: str) -> Optional[Skill]:
+        return await self._run("get_by_name", name)
+
+    async def list(self) -> List[Skill]:
+        return await self._run("list")
+
+    async def list_by_category(self, category: str) -> List[Skill]:
+        return await self._run("list_by_category", category)
+
+    async def get_categories(self) -> List[str]:
+        return await self._run("get_categories")
+
+    async def create(self, skill: Skill) -> Skill:
+        return await self._run("create", skill)
+
+    async def update(self, skill_id: int, skill: Skill) -> Optional[Skill]:
+        return await self._run("update", skill_id, skill)
+
+    async def delete(self, skill_id: int) -> bool:
+        return await self._run("delete", skill_id)
+
+    async def reorder(self, skill_id: int, new_order: int) -> Optional[Skill]:
+        return await self._run("reorder", skill_id, new_order)
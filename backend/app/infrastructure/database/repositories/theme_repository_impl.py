@@ -4,9 +4,12 @@ from sqlalchemy.orm import Session
 from app.domain.models.theme import Theme
 from app.domain.repositories.theme_repository import ThemeRepository
 from app.infrastructure.database.models.theme import ThemeModel
+from app.infrastructure.database.repositories.async_base import AsyncRepositoryAdapter
 from datetime import datetime
 
-class SQLAlchemyThemeRepository(ThemeRepository):
+class SQLAlchemyThemeRepository:
+    """Blocking implementation for the scheduler and scripts, shared by the async one."""
+
     def __init__(self, db: Session):
         self._db = db
 
@@ -80,3 +83,34 @@ class SQLAlchemyThemeRepository(ThemeRepository):
 
     def set_default(self, theme_id: int):
         raise NotImplementedError("set_default wird nicht verwendet, nutze is_active stattdessen.")
+
+
+class AsyncSQLAlchemyThemeRepository(AsyncRepositoryAdapter, ThemeRepository):
+    sync_repository_class = SQLAlchemyThemeRepository
+
+    async def create(self, theme: Theme) -> Theme:
+        return await self._run("create", theme)
+
+    async def get(self, theme_id: int) -> Optional[Theme]:
+        return await self._run("get", theme_id)
+
+    async def get_all(self) -> List[Theme]:
+        return await self._run("get_all")
+
+    async def update(self, theme_id: int, theme: Theme) -> Optional[Theme]:
+        return await self._run("update", theme_id, theme)
+
+    async def delete(self, theme_id: int) -> bool:
+        return await self._run("delete", theme_id)
+
+    async def get_by_name(self, name: str) -> Optional[Theme]:
+        return await self._run("get_by_name", name)
+
+    async def get_active(self) -> List[Theme]:
+        return await self._run("get_active")
+
+    async def get_default(self) -> Optional[Theme]:
+        return await self._run("get_default")
+
+    async def set_default(self, theme_id: int) -> Optional[Theme]:
+        return await self._run("set_default", theme_id)
@@ -1,7 +1,8 @@
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 import os
+from app.infrastructure.database.pool import create_pooled_engine, create_pooled_async_engine
 
 # Use the DATABASE_URL from environment variables
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
@@ -9,9 +10,17 @@ SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 if not SQLALCHEMY_DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is not set")
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Separate pools so a running sync cannot exhaust the connections of the API
+engine = create_pooled_engine(SQLALCHEMY_DATABASE_URL, role="api")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Request path: asyncpg, so a slow query never blocks the event loop
+async_engine = create_pooled_async_engine(SQLALCHEMY_DATABASE_URL, role="api_async")
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+scheduler_engine = create_pooled_engine(SQLALCHEMY_DATABASE_URL, role="scheduler")
+SchedulerSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=scheduler_engine)
+
 Base = declarative_base()
 
 
@@ -0,0 +1,86 @@
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+from app.domain.models.file import USAGE_PROJECT, USAGE_POST, USAGE_SECTION
+from app.infrastructure.database.models.file_usage import FileUsageModel
+from app.infrastructure.storage.uploads import UPLOADS_URL_PREFIX
+
+# Fields that can reference uploads, per owner type: URL fields, URL lists,
+# markdown / text bodies and free-form JSON
+USAGE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    USAGE_PROJECT: (
+        "thumbnail_url", "gallery_urls", "gif_urls", "video_url",
+        "description", "own_description", "short_description", "highlight",
+        "learnings", "challenges", "deployment_notes", "changelog",
+    ),
+    USAGE_POST: (
+        "cover_image_url", "gallery_urls", "video_url", "audio_url",
+        "content_markdown", "excerpt",
+    ),
+    USAGE_SECTION: ("content", "section_metadata"),
+}
+
+# An upload URL anywhere in a value, absolute or relative; stops at markdown / HTML delimiters
+_UPLOAD_URL = re.compile(re.escape(UPLOADS_URL_PREFIX) + r"/[^\s\"'()<>\[\]?#]+")
+
+
+def _strings(value: Any) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _strings(item)
+
+
+def upload_references(values: Dict[str, Any]) -> Set[Tuple[str, str]]:
+    """(field, upload path) pairs found in the given field values."""
+    references = set()
+    for field, value in values.items():
+        for text in _strings(value):
+            if UPLOADS_URL_PREFIX in text:
+                references.update((field, match.group(0)) for match in _UPLOAD_URL.finditer(text))
+    return references
+
+
+class FileUsageIndex:
+    """Keeps file_usages in step with content writes.
+
+    Called by the project, post and section repositories inside their own
+    transaction, so the index never disagrees with committed content.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def index(self, owner_type: str, models: Iterable[Any]) -> None:
+        """Replace the usages of the given rows with what their fields reference now."""
+        fields = USAGE_FIELDS[owner_type]
+        owners = {model.id: {field: getattr(model, field, None) for field in fields} for model in models}
+        if not owners:
+            return
+        self.remove(owner_type, owners)
+        rows: List[Dict[str, Any]] = [
+            {"owner_type": owner_type, "owner_id": owner_id, "field": field, "path": path}
+            for owner_id, values in owners.items()
+            for field, path in sorted(upload_references(values))
+        ]
+        if rows:
+            self.db.execute(insert(FileUsageModel), rows)
+
+    def remove(self, owner_type: str, owner_ids: Iterable[int]) -> None:
+        owner_ids = list(owner_ids)
+        if owner_ids:
+            self.db.execute(
+                delete(FileUsageModel).where(
+                    FileUsageModel.owner_type == owner_type,
+                    FileUsageModel.owner_id.in_(owner_ids)
+                )
+            )
+
+    def touches(self, owner_type: str, fields: Iterable[str]) -> bool:
+        """Whether writing these fields can change the usages of an owner."""
+        return not set(fields).isdisjoint(USAGE_FIELDS[owner_type])
@@ -1,134 +1,378 @@
-from datetime import datetime
-from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass, field, asdict, replace
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from app.domain.models.project import Project, ProjectStatus
-from app.core.github import fetch_user_repositories, fetch_languages
-from app.core.gitlab import fetch_user_repositories as fetch_gitlab_repositories
+from app.core.github import GITHUB_TOKEN, fetch_repository_async, fetch_user_repositories_async, rate_limit_budget
+from app.core.github_graphql import fetch_user_repositories_graphql
+from app.core.gitlab import fetch_project_async as fetch_gitlab_project_async
+from app.core.gitlab import fetch_user_repositories_async as fetch_gitlab_repositories_async
+from app.core.pagination import conditional_cache
+from app.infrastructure.cache.response_cache import public_cache, invalidate_project, PROJECTS
+import os
+import hashlib
+import json
 import logging
-from typing import List
-from app.infrastructure.database.repositories.project_repository_impl import SQLAlchemyProjectRepository
+from typing import Any, Dict, List, Optional
+from app.infrastructure.database.repositories.project_repository_impl import AsyncSQLAlchemyProjectRepository
 
 logger = logging.getLogger(__name__)
 
+# rest: repository list plus /releases and /languages per repository (1 + 2N calls)
+# graphql: everything in one query per 100 repositories; needs a token
+GITHUB_SYNC_BACKEND = os.getenv("GITHUB_SYNC_BACKEND", "rest").strip().lower()
+SYNC_BACKENDS = ("rest", "graphql")
+
+# Fields that are managed by the database, not by the remote source
+FINGERPRINT_EXCLUDED_FIELDS = {"id", "created_at", "updated_at", "sync_fingerprint", "synced_at"}
+
+# A repository whose listing entry looks unchanged is still enriched again
+# once its last comparison with the full payload is older than this
+SYNC_REENRICH_HOURS = float(os.getenv("SYNC_REENRICH_HOURS", "168"))
+
+
+@dataclass
+class SyncResult:
+    """Outcome of one sync run."""
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    # Projects removed because their repository is gone (single-repository syncs only)
+    deleted: int = 0
+    # Repositories left as stored because the rate limit budget ran out
+    deferred: int = 0
+    projects: List[Project] = field(default_factory=list)
+    # Requests, retries and waits of this run against the API rate limit
+    rate_limit: Dict[str, Any] = field(default_factory=dict)
+
+
+# Hex digits of each fingerprint half; both halves fit the 64 characters of the column
+FINGERPRINT_HALF = 32
+
+
+def _digest(payload: Dict[str, Any]) -> str:
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:FINGERPRINT_HALF]
+
+
+def listing_fingerprint(project: Project, repo: Dict[str, Any]) -> str:
+    """Hash what the repository listing alone tells about a project.
+
+    Leaves out the status, which depends on `/releases`, so it is the same
+    before and after enrichment. That is also its blind spot: a release
+    published without a later push (e.g. the first non-prerelease one, which
+    turns a WIP project ACTIVE) leaves the listing entry as it was. Such a
+    change is picked up by the `release` webhook, or by the periodic sync
+    once the project's last full comparison is older than
+    SYNC_REENRICH_HOURS; until then the stored status can be stale.
+    """
+    payload = project.model_dump(mode="json", exclude=FINGERPRINT_EXCLUDED_FIELDS | {"status"})
+    payload["archived"] = bool(repo.get("archived"))
+    payload["pushed_at"] = repo.get("pushed_at") or repo.get("last_activity_at")
+    return _digest(payload)
+
+
+def compute_fingerprint(project: Project, repo: Dict[str, Any]) -> str:
+    """Listing fingerprint followed by a hash of all mapped fields plus the push timestamp.
+
+    The mapped fields already carry updated_at (`last_updated`) and the star
+    count, so two runs produce the same fingerprint only if nothing we store
+    changed remotely. The first half alone lets a sync skip enriching a
+    repository whose listing entry did not change.
+    """
+    payload = project.model_dump(mode="json", exclude=FINGERPRINT_EXCLUDED_FIELDS)
+    payload["pushed_at"] = repo.get("pushed_at") or repo.get("last_activity_at")
+    return listing_fingerprint(project, repo) + _digest(payload)
+
+
 class SyncService:
-    def __init__(self, db: Session):
-        self._db = db
-        self._project_repository = SQLAlchemyProjectRepository(db)
-
-    async def sync_projects(self, username: str, source_type: str = "github") -> List[Project]:
-        """Sync projects from external source (GitHub/GitLab)"""
-        logger.info(f"Syncing projects for {username} from {source_type}")
-        
-        repos = fetch_user_repositories(username) if source_type == "github" else fetch_gitlab_repositories(username)
-        if not repos:
-            logger.warning(f"No repositories found for {username} on {source_type}")
-            return []
-
-        synced_projects = []
-        for repo in repos:
-            if not repo:
-                continue
-                
-            # Log repository status
-            is_archived = repo.get('archived', False)
-            has_release = repo.get('has_releases', False)
-            is_prerelease = repo.get('is_prerelease', False)
-            
-            # Set status based on archived and release status
-            if is_archived:
-                status = ProjectStatus.ARCHIVED
-            elif has_release and not is_prerelease:
-                status = ProjectStatus.ACTIVE
-            else:
-                status = ProjectStatus.WIP
-                
+    """Fetch repositories from GitHub/GitLab and upsert the changed projects.
+
+    Runs on the app's event loop. Database sessions come from the shared async
+    pool and are only held while reading fingerprints and while writing, not
+    during the remote fetch. `http_clients` maps a source type (and
+    "github_graphql") to a shared client; without one, a client is opened for
+    the run. `github_backend` selects how GitHub is fetched, both backends
+    produce the same repository payloads.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        http_clients: Optional[Dict[str, httpx.AsyncClient]] = None,
+        github_backend: str = GITHUB_SYNC_BACKEND
+    ):
+        if github_backend not in SYNC_BACKENDS:
+            raise ValueError(f"Unknown GitHub sync backend {github_backend}. Use one of {', '.join(SYNC_BACKENDS)}")
+        if github_backend == "graphql" and not GITHUB_TOKEN:
+            logger.warning("The GitHub GraphQL API requires a token; syncing over REST")
+            github_backend = "rest"
+        self._session_factory = session_factory
+        self._http_clients = http_clients or {}
+        self._github_backend = github_backend
+
+    def _build_project(self, repo: Dict[str, Any], source_type: str, log: bool = True) -> Project:
+        """Map a GitHub/GitLab repository payload to a Project.
+
+        `log=False` for the pre-enrichment check, which would log a status
+        without release information.
+        """
+        # Log repository status
+        is_archived = repo.get('archived', False)
+        has_release = repo.get('has_releases', False)
+        is_prerelease = repo.get('is_prerelease', False)
+
+        # Set status based on archived and release status
+        if is_archived:
+            status = ProjectStatus.ARCHIVED
+        elif has_release and not is_prerelease:
+            status = ProjectStatus.ACTIVE
+        else:
+            status = ProjectStatus.WIP
+
+        # Languages map is fetched concurrently by the GitHub fetcher
+        languages_map = repo.get("languages_map", {}) or {}
+        if log:
             logger.info(f"Repository {repo.get('name', '')} is {status} on {source_type} (archived: {is_archived}, has_release: {has_release}, is_prerelease: {is_prerelease})")
-            
             # Log language information
-            primary_language = repo.get("language")
-            logger.info(f"Repository {repo.get('name', '')} primary language: {primary_language}")
-            
-            # Get languages map from GitHub API
-            languages_map = {}
+            logger.info(f"Repository {repo.get('name', '')} primary language: {repo.get('language')}")
             if source_type == "github":
-                owner = repo.get("owner", {}).get("login")
-                repo_name = repo.get("name")
-                if owner and repo_name:
-                    try:
-                        languages_map = fetch_languages(owner, repo_name)
-                        logger.info(f"Repository {repo_name} languages map: {languages_map}")
-                    except Exception as e:
-                        logger.error(f"Failed to fetch languages for {repo_name}: {str(e)}")
-            
-            # GitHub/GitLab liefert topics als Liste, das ist genau was wir brauchen
-            topics = repo.get("topics", []) or []
-            
-            # Extrahiere owner/namespace Daten
-            owner = repo.get("owner", {}) or {}
-            namespace = repo.get("namespace", {}) or {}
-            
-            project = Project(
-                name=repo.get("name", ""),
-                description=repo.get("description") or "",
-                status=status,
-                source_type=source_type,
-                source_url=repo.get("html_url") or repo.get("web_url"),
-                source_username=owner.get("login") if source_type == "github" else namespace.get("username"),
-                source_repo=repo.get("name") if source_type == "github" else repo.get("path"),
-                live_url=repo.get("homepage"),
-                thumbnail_url=owner.get("avatar_url") or namespace.get("avatar_url"),
-                details={
-                    "default_branch": repo.get("default_branch"),
-                    "open_issues": repo.get("open_issues_count", 0),
-                    "license": repo.get("license", {}).get("name") if repo.get("license") else None,
-                    "size": repo.get("size"),
-                    "has_wiki": repo.get("has_wiki", False),
-                    "has_pages": repo.get("has_pages", False),
-                    "languages_map": languages_map,
-                    "fields_visibility": {
-                        "title": True,
-                        "description": True,
-                        "imageUrl": True,
-                        "githubUrl": True,
-                        "liveUrl": True,
-                        "technologies": True,
-                        "status": True,
-                        "language": True,
-                        "topics": True,
-                        "starsCount": True,
-                        "forksCount": True,
-                        "watchersCount": True,
-                        "homepageUrl": True
-                    }
-                },
-                display_order=0,
-                is_visible=True,
-                stars_count=repo.get("stargazers_count", 0) or repo.get("star_count", 0),
-                forks_count=repo.get("forks_count", 0),
-                watchers_count=repo.get("watchers_count", 0),
-                language=repo.get("language"),
-                topics=topics,
-                last_updated=repo.get("updated_at"),
-                homepage_url=repo.get("homepage"),
-                open_issues_count=repo.get("open_issues_count", 0),
-                default_branch=repo.get("default_branch")
-            )
-
-            existing = self._project_repository.get_by_name_and_source(
-                name=repo.get("name", ""),
-                source_type=source_type,
-                source_username=username
-            )
+                logger.info(f"Repository {repo.get('name', '')} languages map: {languages_map}")
 
+        # GitHub/GitLab liefert topics als Liste, das ist genau was wir brauchen
+        topics = repo.get("topics", []) or []
+
+        # Extrahiere owner/namespace Daten
+        owner = repo.get("owner", {}) or {}
+        namespace = repo.get("namespace", {}) or {}
+
+        # Only what the remote source knows is set: the upsert writes exactly
+        # the fields set here, so ordering, visibility and the other curated
+        # fields of an existing project stay as they are. A missing remote
+        # description does not blank a stored one; curated text belongs in
+        # own_description.
+        remote_description = {"description": repo["description"]} if repo.get("description") else {}
+        return Project(
+            name=repo.get("name", ""),
+            **remote_description,
+            status=status,
+            source_type=source_type,
+            source_url=repo.get("html_url") or repo.get("web_url"),
+            source_username=owner.get("login") if source_type == "github" else namespace.get("username"),
+            source_repo=repo.get("name") if source_type == "github" else repo.get("path"),
+            live_url=repo.get("homepage"),
+            thumbnail_url=owner.get("avatar_url") or namespace.get("avatar_url"),
+            details={
+                "default_branch": repo.get("default_branch"),
+                "open_issues": repo.get("open_issues_count", 0),
+                "license": repo.get("license", {}).get("name") if repo.get("license") else None,
+                "size": repo.get("size"),
+                "has_wiki": repo.get("has_wiki", False),
+                "has_pages": repo.get("has_pages", False),
+                "languages_map": languages_map,
+            },
+            stars_count=repo.get("stargazers_count", 0) or repo.get("star_count", 0),
+            forks_count=repo.get("forks_count", 0),
+            watchers_count=repo.get("watchers_count", 0),
+            language=repo.get("language"),
+            topics=topics,
+            last_updated=repo.get("updated_at"),
+            homepage_url=repo.get("homepage"),
+            open_issues_count=repo.get("open_issues_count", 0),
+            default_branch=repo.get("default_branch")
+        )
+
+    async def sync_projects(self, username: str, source_type: str = "github") -> SyncResult:
+        """Sync projects from external source (GitHub/GitLab).
+
+        Runs in delta mode: only projects whose fingerprint differs from the
+        stored one are written. Over REST, repositories whose listing entry is
+        unchanged are not enriched unless their `synced_at` is older than
+        SYNC_REENRICH_HOURS; projects found unchanged after enrichment only
+        get their `synced_at` refreshed.
+        """
+        backend = f" over {self._github_backend}" if source_type == "github" else ""
+        logger.info(f"Syncing projects for {username} from {source_type}{backend}")
+        result = SyncResult()
+
+        changed: List[Project] = []
+        verified: List[int] = []
+        now = datetime.now(timezone.utc)
+        reenrich_before = now - timedelta(hours=SYNC_REENRICH_HOURS)
+        graphql = source_type == "github" and self._github_backend == "graphql"
+        budget = rate_limit_budget(resource="graphql" if graphql else "core") if source_type == "github" else None
+        usage_before = replace(budget.usage) if budget else None
+        try:
+            # name -> (id, fingerprint, synced_at) of the projects we already know, in one query
+            async with self._session_factory() as db:
+                known = await AsyncSQLAlchemyProjectRepository(db).get_sync_fingerprints(
+                    source_type=source_type,
+                    source_username=username
+                )
+
+            def listing_unchanged(repo: Dict[str, Any]) -> bool:
+                """Whether the listing entry matches a recently verified fingerprint; such repos are not enriched."""
+                _, stored, synced_at = known.get(repo.get("name")) or (None, None, None)
+                if not stored or not synced_at or synced_at < reenrich_before:
+                    return False
+                listed = self._build_project(repo, source_type, log=False)
+                return stored[:FINGERPRINT_HALF] == listing_fingerprint(listed, repo)
+
+            client = self._http_clients.get(source_type)
+            if graphql:
+                repos = await fetch_user_repositories_graphql(username, client=self._http_clients.get("github_graphql"))
+            elif source_type == "github":
+                repos = await fetch_user_repositories_async(username, client=client, is_unchanged=listing_unchanged)
+            else:
+                repos = await fetch_gitlab_repositories_async(username, client=client)
+            if not repos:
+                logger.warning(f"No repositories found for {username} on {source_type}")
+                return result
+
+            for repo in repos:
+                if not repo:
+                    continue
+                if repo.get("not_modified"):
+                    # Listing page answered 304, or the listing entry matches the
+                    # stored fingerprint: nothing changed since the last sync
+                    result.unchanged += 1
+                    continue
+                if repo.get("enrichment_deferred"):
+                    result.deferred += 1
+                    continue
+
+                project = self._build_project(repo, source_type)
+                project.sync_fingerprint = compute_fingerprint(project, repo)
+                project.synced_at = now
+
+                existing = known.get(project.name)
+                if existing and existing[1] == project.sync_fingerprint:
+                    result.unchanged += 1
+                    verified.append(existing[0])
+                    continue
+
+                if existing:
+                    logger.info(f"Updating existing project: {project.name}")
+                    result.updated += 1
+                else:
+                    logger.info(f"Creating new project: {project.name}")
+                    result.created += 1
+                changed.append(project)
+
+            if changed:
+                # One transaction for the whole run; a failure leaves the table untouched
+                async with self._session_factory() as db:
+                    result.projects = await AsyncSQLAlchemyProjectRepository(db).bulk_upsert(changed)
+                await public_cache.invalidate(PROJECTS)
+            if verified:
+                async with self._session_factory() as db:
+                    await AsyncSQLAlchemyProjectRepository(db).mark_synced(verified)
+            if result.deferred:
+                # Deferred repositories must not be skipped as "not modified" next time
+                conditional_cache.clear()
+        except BaseException:
+            # Also on cancellation or timeout: forget cached listing pages so the
+            # next run re-processes every repository
+            conditional_cache.clear()
+            raise
+        finally:
+            if budget:
+                result.rate_limit = {
+                    **asdict(budget.usage - usage_before),
+                    "limit": budget.limit,
+                    "remaining": budget.remaining,
+                    "reset_at": budget.reset_at,
+                }
+
+        logger.info(
+            f"Successfully synced projects for {username} from {source_type}: "
+            f"{result.created} created, {result.updated} updated, {result.unchanged} unchanged, "
+            f"{result.deferred} deferred; rate limit: {result.rate_limit or 'n/a'}"
+        )
+        return result
+
+    async def sync_repository(self, username: str, repo_name: str, source_type: str = "github") -> SyncResult:
+        """Refresh the project of a single repository, e.g. after a webhook event.
+
+        `repo_name` is the repository name on GitHub and the project path on
+        GitLab. Like a full sync, an unchanged fingerprint writes nothing. A
+        GitHub repository that is gone or no longer public is removed; on
+        GitLab, where the path alone does not identify the stored project by
+        name, that is left to the next full sync. Only the listings and the
+        affected project are dropped from the response cache.
+        """
+        logger.info(f"Syncing {username}/{repo_name} from {source_type}")
+        result = SyncResult()
+        budget = rate_limit_budget() if source_type == "github" else None
+        usage_before = replace(budget.usage) if budget else None
+        try:
+            client = self._http_clients.get(source_type)
+            if source_type == "github":
+                repo = await fetch_repository_async(username, repo_name, client=client)
+            else:
+                repo = await fetch_gitlab_project_async(f"{username}/{repo_name}", client=client)
+
+            if repo is None:
+                if source_type == "github":
+                    await self._delete_project(repo_name, source_type, username, result)
+                else:
+                    logger.warning(f"{username}/{repo_name} not found on {source_type}; left to the next full sync")
+                return result
+            if repo.get("enrichment_deferred"):
+                # The next webhook or the periodic sync picks it up
+                result.deferred += 1
+                return result
+
+            project = self._build_project(repo, source_type)
+            project.sync_fingerprint = compute_fingerprint(project, repo)
+            project.synced_at = datetime.now(timezone.utc)
+            async with self._session_factory() as db:
+                repository = AsyncSQLAlchemyProjectRepository(db)
+                existing = await repository.get_by_name_and_source(project.name, source_type, username)
+                if existing and existing.sync_fingerprint == project.sync_fingerprint:
+                    await repository.mark_synced([existing.id])
+                    result.unchanged += 1
+                    return result
+                saved = await repository.upsert(project)
             if existing:
-                logger.info(f"Updating existing project: {repo.get('name', '')}")
-                updated_project = self._project_repository.update(existing.id, project)
-                if updated_project:
-                    synced_projects.append(updated_project)
+                result.updated += 1
             else:
-                logger.info(f"Creating new project: {repo.get('name', '')}")
-                created_project = self._project_repository.create(project)
-                if created_project:
-                    synced_projects.append(created_project)
+                result.created += 1
+            result.projects = [saved]
+            await invalidate_project(public_cache, saved.id)
+        finally:
+            if budget:
+                result.rate_limit = asdict(budget.usage - usage_before)
+
+        logger.info(
+            f"Synced {username}/{repo_name} from {source_type}: "
+            f"{'created' if result.created else 'updated'} project {result.projects[0].id}"
+        )
+        return result
+
+    async def _delete_project(self, name: str, source_type: str, username: str, result: SyncResult) -> None:
+        async with self._session_factory() as db:
+            repository = AsyncSQLAlchemyProjectRepository(db)
+            existing = await repository.get_by_name_and_source(name, source_type, username)
+            if existing is None:
+                return
+            await repository.delete(existing.id)
+        logger.info(f"Deleted project {existing.id}: {username}/{name} is gone from {source_type}")
+        result.deleted += 1
+        await invalidate_project(public_cache, existing.id)
 
-        logger.info(f"Successfully synced {len(synced_projects)} projects")
-        return synced_projects 
\ No newline at end of file
+    async def rename_project(self, username: str, old_name: str, new_name: str, source_type: str = "github") -> Optional[Project]:
+        """Carry a stored project over to a renamed repository, keeping its curated fields."""
+        async with self._session_factory() as db:
+            repository = AsyncSQLAlchemyProjectRepository(db)
+            existing = await repository.get_by_name_and_source(old_name, source_type, username)
+            if existing is None or await repository.get_by_name_and_source(new_name, source_type, username):
+                return None
+            existing.name = new_name
+            existing.source_repo = new_name
+            # The refresh after the rename recomputes it
+            existing.sync_fingerprint = None
+            project = await repository.update(existing.id, existing)
+        logger.info(f"Renamed project {existing.id}: {username}/{old_name} -> {new_name} on {source_type}")
+        await invalidate_project(public_cache, existing.id)
+        return project
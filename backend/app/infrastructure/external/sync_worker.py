@@ -0,0 +1,258 @@
+import os
+import time
+import asyncio
+import logging
+from concurrent.futures import Future as ThreadFuture
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+from app.core.github import create_github_client
+from app.core.gitlab import create_gitlab_client
+from app.infrastructure.database.session import AsyncSessionLocal
+from app.infrastructure.external.sync_service import SyncService, SyncResult
+
+logger = logging.getLogger(__name__)
+
+# A run taking longer than this is cancelled
+SYNC_TIMEOUT_SECONDS = float(os.getenv("SYNC_TIMEOUT_SECONDS", "600"))
+# Finished runs kept for the status endpoint
+SYNC_HISTORY_SIZE = 20
+
+RUN_QUEUED = "queued"
+RUN_RUNNING = "running"
+RUN_SUCCESS = "success"
+RUN_ERROR = "error"
+RUN_TIMEOUT = "timeout"
+RUN_CANCELLED = "cancelled"
+
+
+@dataclass
+class SyncRun:
+    """One requested sync of a user's repositories, or of one of them, on GitHub or GitLab."""
+    username: str
+    source_type: str
+    reason: str
+    requested_at: float
+    # Only this repository (name on GitHub, path on GitLab); None for all of them
+    repo: Optional[str] = None
+    status: str = RUN_QUEUED
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    result: Optional[SyncResult] = None
+    # Resolved with the run itself once it is finished, whatever the outcome
+    done: Optional[asyncio.Future] = field(default=None, repr=False)
+
+    @property
+    def key(self) -> Tuple[str, str, Optional[str]]:
+        return self.source_type, self.username, self.repo
+
+    @property
+    def label(self) -> str:
+        return f"{self.username}/{self.repo}" if self.repo else self.username
+
+    @property
+    def duration_ms(self) -> Optional[int]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return int((self.finished_at - self.started_at) * 1000)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "username": self.username,
+            "source_type": self.source_type,
+            "repo": self.repo,
+            "reason": self.reason,
+            "status": self.status,
+            "requested_at": self.requested_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_ms": self.duration_ms,
+            "error": self.error,
+            "created": self.result.created if self.result else None,
+            "updated": self.result.updated if self.result else None,
+            "unchanged": self.result.unchanged if self.result else None,
+            "deleted": self.result.deleted if self.result else None,
+            "deferred": self.result.deferred if self.result else None,
+            "rate_limit": self.result.rate_limit if self.result else None,
+        }
+
+
+class SyncWorker:
+    """Runs project syncs one at a time on the app's event loop.
+
+    Syncs are requested through a queue. A request for a user and source that
+    is already queued or running joins that run instead of adding another, so
+    a scheduled sync and a click in the admin never fetch the same data twice;
+    likewise a burst of webhooks for one repository refreshes it once.
+    The HTTP clients live as long as the worker and share their connections
+    across runs; database sessions come from the app's async pool. Each run
+    is bounded by a timeout and can be cancelled.
+    """
+
+    def __init__(self, timeout: float = SYNC_TIMEOUT_SECONDS):
+        self._timeout = timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumer: Optional[asyncio.Task] = None
+        self._current: Optional[Tuple[SyncRun, asyncio.Task]] = None
+        # Queued or running, by (source type, username, repository)
+        self._active: Dict[Tuple[str, str, Optional[str]], SyncRun] = {}
+        self._history: List[SyncRun] = []
+        self._http_clients: Dict[str, httpx.AsyncClient] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._consumer is not None and not self._consumer.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._http_clients = {
+            "github": create_github_client(),
+            "github_graphql": create_github_client(resource="graphql"),
+            "gitlab": create_gitlab_client(),
+        }
+        self._consumer = asyncio.create_task(self._consume(), name="sync-worker")
+        logger.info("Sync worker started")
+
+    async def stop(self) -> None:
+        if self._consumer is None:
+            return
+        self.cancel()
+        self._consumer.cancel()
+        await asyncio.gather(self._consumer, return_exceptions=True)
+        self._consumer = None
+        for client in self._http_clients.values():
+            await client.aclose()
+        self._http_clients = {}
+        logger.info("Sync worker stopped")
+
+    def trigger(
+        self,
+        username: str,
+        source_type: str = "github",
+        reason: str = "manual",
+        repo: Optional[str] = None
+    ) -> SyncRun:
+        """Queue a sync, or return the queued one for the same user, source and repository.
+
+        A queued run is joined; a running one is not, since it may have
+        fetched the repository before the change that triggered this request.
+        """
+        if not self.running:
+            raise RuntimeError("Sync worker is not running")
+        run = self._active.get((source_type, username, repo))
+        if run is not None and (run.status == RUN_QUEUED or repo is None):
+            logger.debug(f"Sync of {run.label} on {source_type} already {run.status}; joining it")
+            return run
+        run = SyncRun(
+            username=username,
+            source_type=source_type,
+            reason=reason,
+            requested_at=time.time(),
+            repo=repo,
+            done=self._loop.create_future()
+        )
+        self._active[run.key] = run
+        self._queue.put_nowait(run)
+        return run
+
+    async def run(self, username: str, source_type: str = "github", reason: str = "manual") -> SyncRun:
+        """Trigger a sync and wait until it is finished."""
+        run = self.trigger(username, source_type, reason)
+        # A waiter that goes away (client disconnect) must not cancel the run
+        return await asyncio.shield(run.done)
+
+    def run_threadsafe(self, username: str, source_type: str = "github", reason: str = "scheduled") -> ThreadFuture:
+        """`run` from another thread, e.g. a scheduler job; returns a concurrent future."""
+        if self._loop is None or not self.running:
+            raise RuntimeError("Sync worker is not running")
+        return asyncio.run_coroutine_threadsafe(self.run(username, source_type, reason), self._loop)
+
+    def cancel(self, username: Optional[str] = None, source_type: Optional[str] = None) -> int:
+        """Cancel queued and running syncs, optionally only those of one user / source."""
+        cancelled = 0
+        runs = list(self._active.values())
+        if self._current is not None and self._current[0] not in runs:
+            # A running single-repository sync already superseded by a queued one
+            runs.append(self._current[0])
+        for run in runs:
+            if username is not None and run.username != username:
+                continue
+            if source_type is not None and run.source_type != source_type:
+                continue
+            if self._current is not None and self._current[0] is run:
+                self._current[1].cancel()
+            else:
+                # Still queued: the consumer skips it
+                self._finish(run, RUN_CANCELLED)
+            cancelled += 1
+        return cancelled
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "timeout_seconds": self._timeout,
+            "current": self._current[0].to_dict() if self._current else None,
+            "queued": [run.to_dict() for run in self._active.values() if run.status == RUN_QUEUED],
+            "history": [run.to_dict() for run in reversed(self._history)],
+        }
+
+    async def _consume(self) -> None:
+        while True:
+            run = await self._queue.get()
+            if run.status != RUN_QUEUED:
+                continue
+            task = asyncio.create_task(self._execute(run), name=f"sync-{run.source_type}-{run.label}")
+            self._current = (run, task)
+            try:
+                # wait() instead of awaiting the task: cancelling the run must
+                # not look like cancelling the consumer
+                await asyncio.wait({task})
+            except asyncio.CancelledError:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                raise
+            finally:
+                self._current = None
+            if task.cancelled():
+                self._finish(run, RUN_CANCELLED)
+
+    async def _execute(self, run: SyncRun) -> None:
+        run.status = RUN_RUNNING
+        run.started_at = time.time()
+        service = SyncService(AsyncSessionLocal, self._http_clients)
+        try:
+            async with asyncio.timeout(self._timeout):
+                if run.repo is not None:
+                    run.result = await service.sync_repository(run.username, run.repo, run.source_type)
+                else:
+                    run.result = await service.sync_projects(run.username, run.source_type)
+        except TimeoutError:
+            logger.error(f"Sync of {run.label} on {run.source_type} timed out after {self._timeout}s")
+            self._finish(run, RUN_TIMEOUT, f"Timed out after {self._timeout}s")
+        except Exception as e:
+            logger.error(f"Failed to sync projects for {run.label} on {run.source_type}: {str(e)}")
+            self._finish(run, RUN_ERROR, str(e))
+        else:
+            self._finish(run, RUN_SUCCESS)
+
+    def _finish(self, run: SyncRun, status: str, error: Optional[str] = None) -> None:
+        if run.finished_at is not None:
+            return
+        run.status = status
+        run.error = error
+        run.finished_at = time.time()
+        if self._active.get(run.key) is run:
+            del self._active[run.key]
+        self._history = (self._history + [run])[-SYNC_HISTORY_SIZE:]
+        if run.done is not None and not run.done.done():
+            run.done.set_result(run)
+        if status == RUN_SUCCESS:
+            logger.info(f"Sync of {run.label} on {run.source_type} finished in {run.duration_ms} ms")
+
+
+sync_worker = SyncWorker()
@@ -0,0 +1,138 @@
+import os
+import socket
+import logging
+import threading
+from typing import Callable, Optional
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql import table, column
+from app.infrastructure.database.session import SQLALCHEMY_DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+# Key of the PostgreSQL advisory lock held by the scheduler leader ("abou")
+SCHEDULER_LOCK_KEY = 0x61626F75
+# How often followers try to take over, and the leader checks it still holds the lock
+SCHEDULER_LEADER_CHECK_SECONDS = float(os.getenv("SCHEDULER_LEADER_CHECK_SECONDS", "30"))
+# Shown as application_name of the lock connection, so the leader is visible in pg_stat_activity
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}"
+APPLICATION_NAME = f"aboutme-scheduler {INSTANCE_ID}"
+
+
+class SchedulerLeader:
+    """Elects one scheduler per database among all workers and replicas.
+
+    Each process tries `pg_try_advisory_lock` on its own connection; the one
+    that gets it runs `on_elected`. The lock lives as long as that connection,
+    so when the leader process dies PostgreSQL releases it and a follower takes
+    over on its next check. A leader that loses its connection runs
+    `on_demoted` and competes again.
+    """
+
+    def __init__(
+        self,
+        on_elected: Callable[[], None],
+        on_demoted: Callable[[], None],
+        check_seconds: float = SCHEDULER_LEADER_CHECK_SECONDS,
+        lock_key: int = SCHEDULER_LOCK_KEY
+    ):
+        self._on_elected = on_elected
+        self._on_demoted = on_demoted
+        self._check_seconds = check_seconds
+        self._lock_key = lock_key
+        # One unpooled connection, outside the pools the jobs and the API use
+        self._engine = create_engine(
+            SQLALCHEMY_DATABASE_URL,
+            poolclass=NullPool,
+            connect_args={"application_name": APPLICATION_NAME}
+        )
+        self._connection: Optional[Connection] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._connection is not None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="scheduler-leader", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self.is_leader:
+            self._demote()
+        self._engine.dispose()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.is_leader:
+                    self._check_lock()
+                else:
+                    self._try_acquire()
+            except Exception as e:
+                logger.error(f"Scheduler leader election failed: {str(e)}")
+            self._stop.wait(self._check_seconds)
+
+    def _try_acquire(self) -> None:
+        connection = self._engine.connect()
+        try:
+            acquired = connection.execute(select(func.pg_try_advisory_lock(self._lock_key))).scalar()
+            # Nothing else runs on this connection; end the implicit transaction
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return
+        self._connection = connection
+        logger.info(f"Scheduler leadership acquired by {INSTANCE_ID}")
+        try:
+            self._on_elected()
+        except Exception:
+            self._demote()
+            raise
+
+    def _check_lock(self) -> None:
+        try:
+            self._connection.execute(select(1)).scalar()
+            self._connection.commit()
+        except Exception as e:
+            # The session is gone, and with it the lock; another process may hold it by now
+            logger.warning(f"Scheduler leader lost its database session: {str(e)}")
+            self._demote()
+
+    def _demote(self) -> None:
+        connection, self._connection = self._connection, None
+        try:
+            self._on_demoted()
+        finally:
+            try:
+                # Closing the session releases the advisory lock
+                connection.invalidate()
+                connection.close()
+            except Exception:
+                pass
+        logger.info(f"Scheduler leadership released by {INSTANCE_ID}")
+
+
+def current_leader(connection: Connection, lock_key: int = SCHEDULER_LOCK_KEY) -> Optional[str]:
+    """application_name of the session holding the scheduler lock, if any."""
+    locks = table("pg_locks", column("pid"), column("locktype"), column("classid"), column("objid"), column("granted"))
+    activity = table("pg_stat_activity", column("pid"), column("application_name"))
+    # A bigint key below 2^32 shows up as classid 0 / objid key
+    return connection.execute(
+        select(activity.c.application_name)
+        .select_from(locks.join(activity, locks.c.pid == activity.c.pid))
+        .where(
+            locks.c.locktype == "advisory",
+            locks.c.classid == 0,
+            locks.c.objid == lock_key,
+            locks.c.granted.is_(True)
+        )
+    ).scalar()
@@ -1,60 +1,260 @@
 import os
+import time
 import logging
-import asyncio
+import threading
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.triggers.interval import IntervalTrigger
-from datetime import datetime
+from apscheduler.events import (
+    EVENT_JOB_SUBMITTED, EVENT_JOB_EXECUTED, EVENT_JOB_ERROR, EVENT_JOB_MISSED, JobEvent
+)
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from app.infrastructure.database.session import SessionLocal
-from app.infrastructure.external.sync_service import SyncService
+from sqlalchemy.sql import table, column
+from app.infrastructure.database.session import SchedulerSessionLocal, scheduler_engine
+from app.infrastructure.database.models.scheduler_job_run import SchedulerJobRunModel
+from app.infrastructure.scheduler.leader import SchedulerLeader, INSTANCE_ID, current_leader
+from app.infrastructure.external.sync_worker import sync_worker, RUN_SUCCESS
+from app.infrastructure.database.repositories.filemanager_repository_impl import SQLAlchemyFileManagerRepository
+from app.infrastructure.storage.uploads import collect_orphaned_blobs, ORPHAN_GRACE_SECONDS
+from app.infrastructure.storage.derivatives import remove_file_blobs
+from app.infrastructure.storage.resumable import ResumableUploadStore
+from app.domain.services.filemanager_service import FileManagerService
+from app.domain.models.file import FileBatchOperation, BATCH_DELETE
 
 logger = logging.getLogger(__name__)
 
+# Files no content references are deleted once this old; 0 only reports them
+UNUSED_FILE_RETENTION_DAYS = int(os.getenv("UNUSED_FILE_RETENTION_DAYS", "0"))
+UNUSED_FILE_SWEEP_LIMIT = 1000
+# APScheduler keeps job definitions and next run times here
+SCHEDULER_JOBS_TABLE = "apscheduler_jobs"
+# Webhooks keep single projects current; the full sync only catches what they missed
+SYNC_INTERVAL_HOURS = float(os.getenv("SYNC_INTERVAL_HOURS", "24"))
+
 def run_sync():
     """Run the sync process for all configured users"""
+    # Get source username from environment
+    source_username = os.getenv("GIT_USERNAME")
+    if not source_username:
+        return
     logger.info("Starting scheduled sync")
-    db: Session = SessionLocal()
+    # The sync itself runs on the app's event loop; this job only waits for it,
+    # so the job's duration and outcome are those of the sync
+    run = sync_worker.run_threadsafe(source_username.strip(), reason="scheduled").result()
+    if run.status != RUN_SUCCESS:
+        raise RuntimeError(f"Sync of {run.username} ended with {run.status}: {run.error}")
+
+def run_upload_gc():
+    """Remove upload blobs that no file row references any more"""
+    logger.info("Starting upload garbage collection")
+    db: Session = SchedulerSessionLocal()
     try:
-        sync_service = SyncService(db)
-        
-        # Get source username from environment
-        source_username = os.getenv("GIT_USERNAME")
-        if source_username:
-            try:
-                # Run async function in event loop
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                loop.run_until_complete(sync_service.sync_projects(source_username.strip()))
-                loop.close()
-            except Exception as e:
-                logger.error(f"Failed to sync projects for {source_username}: {str(e)}")
+        referenced = SQLAlchemyFileManagerRepository(db).list_referenced_paths()
+        collect_orphaned_blobs(referenced)
+        ResumableUploadStore().collect_expired()
+    finally:
+        db.close()
 
-    except Exception as e:
-        logger.error(f"Scheduled sync failed: {str(e)}")
+def run_unused_file_sweep():
+    """Find files that no project, post or section uses, via the usage index"""
+    db: Session = SchedulerSessionLocal()
+    try:
+        service = FileManagerService(SQLAlchemyFileManagerRepository(db), release_blob=remove_file_blobs)
+        if UNUSED_FILE_RETENTION_DAYS <= 0:
+            unused = service.list_unused_files(timedelta(seconds=ORPHAN_GRACE_SECONDS), UNUSED_FILE_SWEEP_LIMIT)
+            if unused:
+                logger.info(f"{len(unused)} file(s) are not used by any project, post or section")
+            return
+        unused = service.list_unused_files(timedelta(days=UNUSED_FILE_RETENTION_DAYS), UNUSED_FILE_SWEEP_LIMIT)
+        if not unused:
+            return
+        results, released = service.apply_batch([
+            FileBatchOperation(op=BATCH_DELETE, ids=[str(file.id) for file in unused])
+        ])
+        service.release_blobs(released)
+        deleted = sum(1 for result in results if result.status == "ok")
+        logger.info(f"Deleted {deleted} unused file(s) older than {UNUSED_FILE_RETENTION_DAYS} day(s)")
     finally:
         db.close()
 
-def start_scheduler():
-    """Start the background scheduler"""
-    scheduler = BackgroundScheduler()
-    
-    # Run sync immediately on startup
-    scheduler.add_job(
-        run_sync,
-        trigger='date',  # Run once immediately
-        id='initial_sync',
-        name='Initial sync on startup',
-        replace_existing=True
-    )
-    
-    # Then run sync every 6 hours
-    scheduler.add_job(
-        run_sync,
-        trigger=IntervalTrigger(hours=6),
-        id='periodic_sync',
-        name='Sync projects every 6 hours',
-        replace_existing=True
+# id -> (function, trigger, name). Jobs are persisted, so ids must stay stable
+JOBS: Dict[str, Dict[str, Any]] = {
+    # Reconciliation: deleted repositories, missed or unsigned webhook deliveries
+    "periodic_sync": {
+        "func": run_sync,
+        "trigger": IntervalTrigger(hours=SYNC_INTERVAL_HOURS),
+        "name": "Reconcile projects with GitHub/GitLab",
+    },
+    # Blobs orphaned by folder deletes or failed uploads
+    "upload_gc": {
+        "func": run_upload_gc,
+        "trigger": IntervalTrigger(hours=24),
+        "name": "Collect orphaned upload blobs daily",
+    },
+    # Files no content references, found through the usage index
+    "unused_file_sweep": {
+        "func": run_unused_file_sweep,
+        "trigger": IntervalTrigger(hours=24),
+        "name": "Sweep unused files daily",
+    },
+}
+
+# Runs missed while no leader was up collapse into one, run late rather than never
+JOB_DEFAULTS = {"coalesce": True, "max_instances": 1, "misfire_grace_time": None}
+
+_scheduler: Optional[BackgroundScheduler] = None
+_leader: Optional[SchedulerLeader] = None
+# job id -> monotonic start of the run in progress on this process
+_running: Dict[str, float] = {}
+_running_lock = threading.Lock()
+
+
+def _record_run(job_id: str, **values: Any) -> None:
+    """Upsert the latest run of a job; counters are incremented in the statement."""
+    values["instance"] = INSTANCE_ID
+    counters = {name: values.pop(name) for name in ("run_count", "failure_count") if name in values}
+    stmt = pg_insert(SchedulerJobRunModel).values(job_id=job_id, **values, **counters)
+    update = dict(values)
+    for name, increment in counters.items():
+        update[name] = getattr(SchedulerJobRunModel, name) + increment
+    stmt = stmt.on_conflict_do_update(index_elements=[SchedulerJobRunModel.job_id], set_=update)
+    try:
+        with scheduler_engine.begin() as connection:
+            connection.execute(stmt)
+    except Exception as e:
+        logger.warning(f"Could not record run of job {job_id}: {str(e)}")
+
+
+def _on_job_event(event: JobEvent) -> None:
+    now = datetime.now(timezone.utc)
+    if event.code == EVENT_JOB_SUBMITTED:
+        with _running_lock:
+            _running[event.job_id] = time.monotonic()
+        _record_run(event.job_id, status="running", started_at=now, finished_at=None, error=None)
+    elif event.code in (EVENT_JOB_EXECUTED, EVENT_JOB_ERROR):
+        with _running_lock:
+            started = _running.pop(event.job_id, None)
+        duration_ms = int((time.monotonic() - started) * 1000) if started is not None else None
+        failed = event.code == EVENT_JOB_ERROR
+        _record_run(
+            event.job_id,
+            status="error" if failed else "success",
+            finished_at=now,
+            duration_ms=duration_ms,
+            error=str(event.exception) if failed else None,
+            run_count=1,
+            failure_count=1 if failed else 0
+        )
+        if failed:
+            logger.error(f"Scheduled job {event.job_id} failed after {duration_ms} ms: {str(event.exception)}")
+        else:
+            logger.info(f"Scheduled job {event.job_id} finished in {duration_ms} ms")
+    elif event.code == EVENT_JOB_MISSED:
+        _record_run(event.job_id, status="missed", finished_at=now)
+
+
+def _start_local_scheduler() -> None:
+    """Start the scheduler on this process, once it was elected leader."""
+    global _scheduler
+    scheduler = BackgroundScheduler(
+        jobstores={"default": SQLAlchemyJobStore(engine=scheduler_engine, tablename=SCHEDULER_JOBS_TABLE)},
+        job_defaults=JOB_DEFAULTS,
+        timezone=timezone.utc
     )
-    
-    scheduler.start()
-    logger.info("Scheduler started with initial sync") 
\ No newline at end of file
+    scheduler.add_listener(_on_job_event, EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED)
+    # Paused until the persisted jobs are reconciled with JOBS
+    scheduler.start(paused=True)
+
+    for job in scheduler.get_jobs():
+        if job.id not in JOBS:
+            scheduler.remove_job(job.id)
+    for job_id, definition in JOBS.items():
+        existing = scheduler.get_job(job_id)
+        # Keep the persisted next run, so restarts and leader changes do not
+        # re-run everything; a job seen for the first time runs right away
+        next_run_time = existing.next_run_time if existing else datetime.now(timezone.utc)
+        scheduler.add_job(
+            definition["func"],
+            trigger=definition["trigger"],
+            id=job_id,
+            name=definition["name"],
+            next_run_time=next_run_time,
+            replace_existing=True
+        )
+    scheduler.resume()
+    _scheduler = scheduler
+    logger.info(f"Scheduler started on {INSTANCE_ID} with {len(JOBS)} job(s)")
+
+
+def _stop_local_scheduler() -> None:
+    global _scheduler
+    scheduler, _scheduler = _scheduler, None
+    if scheduler is not None and scheduler.running:
+        # Do not wait for a running sync; the next leader picks up from the job store
+        scheduler.shutdown(wait=False)
+        logger.info(f"Scheduler stopped on {INSTANCE_ID}")
+
+
+def start_scheduler():
+    """Compete for scheduler leadership; only the leader runs the jobs.
+
+    Every worker calls this on startup. One of them (across all replicas that
+    share the database) wins the PostgreSQL advisory lock and starts the
+    scheduler, the others stand by and take over if the leader goes away.
+    """
+    global _leader
+    if _leader is not None:
+        return
+    _leader = SchedulerLeader(on_elected=_start_local_scheduler, on_demoted=_stop_local_scheduler)
+    _leader.start()
+
+
+def stop_scheduler():
+    """Stop the scheduler and hand leadership to another worker"""
+    global _leader
+    leader, _leader = _leader, None
+    if leader is not None:
+        leader.stop()
+
+
+def scheduler_status(db: Session) -> Dict[str, Any]:
+    """Leader, next run and latest run of each job, as stored in the database."""
+    jobs_table = table(SCHEDULER_JOBS_TABLE, column("id"), column("next_run_time"))
+    connection = db.connection()
+    try:
+        next_runs = dict(connection.execute(select(jobs_table.c.id, jobs_table.c.next_run_time)).all())
+    except Exception:
+        # The job store table is created by the first leader
+        db.rollback()
+        connection = db.connection()
+        next_runs = {}
+    runs = {run.job_id: run for run in db.query(SchedulerJobRunModel).all()}
+
+    jobs: List[Dict[str, Any]] = []
+    for job_id, definition in JOBS.items():
+        run = runs.get(job_id)
+        next_run = next_runs.get(job_id)
+        jobs.append({
+            "id": job_id,
+            "name": definition["name"],
+            "trigger": str(definition["trigger"]),
+            "next_run_time": datetime.fromtimestamp(next_run, timezone.utc) if next_run else None,
+            "status": run.status if run else None,
+            "last_started_at": run.started_at if run else None,
+            "last_finished_at": run.finished_at if run else None,
+            "last_duration_ms": run.duration_ms if run else None,
+            "last_error": run.error if run else None,
+            "last_instance": run.instance if run else None,
+            "run_count": run.run_count if run else 0,
+            "failure_count": run.failure_count if run else 0,
+        })
+    return {
+        "leader": current_leader(connection),
+        "instance": INSTANCE_ID,
+        "is_leader": _leader is not None and _leader.is_leader,
+        "jobs": jobs,
+    }
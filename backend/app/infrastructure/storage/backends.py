@@ -0,0 +1,304 @@
+import os
+import time
+import logging
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+from starlette.types import ASGIApp
+from app.infrastructure.storage.static import (
+    PRECOMPRESSED_SUFFIXES, IMMUTABLE_CACHE_CONTROL, UploadStaticFiles, PresignedRedirectFiles,
+    is_compressible, write_precompressed
+)
+
+logger = logging.getLogger(__name__)
+
+# app/static/uploads: blobs of the local backend, and scratch space for
+# uploads in progress with every backend
+UPLOADS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "static",
+    "uploads"
+)
+# Blob URLs stored on file rows and in content are <prefix>/<key>, whatever the backend
+UPLOADS_URL_PREFIX = "/static/uploads"
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local").strip().lower()
+
+
+def url_to_key(url: str) -> Optional[str]:
+    """The storage key of an uploads URL, e.g. `ab/ab12...ef.jpg`; None for other URLs."""
+    if not url or not url.startswith(UPLOADS_URL_PREFIX + "/"):
+        return None
+    key = url[len(UPLOADS_URL_PREFIX) + 1:]
+    parts = key.split("/")
+    if any(part in ("", ".", "..") or part.startswith(".") for part in parts):
+        return None
+    return key
+
+
+class StorageBackend(ABC):
+    """Where upload blobs live, addressed by keys relative to the uploads root."""
+
+    @abstractmethod
+    def store(self, local_path: str, key: str, content_type: str) -> bool:
+        """Move a complete local file in as `key`; the local file is gone afterwards.
+
+        Returns True when the blob already existed and nothing was written.
+        """
+        pass
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def age(self, key: str) -> Optional[float]:
+        """Seconds since the blob was last written, None if it does not exist."""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def iter_blobs(self) -> Iterator[Tuple[str, float]]:
+        """(key, last modified timestamp) of every stored blob."""
+        pass
+
+    @abstractmethod
+    def fetch(self, key: str):
+        """Context manager yielding a local path the blob can be read from."""
+        pass
+
+    @abstractmethod
+    def asgi_app(self) -> ASGIApp:
+        """The app mounted at the uploads URL prefix to serve blobs."""
+        pass
+
+
+class LocalStorageBackend(StorageBackend):
+    """Blobs on this node's disk, served by the app itself."""
+
+    def __init__(self, root: str = UPLOADS_DIR):
+        self.root = root
+
+    def path(self, key: str) -> str:
+        disk_path = os.path.realpath(os.path.join(self.root, key))
+        if not disk_path.startswith(os.path.realpath(self.root) + os.sep):
+            raise ValueError(f"Storage key {key} is outside the uploads dir")
+        return disk_path
+
+    def store(self, local_path: str, key: str, content_type: str) -> bool:
+        # The local file is expected on the same filesystem, so this is a rename
+        disk_path = self.path(key)
+        if os.path.exists(disk_path):
+            # Same content is already stored; refresh its age so GC leaves it alone
+            try:
+                os.unlink(local_path)
+            except OSError:
+                pass
+            os.utime(disk_path)
+            return True
+        os.makedirs(os.path.dirname(disk_path), exist_ok=True)
+        os.replace(local_path, disk_path)
+        _fsync_directory(os.path.dirname(disk_path))
+        if is_compressible(content_type):
+            try:
+                write_precompressed(disk_path)
+            except OSError as e:
+                # The original is stored; it is just served uncompressed
+                logger.warning(f"Could not precompress upload {disk_path}: {str(e)}")
+        return False
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def age(self, key: str) -> Optional[float]:
+        try:
+            return time.time() - os.stat(self.path(key)).st_mtime
+        except OSError:
+            return None
+
+    def delete(self, key: str) -> bool:
+        disk_path = self.path(key)
+        try:
+            os.unlink(disk_path)
+        except OSError:
+            return False
+        for suffix in PRECOMPRESSED_SUFFIXES.values():
+            try:
+                os.unlink(disk_path + suffix)
+            except OSError:
+                pass
+        return True
+
+    def iter_blobs(self) -> Iterator[Tuple[str, float]]:
+        for directory, dirnames, filenames in os.walk(self.root):
+            # Hidden entries are uploads in progress, which expire on their own
+            dirnames[:] = [name for name in dirnames if not name.startswith(".")]
+            for filename in filenames:
+                if filename.startswith("."):
+                    continue
+                disk_path = os.path.join(directory, filename)
+                try:
+                    modified = os.stat(disk_path).st_mtime
+                except OSError:
+                    continue
+                yield os.path.relpath(disk_path, self.root).replace(os.sep, "/"), modified
+
+    @contextmanager
+    def fetch(self, key: str):
+        yield self.path(key)
+
+    def asgi_app(self) -> ASGIApp:
+        # Immutable caching, precompressed siblings and range requests
+        return UploadStaticFiles(directory=self.root)
+
+
+class S3StorageBackend(StorageBackend):
+    """Blobs in an S3-compatible bucket (AWS, MinIO, ...), served by presigned redirects.
+
+    Lets several replicas share uploads. Blobs are spooled to local disk while
+    they are received and hashed, then sent with a multipart upload.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        prefix: str = "",
+        presign_expires: int = 3600,
+        part_size: int = 8 * 1024 * 1024
+    ):
+        try:
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+            from botocore.config import Config
+        except ImportError:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.presign_expires = presign_expires
+        self._client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            aws_access_key_id=access_key or None,
+            aws_secret_access_key=secret_key or None,
+            # Path-style addressing works with MinIO and other self-hosted endpoints
+            config=Config(signature_version="s3v4", s3={"addressing_style": "path" if endpoint_url else "auto"})
+        )
+        self._transfer = TransferConfig(multipart_threshold=part_size, multipart_chunksize=part_size)
+
+    def _object_key(self, key: str) -> str:
+        return self.prefix + key
+
+    def _head(self, key: str) -> Optional[dict]:
+        from botocore.exceptions import ClientError
+        try:
+            return self._client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def store(self, local_path: str, key: str, content_type: str) -> bool:
+        try:
+            if self._head(key) is not None:
+                return True
+            self._client.upload_file(
+                local_path,
+                self.bucket,
+                self._object_key(key),
+                ExtraArgs={"ContentType": content_type, "CacheControl": IMMUTABLE_CACHE_CONTROL},
+                Config=self._transfer
+            )
+            return False
+        finally:
+            try:
+                os.unlink(local_path)
+            except OSError:
+                pass
+
+    def exists(self, key: str) -> bool:
+        return self._head(key) is not None
+
+    def age(self, key: str) -> Optional[float]:
+        head = self._head(key)
+        return time.time() - head["LastModified"].timestamp() if head else None
+
+    def delete(self, key: str) -> bool:
+        self._client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+        return True
+
+    def iter_blobs(self) -> Iterator[Tuple[str, float]]:
+        paginator = self._client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for item in page.get("Contents", []):
+                yield item["Key"][len(self.prefix):], item["LastModified"].timestamp()
+
+    @contextmanager
+    def fetch(self, key: str):
+        fd, local_path = tempfile.mkstemp(dir=UPLOADS_DIR, prefix=".fetch-")
+        os.close(fd)
+        try:
+            self._client.download_file(self.bucket, self._object_key(key), local_path)
+            yield local_path
+        finally:
+            try:
+                os.unlink(local_path)
+            except OSError:
+                pass
+
+    def presigned_url(self, key: str) -> str:
+        # Signed locally; no request to the storage service
+        return self._client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self._object_key(key)},
+            ExpiresIn=self.presign_expires
+        )
+
+    def asgi_app(self) -> ASGIApp:
+        return PresignedRedirectFiles(self.presigned_url, max_age=self.presign_expires // 2)
+
+
+def _fsync_directory(directory: str) -> None:
+    # Persist the rename itself; not supported on every platform
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+_backend: Optional[StorageBackend] = None
+
+
+def get_storage_backend() -> StorageBackend:
+    """The configured backend, created on first use (STORAGE_BACKEND=local|s3)."""
+    global _backend
+    if _backend is None:
+        if STORAGE_BACKEND == "s3":
+            _backend = S3StorageBackend(
+                bucket=os.environ["S3_BUCKET"],
+                endpoint_url=os.getenv("S3_ENDPOINT_URL"),
+                region=os.getenv("S3_REGION"),
+                access_key=os.getenv("S3_ACCESS_KEY_ID"),
+                secret_key=os.getenv("S3_SECRET_ACCESS_KEY"),
+                prefix=os.getenv("S3_PREFIX", ""),
+                presign_expires=int(os.getenv("S3_PRESIGN_EXPIRES", "3600"))
+            )
+        elif STORAGE_BACKEND == "local":
+            _backend = LocalStorageBackend()
+        else:
+            raise RuntimeError(f"Unknown STORAGE_BACKEND {STORAGE_BACKEND}. Use local or s3")
+    return _backend
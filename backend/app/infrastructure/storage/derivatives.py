@@ -0,0 +1,235 @@
+import os
+import io
+import base64
+import anyio.from_thread
+import asyncio
+import shutil
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from starlette.concurrency import run_in_threadpool
+from app.domain.models.file import File
+from app.infrastructure.storage.backends import UPLOADS_DIR, UPLOADS_URL_PREFIX, get_storage_backend, url_to_key
+from app.infrastructure.storage.uploads import remove_upload_blob
+
+logger = logging.getLogger(__name__)
+
+# Target widths of the responsive variants; larger than the original are skipped
+DERIVATIVE_WIDTHS = tuple(
+    int(width) for width in os.getenv("IMAGE_DERIVATIVE_WIDTHS", "320,640,1024,1600").split(",") if width.strip()
+)
+DERIVATIVE_FORMATS = tuple(
+    fmt.strip().lower() for fmt in os.getenv("IMAGE_DERIVATIVE_FORMATS", "avif,webp").split(",") if fmt.strip()
+)
+DERIVATIVE_WORKERS = int(os.getenv("IMAGE_DERIVATIVE_WORKERS", str(min(2, os.cpu_count() or 1))))
+DERIVATIVE_QUALITY = {"webp": 80, "avif": 55}
+PLACEHOLDER_WIDTH = 16
+
+# Jobs past this many wait before fetching anything; twice the workers, so
+# one source is fetched while another renders
+MAX_DERIVATIVE_JOBS = 2 * DERIVATIVE_WORKERS
+
+_executor: Optional[ProcessPoolExecutor] = None
+_job_slots: Optional[asyncio.Semaphore] = None
+# Keep references so running tasks are not garbage collected
+_tasks: Set[asyncio.Task] = set()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=DERIVATIVE_WORKERS)
+    return _executor
+
+
+def _get_job_slots() -> asyncio.Semaphore:
+    global _job_slots
+    if _job_slots is None:
+        _job_slots = asyncio.Semaphore(MAX_DERIVATIVE_JOBS)
+    return _job_slots
+
+
+def shutdown_derivative_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _supported_formats(formats: Iterable[str]) -> List[str]:
+    from PIL import features
+    supported = []
+    for fmt in formats:
+        if fmt == "avif" and not features.check("avif"):
+            try:
+                import pillow_avif  # noqa: F401  registers the AVIF plugin on older Pillow
+            except ImportError:
+                continue
+        supported.append(fmt)
+    return supported
+
+
+def build_derivatives(
+    source_path: str,
+    sha256: str,
+    widths: Iterable[int],
+    formats: Iterable[str],
+    output_dir: str
+) -> Optional[Tuple[Dict[str, Any], Dict[str, str]]]:
+    """Render resized variants and a tiny placeholder of one image.
+
+    Runs in a worker process and writes to the local `output_dir`. Returns the
+    variants record and the rendered files by storage key, named after the
+    source hash.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source_path) as image:
+        if getattr(image, "is_animated", False):
+            return None
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+        width, height = image.size
+
+        placeholder = image.copy()
+        placeholder.thumbnail((PLACEHOLDER_WIDTH, PLACEHOLDER_WIDTH))
+        buffer = io.BytesIO()
+        placeholder.save(buffer, "WEBP", quality=30)
+        placeholder_uri = "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+        targets = sorted({w for w in widths if w < width} | {width})
+
+        sources: Dict[str, List[Dict[str, Any]]] = {}
+        rendered: Dict[str, str] = {}
+        for fmt in _supported_formats(formats):
+            entries = []
+            for target in targets:
+                key = f"{sha256[:2]}/{sha256}-{target}w.{fmt}"
+                disk_path = os.path.join(output_dir, os.path.basename(key))
+                resized = image if target == width else image.resize(
+                    (target, max(1, round(height * target / width))), Image.LANCZOS
+                )
+                resized.save(disk_path, fmt.upper(), quality=DERIVATIVE_QUALITY.get(fmt, 75))
+                rendered[key] = disk_path
+                entries.append({"url": f"{UPLOADS_URL_PREFIX}/{key}", "width": target})
+            sources[f"image/{fmt}"] = entries
+
+    variants = {"width": width, "height": height, "placeholder": placeholder_uri, "sources": sources}
+    return variants, rendered
+
+
+def variant_urls(variants: Optional[Dict[str, Any]]) -> List[str]:
+    """All files referenced by a variants record."""
+    if not variants:
+        return []
+    return [entry["url"] for entries in variants.get("sources", {}).values() for entry in entries]
+
+
+def responsive_image(variants: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Turn a variants record into srcset strings per type, ready for <picture>."""
+    if not variants:
+        return None
+    return {
+        "width": variants.get("width"),
+        "height": variants.get("height"),
+        "placeholder": variants.get("placeholder"),
+        "srcset": {
+            content_type: ", ".join(f"{entry['url']} {entry['width']}w" for entry in entries)
+            for content_type, entries in variants.get("sources", {}).items()
+        },
+    }
+
+
+def _make_scratch_dir() -> str:
+    # Next to the local blobs, so storing the variants locally is a rename
+    os.makedirs(UPLOADS_DIR, exist_ok=True)
+    return tempfile.mkdtemp(dir=UPLOADS_DIR, prefix=".derivatives-")
+
+
+def _store_rendered(backend, rendered: Dict[str, str]) -> None:
+    for variant_key, disk_path in rendered.items():
+        backend.store(disk_path, variant_key, f"image/{variant_key.rsplit('.', 1)[-1]}")
+
+
+async def _render(sha256: str, key: str) -> Optional[Dict[str, Any]]:
+    """Fetch, render and store the variants of one blob.
+
+    Only fetching and storing take a threadpool thread; the rendering is
+    awaited on the process pool, so waiting jobs do not hold request threads.
+    """
+    backend = get_storage_backend()
+    output_dir = await run_in_threadpool(_make_scratch_dir)
+    try:
+        source = backend.fetch(key)
+        source_path = await run_in_threadpool(source.__enter__)
+        try:
+            built = await asyncio.get_running_loop().run_in_executor(
+                _get_executor(), build_derivatives,
+                source_path, sha256, DERIVATIVE_WIDTHS, DERIVATIVE_FORMATS, output_dir
+            )
+        finally:
+            await run_in_threadpool(source.__exit__, None, None, None)
+        if not built:
+            return None
+        variants, rendered = built
+        await run_in_threadpool(_store_rendered, backend, rendered)
+        return variants
+    finally:
+        await run_in_threadpool(shutil.rmtree, output_dir, True)
+
+
+async def _process(sha256: str, source_url: str) -> None:
+    # Imported here: the session module needs DATABASE_URL, worker processes do not
+    from app.infrastructure.database.session import SessionLocal
+    from app.infrastructure.database.repositories.filemanager_repository_impl import SQLAlchemyFileManagerRepository
+    from app.infrastructure.cache.response_cache import public_cache, PROJECTS
+
+    key = url_to_key(source_url)
+    if not key:
+        return
+    async with _get_job_slots():
+        variants = await _render(sha256, key)
+    if not variants:
+        return
+
+    def store() -> None:
+        db = SessionLocal()
+        try:
+            SQLAlchemyFileManagerRepository(db).set_variants_by_content_hash(sha256, variants)
+        finally:
+            db.close()
+
+    await run_in_threadpool(store)
+    # Public payloads embed srcsets, so they must pick up the new variants
+    await public_cache.invalidate(PROJECTS)
+    logger.info(f"Generated {len(variant_urls(variants))} image variant(s) for {source_url}")
+
+
+def schedule_derivatives(file: File) -> None:
+    """Start rendering variants of a stored image without waiting for it."""
+    if not file.content_hash:
+        return
+
+    async def run() -> None:
+        try:
+            await _process(file.content_hash, file.path)
+        except Exception as e:
+            logger.error(f"Image derivative generation failed for {file.path}: {str(e)}")
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Called from a request's worker thread: start it on the event loop
+        anyio.from_thread.run_sync(schedule_derivatives, file)
+        return
+    task = loop.create_task(run())
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+def remove_file_blobs(file: File) -> None:
+    """Delete a blob and its image variants once no file row references them."""
+    remove_upload_blob(file.path)
+    for url in variant_urls(file.variants):
+        remove_upload_blob(url)
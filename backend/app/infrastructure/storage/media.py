@@ -0,0 +1,22 @@
+from typing import Any, Dict, Iterable, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.database.repositories.filemanager_repository_impl import SQLAlchemyFileManagerRepository
+from app.infrastructure.storage.derivatives import responsive_image
+from app.infrastructure.storage.uploads import UPLOADS_URL_PREFIX
+
+
+class MediaResolver:
+    """Looks up the responsive variants of uploaded images referenced by public content."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def resolve(self, urls: Iterable[Optional[str]]) -> Dict[str, Dict[str, Any]]:
+        """Map each upload URL that has variants to its srcsets, size and placeholder."""
+        paths = {url for url in urls if url and url.startswith(UPLOADS_URL_PREFIX)}
+        if not paths:
+            return {}
+        variants = await self.db.run_sync(
+            lambda session: SQLAlchemyFileManagerRepository(session).get_variants_by_paths(paths)
+        )
+        return {path: responsive_image(record) for path, record in variants.items()}
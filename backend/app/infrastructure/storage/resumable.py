@@ -0,0 +1,305 @@
+import os
+import re
+import json
+import time
+import uuid
+import fcntl
+import base64
+import hashlib
+import logging
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from app.domain.exceptions import (
+    FileValidationError, FileTooLargeError, FileNotFoundError, UploadOffsetError, ChecksumMismatchError
+)
+from app.infrastructure.storage.backends import UPLOADS_DIR, UPLOADS_URL_PREFIX, get_storage_backend
+from app.infrastructure.storage.uploads import (
+    SNIFF_SIZE, StoredUpload, UploadPolicy, blob_name, check_content_signature
+)
+
+logger = logging.getLogger(__name__)
+
+# Inside the uploads dir, so completing an upload to the local backend is a
+# rename on the same filesystem; hidden, so it is neither served nor swept by
+# the blob GC
+RESUMABLE_DIR = os.path.join(UPLOADS_DIR, ".resumable")
+MAX_CHUNK_SIZE = 16 * 1024 * 1024
+# Uploads that received no chunk for this long are discarded
+RESUMABLE_UPLOAD_TTL_SECONDS = 24 * 60 * 60
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Algorithms accepted in `Upload-Checksum: <algorithm> <base64 digest>`
+CHECKSUM_ALGORITHMS: Dict[str, Callable[[], Any]] = {
+    "sha256": hashlib.sha256,
+    "sha1": hashlib.sha1,
+    "md5": hashlib.md5,
+}
+
+_UPLOAD_ID = re.compile(r"^[0-9a-f]{32}$")
+
+# SHA-256 of the bytes received so far, per upload, while chunks arrive in
+# order at this process; anything else is re-hashed from disk on completion
+_running_hashes: Dict[str, Tuple[int, Any]] = {}
+
+
+@dataclass
+class ResumableUpload:
+    """An upload in progress; `offset` is the number of bytes received."""
+    id: str
+    filename: str
+    content_type: str
+    size: int
+    parent_id: Optional[str] = None
+    created_at: float = 0.0
+    offset: int = 0
+    updated_at: float = 0.0
+
+    @property
+    def expires_at(self) -> float:
+        return self.updated_at + RESUMABLE_UPLOAD_TTL_SECONDS
+
+
+def parse_checksum(header: Optional[str]) -> Tuple[str, bytes]:
+    """Split an `Upload-Checksum` header into (algorithm, digest)."""
+    algorithm, _, encoded = (header or "").strip().partition(" ")
+    algorithm = algorithm.lower()
+    if algorithm not in CHECKSUM_ALGORITHMS:
+        raise FileValidationError(
+            f"Upload-Checksum is required. Supported algorithms: {', '.join(CHECKSUM_ALGORITHMS)}"
+        )
+    try:
+        return algorithm, base64.b64decode(encoded.strip(), validate=True)
+    except ValueError:
+        raise FileValidationError("Upload-Checksum digest must be base64")
+
+
+class ResumableUploadStore:
+    """Init / append / complete uploads written chunk by chunk to one part file.
+
+    Every chunk is streamed to disk at its offset, verified against its
+    checksum and fsynced before it is acknowledged; a chunk that fails is cut
+    off again, so the offset always covers verified bytes only. Completing
+    hands the part file to the storage backend under its content-addressed
+    key, which for local storage is a rename.
+    """
+
+    def __init__(self, directory: str = RESUMABLE_DIR):
+        self._directory = directory
+
+    def _paths(self, upload_id: str) -> Tuple[str, str]:
+        if not _UPLOAD_ID.match(upload_id or ""):
+            raise FileNotFoundError(f"Upload {upload_id} not found")
+        base = os.path.join(self._directory, upload_id)
+        return f"{base}.json", f"{base}.part"
+
+    async def create(
+        self,
+        filename: str,
+        content_type: str,
+        size: int,
+        policy: UploadPolicy,
+        parent_id: Optional[str] = None
+    ) -> ResumableUpload:
+        if content_type not in policy.allowed_types:
+            raise FileValidationError(
+                f"File type {content_type} not allowed. Allowed types: images, videos, documents"
+            )
+        max_size = policy.max_size_for(content_type)
+        if size > max_size:
+            raise FileTooLargeError(f"File too large. Maximum size is {max_size / 1024 / 1024}MB")
+        if size <= 0:
+            raise FileValidationError("Upload size must be positive")
+        now = time.time()
+        upload = ResumableUpload(
+            id=uuid.uuid4().hex,
+            filename=filename,
+            content_type=content_type,
+            size=size,
+            parent_id=parent_id,
+            created_at=now,
+            updated_at=now
+        )
+        await run_in_threadpool(self._create_files, upload)
+        return upload
+
+    def _create_files(self, upload: ResumableUpload) -> None:
+        os.makedirs(self._directory, exist_ok=True)
+        meta_path, part_path = self._paths(upload.id)
+        open(part_path, "xb").close()
+        metadata = {name: value for name, value in asdict(upload).items() if name not in ("offset", "updated_at")}
+        tmp_path = f"{meta_path}.tmp"
+        with open(tmp_path, "w") as out:
+            json.dump(metadata, out)
+        os.replace(tmp_path, meta_path)
+
+    async def get(self, upload_id: str) -> ResumableUpload:
+        return await run_in_threadpool(self._load, upload_id)
+
+    def _load(self, upload_id: str) -> ResumableUpload:
+        meta_path, part_path = self._paths(upload_id)
+        try:
+            with open(meta_path) as source:
+                metadata = json.load(source)
+            part_stat = os.stat(part_path)
+        except (OSError, ValueError):
+            raise FileNotFoundError(f"Upload {upload_id} not found")
+        upload = ResumableUpload(**metadata, offset=part_stat.st_size, updated_at=part_stat.st_mtime)
+        if upload.expires_at < time.time():
+            self._remove(upload_id)
+            raise FileNotFoundError(f"Upload {upload_id} has expired")
+        return upload
+
+    def _open_locked(self, upload_id: str, mode: str):
+        """Open the part file, refusing if another request is writing it."""
+        _, part_path = self._paths(upload_id)
+        file = open(part_path, mode)
+        try:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            file.close()
+            raise UploadOffsetError(f"Upload {upload_id} is being written by another request")
+        return file
+
+    async def append(
+        self,
+        upload_id: str,
+        offset: int,
+        length: Optional[int],
+        checksum: Optional[str],
+        chunks: AsyncIterator[bytes]
+    ) -> ResumableUpload:
+        """Write one chunk at `offset`; it is kept only if it matches `checksum`."""
+        upload = await self.get(upload_id)
+        if offset != upload.offset:
+            raise UploadOffsetError(f"Upload is at offset {upload.offset}, not {offset}")
+        if not length:
+            raise FileValidationError("Chunks need a non-empty Content-Length")
+        if length > MAX_CHUNK_SIZE:
+            raise FileTooLargeError(f"Chunk too large. Maximum chunk size is {MAX_CHUNK_SIZE / 1024 / 1024}MB")
+        if offset + length > upload.size:
+            raise FileTooLargeError(f"Chunk exceeds the declared upload size of {upload.size} bytes")
+        algorithm, expected = parse_checksum(checksum)
+
+        file = await run_in_threadpool(self._open_locked, upload_id, "r+b")
+        try:
+            # Re-checked under the lock: a concurrent request may have appended meanwhile
+            if os.fstat(file.fileno()).st_size != offset:
+                raise UploadOffsetError(f"Upload {upload_id} moved past offset {offset}")
+            file.seek(offset)
+            chunk_hash = CHECKSUM_ALGORITHMS[algorithm]()
+            running = _running_hashes.get(upload_id)
+            running = running[1].copy() if running and running[0] == offset else None
+            if offset == 0:
+                running = hashlib.sha256()
+            received = 0
+            try:
+                async for data in chunks:
+                    received += len(data)
+                    if received > length:
+                        raise FileValidationError("Chunk is longer than its Content-Length")
+                    chunk_hash.update(data)
+                    if running is not None:
+                        running.update(data)
+                    await run_in_threadpool(file.write, data)
+                if received != length:
+                    raise FileValidationError(f"Chunk ended after {received} of {length} bytes")
+                if chunk_hash.digest() != expected:
+                    raise ChecksumMismatchError(f"Chunk at offset {offset} does not match its {algorithm} checksum")
+                await run_in_threadpool(self._sync, file)
+            except BaseException:
+                # Keep only verified bytes; the client resends the whole chunk
+                await run_in_threadpool(self._truncate, file, offset)
+                raise
+        finally:
+            await run_in_threadpool(file.close)
+
+        if running is not None:
+            _running_hashes[upload_id] = (offset + length, running)
+        upload.offset = offset + length
+        upload.updated_at = time.time()
+        return upload
+
+    @staticmethod
+    def _sync(file) -> None:
+        file.flush()
+        os.fsync(file.fileno())
+
+    @staticmethod
+    def _truncate(file, offset: int) -> None:
+        file.flush()
+        file.truncate(offset)
+
+    async def complete(self, upload_id: str) -> Tuple[ResumableUpload, StoredUpload]:
+        """Verify the assembled file and move it to its content-addressed name."""
+        upload = await self.get(upload_id)
+        if upload.offset != upload.size:
+            raise UploadOffsetError(f"Upload incomplete: {upload.offset} of {upload.size} bytes received")
+        return upload, await run_in_threadpool(self._complete, upload)
+
+    def _complete(self, upload: ResumableUpload) -> StoredUpload:
+        _, part_path = self._paths(upload.id)
+        with self._open_locked(upload.id, "rb") as file:
+            head = file.read(SNIFF_SIZE)
+            try:
+                check_content_signature(upload.content_type, head)
+            except FileValidationError:
+                self._remove(upload.id)
+                raise
+            running = _running_hashes.pop(upload.id, None)
+            if running and running[0] == upload.size:
+                sha256 = running[1].hexdigest()
+            else:
+                file.seek(0)
+                hasher = hashlib.sha256()
+                for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+                    hasher.update(block)
+                sha256 = hasher.hexdigest()
+            key = blob_name(sha256, upload.content_type, upload.filename)
+            deduplicated = get_storage_backend().store(part_path, key, upload.content_type)
+        self._remove(upload.id)
+        logger.debug(f"Resumable upload {upload.id} completed as {key}")
+        return StoredUpload(
+            filename=upload.filename,
+            content_type=upload.content_type,
+            size=upload.size,
+            sha256=sha256,
+            key=key,
+            url=f"{UPLOADS_URL_PREFIX}/{key}",
+            deduplicated=deduplicated
+        )
+
+    async def cancel(self, upload_id: str) -> None:
+        await self.get(upload_id)
+        await run_in_threadpool(self._remove, upload_id)
+
+    def _remove(self, upload_id: str) -> None:
+        _running_hashes.pop(upload_id, None)
+        for path in self._paths(upload_id):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def collect_expired(self) -> int:
+        """Discard uploads that received no chunk within the TTL."""
+        now = time.time()
+        removed = 0
+        try:
+            names = os.listdir(self._directory)
+        except OSError:
+            return 0
+        for name in names:
+            upload_id, extension = os.path.splitext(name)
+            if extension != ".part" or not _UPLOAD_ID.match(upload_id):
+                continue
+            try:
+                expired = now - os.stat(os.path.join(self._directory, name)).st_mtime > RESUMABLE_UPLOAD_TTL_SECONDS
+            except OSError:
+                continue
+            if expired:
+                self._remove(upload_id)
+                removed += 1
+        if removed:
+            logger.info(f"Discarded {removed} expired resumable upload(s)")
+        return removed
@@ -0,0 +1,278 @@
+import os
+import re
+import gzip
+import stat
+from email.utils import formatdate
+from mimetypes import guess_type
+from typing import Callable, Dict, Optional, Tuple
+import anyio
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, PlainTextResponse, RedirectResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional, gzip siblings are always written
+    brotli = None
+
+# Sibling file suffix per content coding, in order of preference
+PRECOMPRESSED_SUFFIXES: Dict[str, str] = {"br": ".br", "gzip": ".gz"}
+
+# Content-addressed blobs and their image variants: <sha256>[-<width>w].<ext>
+HASHED_NAME = re.compile(r"^[0-9a-f]{64}(?:-\d+w)?\.[a-z0-9]+$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Files without a content hash in their name may be replaced in place
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+_COMPRESSIBLE_TYPES = {"application/json", "application/javascript", "application/xml", "image/svg+xml"}
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    content_type = content_type.split(";", 1)[0].strip().lower()
+    return content_type.startswith("text/") or content_type in _COMPRESSIBLE_TYPES
+
+
+def write_precompressed(disk_path: str) -> None:
+    """Write .gz (and .br when brotli is installed) siblings next to a file."""
+    with open(disk_path, "rb") as source:
+        body = source.read()
+    encoded = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli:
+        encoded["br"] = brotli.compress(body, quality=11)
+    for encoding, data in encoded.items():
+        if len(data) >= len(body):
+            continue
+        target = disk_path + PRECOMPRESSED_SUFFIXES[encoding]
+        tmp_path = f"{target}.tmp"
+        with open(tmp_path, "wb") as out:
+            out.write(data)
+        os.replace(tmp_path, target)
+
+
+def _accepted_codings(accept_encoding: Optional[str]) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = quality
+    return accepted
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single `bytes=` range into inclusive (start, end).
+
+    Returns None when the header is absent or not a single byte range, in which
+    case the whole file is sent. Raises ValueError when the range cannot be
+    satisfied.
+    """
+    if not range_header:
+        return None
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start, end = max(size - int(last), 0), size - 1
+    except ValueError:
+        return None
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        raise ValueError(range_header)
+    return start, end
+
+
+class RangeFileResponse(FileResponse):
+    """FileResponse for a byte range, sent zero-copy when the server allows it.
+
+    Servers advertising the ASGI `http.response.zerocopysend` extension get the
+    open file and let the kernel copy it (sendfile); `http.response.pathsend`
+    is used for whole files. Otherwise the file is streamed in chunks.
+    """
+
+    def __init__(self, *args, byte_range: Optional[Tuple[int, int]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.byte_range = byte_range
+        if byte_range is not None and self.stat_result is not None:
+            start, end = byte_range
+            self.status_code = 206
+            self.headers["content-range"] = f"bytes {start}-{end}/{self.stat_result.st_size}"
+            self.headers["content-length"] = str(end - start + 1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.stat_result is None or not stat.S_ISREG(self.stat_result.st_mode):
+            raise RuntimeError(f"File at path {self.path} is not a file.")
+        size = self.stat_result.st_size
+        offset, end = self.byte_range or (0, size - 1)
+        count = end - offset + 1
+        extensions = scope.get("extensions") or {}
+
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if self.send_header_only or count <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif "http.response.zerocopysend" in extensions:
+            file = await anyio.to_thread.run_sync(open, self.path, "rb")
+            try:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file,
+                    "offset": offset,
+                    "count": count,
+                    "more_body": False,
+                })
+            finally:
+                await anyio.to_thread.run_sync(file.close)
+        elif self.byte_range is None and "http.response.pathsend" in extensions:
+            await send({"type": "http.response.pathsend", "path": str(self.path)})
+        else:
+            async with await anyio.open_file(self.path, mode="rb") as file:
+                await file.seek(offset)
+                remaining = count
+                while remaining > 0:
+                    chunk = await file.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+                if remaining > 0:
+                    # File shrank under us; end the body instead of hanging the client
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
+        if self.background is not None:
+            await self.background()
+
+
+class UploadStaticFiles(StaticFiles):
+    """Serves the uploads directory with long-lived caching, precompression and ranges.
+
+    - Content-addressed names are immutable: they get a year-long
+      `Cache-Control: immutable` and their hash as a strong ETag.
+    - Text-like files are served from their `.br` / `.gz` sibling when the
+      client accepts that coding.
+    - Single byte ranges are answered with 206 (or 416), e.g. for seeking in
+      uploaded videos.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        # Temp files and resumable uploads in progress are hidden, never public
+        if any(part.startswith(".") for part in path.replace(os.sep, "/").split("/")):
+            raise HTTPException(status_code=404)
+        return await super().get_response(path, scope)
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        method = scope["method"]
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        name = os.path.basename(full_path)
+        media_type = guess_type(name)[0] or "application/octet-stream"
+        hashed = bool(HASHED_NAME.match(name))
+
+        headers = {
+            "accept-ranges": "bytes",
+            "cache-control": IMMUTABLE_CACHE_CONTROL if hashed else REVALIDATE_CACHE_CONTROL,
+        }
+        path, encoding, file_stat = full_path, None, stat_result
+        if is_compressible(media_type):
+            headers["vary"] = "Accept-Encoding"
+            sibling = self._precompressed_sibling(full_path, request_headers.get("accept-encoding"))
+            if sibling:
+                path, encoding, file_stat = sibling
+                headers["content-encoding"] = encoding
+        if hashed:
+            suffix = f"-{encoding}" if encoding else ""
+            headers["etag"] = f'"{name.split(".", 1)[0]}{suffix}"'
+
+        byte_range = None
+        if encoding is None and self._range_applies(request_headers, headers.get("etag"), file_stat):
+            try:
+                byte_range = parse_range(request_headers.get("range"), file_stat.st_size)
+            except ValueError:
+                return Response(
+                    status_code=416,
+                    headers={"accept-ranges": "bytes", "content-range": f"bytes */{file_stat.st_size}"}
+                )
+
+        response = RangeFileResponse(
+            path,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            stat_result=file_stat,
+            method=method,
+            byte_range=byte_range,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    @staticmethod
+    def _precompressed_sibling(full_path: str, accept_encoding: Optional[str]) -> Optional[Tuple[str, str, os.stat_result]]:
+        accepted = _accepted_codings(accept_encoding)
+        for encoding, suffix in PRECOMPRESSED_SUFFIXES.items():
+            if accepted.get(encoding, 0) <= 0:
+                continue
+            try:
+                sibling_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            if stat.S_ISREG(sibling_stat.st_mode):
+                return full_path + suffix, encoding, sibling_stat
+        return None
+
+    @staticmethod
+    def _range_applies(request_headers: Headers, etag: Optional[str], file_stat: os.stat_result) -> bool:
+        if "range" not in request_headers:
+            return False
+        if_range = request_headers.get("if-range")
+        if not if_range:
+            return True
+        # Only honour the range if the client still has the current representation
+        if if_range.startswith('"') or if_range.startswith("W/"):
+            return etag is not None and if_range == etag
+        return if_range == formatdate(file_stat.st_mtime, usegmt=True)
+
+
+class PresignedRedirectFiles:
+    """Serves uploads kept in object storage by redirecting to a presigned URL.
+
+    The object store answers the actual request, including ranges and
+    conditional requests. The redirect itself may be cached for a while, as
+    long as the URL it points to is still valid.
+    """
+
+    def __init__(self, presign: Callable[[str], str], max_age: int):
+        self.presign = presign
+        self.max_age = max_age
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        assert scope["type"] == "http"
+        if scope["method"] not in ("GET", "HEAD"):
+            response: Response = PlainTextResponse("Method Not Allowed", status_code=405, headers={"allow": "GET, HEAD"})
+        else:
+            key = scope["path"].lstrip("/")
+            parts = key.split("/")
+            if not key or any(part in ("", ".", "..") or part.startswith(".") for part in parts):
+                response = PlainTextResponse("Not Found", status_code=404)
+            else:
+                response = RedirectResponse(
+                    self.presign(key),
+                    status_code=307,
+                    headers={"cache-control": f"private, max-age={self.max_age}"}
+                )
+        await response(scope, receive, send)
@@ -0,0 +1,478 @@
+import os
+import re
+import time
+import asyncio
+import hashlib
+import logging
+import mimetypes
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+from app.domain.exceptions import FileValidationError, FileTooLargeError
+from app.infrastructure.storage.static import PRECOMPRESSED_SUFFIXES
+from app.infrastructure.storage.backends import UPLOADS_DIR, UPLOADS_URL_PREFIX, get_storage_backend, url_to_key
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+logger = logging.getLogger(__name__)
+
+# Bytes inspected to verify that the content matches the declared type
+SNIFF_SIZE = 512
+# Allowance for boundaries, part headers and small form fields in Content-Length
+MULTIPART_OVERHEAD = 64 * 1024
+MAX_FIELD_SIZE = 64 * 1024
+# Blobs younger than this are never deleted: a concurrent upload may be about
+# to reference them, or its row may not be committed yet
+ORPHAN_GRACE_SECONDS = 60 * 60
+TEMP_PREFIX = ".upload-"
+# Files of one multi-upload persisted (fsync, rename, precompress) at the same time
+UPLOAD_CONCURRENCY = int(os.getenv("UPLOAD_CONCURRENCY", "4"))
+
+# Canonical extension per type, so identical content always maps to one blob
+_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "video/mp4": ".mp4",
+    "video/webm": ".webm",
+    "application/pdf": ".pdf",
+    "text/plain": ".txt",
+}
+
+# (signature, offset, mime type) of the binary types the file manager accepts
+_SIGNATURES: Tuple[Tuple[bytes, int, str], ...] = (
+    (b"\xff\xd8\xff", 0, "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", 0, "image/png"),
+    (b"GIF87a", 0, "image/gif"),
+    (b"GIF89a", 0, "image/gif"),
+    (b"RIFF", 0, "image/webp"),
+    (b"%PDF-", 0, "application/pdf"),
+    (b"\x1a\x45\xdf\xa3", 0, "video/webm"),
+)
+_ISO_BMFF_IMAGE_BRANDS = {b"avif": "image/avif", b"avis": "image/avif", b"heic": "image/heic", b"mif1": "image/heic"}
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """Guess the type of a file from its first bytes."""
+    if head[4:8] == b"ftyp":
+        return _ISO_BMFF_IMAGE_BRANDS.get(head[8:12], "video/mp4")
+    for signature, offset, content_type in _SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            if content_type == "image/webp" and head[8:12] != b"WEBP":
+                continue
+            return content_type
+    return None
+
+
+def check_content_signature(declared_type: str, head: bytes) -> None:
+    """Reject content whose leading bytes contradict the declared type."""
+    sniffed = sniff_content_type(head)
+    if declared_type.startswith("text/"):
+        if sniffed or b"\x00" in head:
+            raise FileValidationError(f"File content is not valid {declared_type}")
+        return
+    if sniffed != declared_type:
+        raise FileValidationError(f"File content does not match its declared type {declared_type}")
+
+
+def _safe_extension(filename: str) -> str:
+    extension = os.path.splitext(filename or "")[1].lower()
+    return extension if re.fullmatch(r"\.[a-z0-9]{1,10}", extension) else ""
+
+
+def blob_name(sha256: str, content_type: str, filename: str = "") -> str:
+    """Content-addressed name relative to the uploads dir, e.g. `ab/ab12...ef.jpg`."""
+    extension = _EXTENSIONS.get(content_type) or mimetypes.guess_extension(content_type) or _safe_extension(filename)
+    return f"{sha256[:2]}/{sha256}{extension}"
+
+
+@dataclass
+class StoredUpload:
+    """An upload that has been written to its final location."""
+    filename: str
+    content_type: str
+    size: int
+    sha256: str
+    # Key in the storage backend, e.g. ab/ab12...ef.jpg
+    key: str
+    url: str
+    # True when an identical blob already existed and nothing new was written
+    deduplicated: bool = False
+    # Position of the file among the request's file parts
+    index: int = 0
+
+
+@dataclass
+class UploadFailure:
+    """A file part of a multi-upload that was rejected; the other files are unaffected."""
+    index: int
+    filename: str
+    content_type: str
+    error: str
+    too_large: bool = False
+
+
+@dataclass
+class UploadPolicy:
+    allowed_types: Set[str]
+    max_size: int
+    # Per-type caps above max_size, for uploads that arrive in chunks
+    max_sizes: Dict[str, int] = field(default_factory=dict)
+
+    def max_size_for(self, content_type: str) -> int:
+        return self.max_sizes.get(content_type, self.max_size)
+
+
+class UploadWriter:
+    """Stream one upload to a temp file next to its destination.
+
+    The content is hashed while it is written, checked against the size cap on
+    every chunk and against its declared type once the first bytes are in.
+    `commit` fsyncs the file and hands it to the storage backend under its
+    content-addressed key, so readers never see a partial upload; if that blob
+    already exists the temp file is dropped instead.
+    """
+
+    def __init__(self, filename: str, content_type: str, policy: UploadPolicy, directory: str = UPLOADS_DIR):
+        self.filename = filename
+        self.content_type = content_type
+        self._policy = policy
+        self._directory = directory
+        self._hash = hashlib.sha256()
+        self._head = b""
+        self._checked = False
+        self._file = None
+        self._tmp_path: Optional[str] = None
+        self.size = 0
+
+    async def open(self) -> "UploadWriter":
+        if self.content_type not in self._policy.allowed_types:
+            raise FileValidationError(
+                f"File type {self.content_type} not allowed. Allowed types: images, videos, documents"
+            )
+        self._file, self._tmp_path = await run_in_threadpool(self._create_temp_file)
+        return self
+
+    def _create_temp_file(self):
+        os.makedirs(self._directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory, prefix=TEMP_PREFIX, suffix=".part")
+        return os.fdopen(fd, "wb"), tmp_path
+
+    async def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self._policy.max_size:
+            raise FileTooLargeError(
+                f"File too large. Maximum size is {self._policy.max_size / 1024 / 1024}MB"
+            )
+        self._hash.update(chunk)
+        if not self._checked:
+            # Hold back the first bytes until the type can be verified
+            self._head += chunk
+            if len(self._head) < SNIFF_SIZE:
+                return
+            chunk, self._head = self._head, b""
+            check_content_signature(self.content_type, chunk)
+            self._checked = True
+        await run_in_threadpool(self._file.write, chunk)
+
+    async def commit(self) -> StoredUpload:
+        if not self._checked:
+            check_content_signature(self.content_type, self._head)
+            self._checked = True
+            if self._head:
+                await run_in_threadpool(self._file.write, self._head)
+                self._head = b""
+        sha256 = self._hash.hexdigest()
+        key = blob_name(sha256, self.content_type, self.filename)
+        deduplicated = await run_in_threadpool(self._finish, key)
+        return StoredUpload(
+            filename=self.filename,
+            content_type=self.content_type,
+            size=self.size,
+            sha256=sha256,
+            key=key,
+            url=f"{UPLOADS_URL_PREFIX}/{key}",
+            deduplicated=deduplicated
+        )
+
+    def _finish(self, key: str) -> bool:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        tmp_path, self._tmp_path = self._tmp_path, None
+        return get_storage_backend().store(tmp_path, key, self.content_type)
+
+    async def abort(self) -> None:
+        await run_in_threadpool(self._discard)
+
+    def _discard(self) -> None:
+        if self._file and not self._file.closed:
+            self._file.close()
+        if self._tmp_path:
+            try:
+                os.unlink(self._tmp_path)
+            except OSError:
+                pass
+            self._tmp_path = None
+
+
+def remove_upload_blob(url: str, grace_seconds: float = ORPHAN_GRACE_SECONDS) -> bool:
+    """Delete the blob behind `url` once no file row references it any more.
+
+    Recently written or re-used blobs are left for the periodic GC, because a
+    concurrent upload of the same content may just be pointing a row at them.
+    """
+    key = url_to_key(url)
+    if not key:
+        return False
+    backend = get_storage_backend()
+    age = backend.age(key)
+    if age is None or age < grace_seconds or not backend.delete(key):
+        return False
+    logger.info(f"Removed unreferenced upload blob {url}")
+    return True
+
+
+def _original_name(key: str) -> str:
+    """Key of the blob a precompressed sibling belongs to."""
+    for suffix in PRECOMPRESSED_SUFFIXES.values():
+        if key.endswith(suffix):
+            return key[:-len(suffix)]
+    return key
+
+
+def collect_orphaned_blobs(referenced_urls: Set[str], grace_seconds: float = ORPHAN_GRACE_SECONDS) -> int:
+    """Delete stored blobs that nothing references, and stale local temp files."""
+    now = time.time()
+    backend = get_storage_backend()
+    removed = 0
+    for key, modified in list(backend.iter_blobs()):
+        if f"{UPLOADS_URL_PREFIX}/{_original_name(key)}" in referenced_urls:
+            continue
+        if now - modified < grace_seconds:
+            continue
+        try:
+            if backend.delete(key):
+                removed += 1
+        except Exception as e:
+            logger.warning(f"Could not remove orphaned upload {key}: {str(e)}")
+    removed += _collect_stale_temp_files(now, grace_seconds)
+    logger.info(f"Upload GC removed {removed} orphaned blob(s)")
+    return removed
+
+
+def _collect_stale_temp_files(now: float, grace_seconds: float) -> int:
+    """Temp files of uploads that died before they were stored."""
+    removed = 0
+    try:
+        names = os.listdir(UPLOADS_DIR)
+    except OSError:
+        return 0
+    for name in names:
+        if not name.startswith(TEMP_PREFIX):
+            continue
+        disk_path = os.path.join(UPLOADS_DIR, name)
+        try:
+            if now - os.stat(disk_path).st_mtime >= grace_seconds:
+                os.unlink(disk_path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def _parse_part_headers(headers: List[Tuple[bytes, bytes]]) -> Tuple[str, Optional[str], str]:
+    """Return (field name, filename or None, content type) of a multipart part."""
+    field_name, filename, content_type = "", None, "application/octet-stream"
+    for name, value in headers:
+        name = name.lower()
+        if name == b"content-disposition":
+            _, options = parse_options_header(value)
+            field_name = options.get(b"name", b"").decode("utf-8", "replace")
+            if b"filename" in options:
+                filename = options[b"filename"].decode("utf-8", "replace")
+        elif name == b"content-type":
+            parsed, _ = parse_options_header(value)
+            content_type = parsed.decode("latin-1").lower()
+    return field_name, filename, content_type
+
+
+@dataclass
+class _PartState:
+    headers: List[Tuple[bytes, bytes]] = field(default_factory=list)
+    header_field: bytes = b""
+    header_value: bytes = b""
+
+
+async def receive_uploads(
+    request: Request,
+    policy: UploadPolicy,
+    max_files: int = 1,
+    concurrency: int = 1,
+    failures: Optional[List[UploadFailure]] = None,
+) -> Tuple[List[StoredUpload], Dict[str, str]]:
+    """Stream a multipart/form-data request body straight to disk.
+
+    Nothing is buffered beyond the current chunk: oversize requests are refused
+    from Content-Length before reading, disallowed types from the part headers
+    and mismatching content from the first bytes of each file. Finished files
+    are persisted in the background, up to `concurrency` at a time, while the
+    next part is read. Returns the stored files in request order and the plain
+    form fields.
+
+    When a `failures` list is passed, a rejected file is recorded there and
+    skipped instead of failing the request. On error the file in progress is
+    discarded; blobs completed before that may already be shared with other
+    rows, so they are left to the orphan GC.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise FileValidationError("Expected a multipart/form-data upload")
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit():
+        if int(content_length) > policy.max_size * max_files + MULTIPART_OVERHEAD:
+            raise FileTooLargeError(
+                f"File too large. Maximum size is {policy.max_size / 1024 / 1024}MB"
+            )
+
+    # The parser reports through sync callbacks; events are handled after each chunk
+    events: List[Tuple[str, Any]] = []
+    state = _PartState()
+
+    def on_header_field(data: bytes, start: int, end: int) -> None:
+        state.header_field += data[start:end]
+
+    def on_header_value(data: bytes, start: int, end: int) -> None:
+        state.header_value += data[start:end]
+
+    def on_header_end() -> None:
+        state.headers.append((state.header_field, state.header_value))
+        state.header_field, state.header_value = b"", b""
+
+    def on_headers_finished() -> None:
+        events.append(("headers", state.headers))
+        state.headers = []
+
+    def on_part_data(data: bytes, start: int, end: int) -> None:
+        events.append(("data", data[start:end]))
+
+    def on_part_end() -> None:
+        events.append(("end", None))
+
+    parser = MultipartParser(boundary, {
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    # Bounds the files being written or persisted, and so the open temp files
+    slots = asyncio.Semaphore(max(1, concurrency))
+    pending: List[Tuple[UploadWriter, int, "asyncio.Task[StoredUpload]"]] = []
+
+    async def persist(writer: UploadWriter, index: int) -> StoredUpload:
+        try:
+            upload = await writer.commit()
+            upload.index = index
+            return upload
+        except BaseException:
+            await writer.abort()
+            raise
+        finally:
+            slots.release()
+
+    def reject(writer: UploadWriter, index: int, error: Exception) -> None:
+        if failures is None or not isinstance(error, FileValidationError):
+            raise error
+        logger.info(f"Rejected upload {writer.filename}: {str(error)}")
+        failures.append(UploadFailure(
+            index=index,
+            filename=writer.filename,
+            content_type=writer.content_type,
+            error=str(error),
+            too_large=isinstance(error, FileTooLargeError)
+        ))
+
+    fields: Dict[str, str] = {}
+    writer: Optional[UploadWriter] = None
+    skipping = False
+    file_count = 0
+    field_name: Optional[str] = None
+    field_value = b""
+
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            for event, payload in events:
+                if event == "headers":
+                    name, filename, part_type = _parse_part_headers(payload)
+                    if filename is None:
+                        field_name, field_value = name, b""
+                        continue
+                    if file_count >= max_files:
+                        raise FileValidationError(f"At most {max_files} file(s) per request")
+                    file_count += 1
+                    await slots.acquire()
+                    writer = UploadWriter(filename, part_type, policy)
+                    try:
+                        await writer.open()
+                    except FileValidationError as e:
+                        slots.release()
+                        rejected, writer = writer, None
+                        reject(rejected, file_count - 1, e)
+                        skipping = True
+                elif event == "data":
+                    if writer:
+                        try:
+                            await writer.write(payload)
+                        except FileValidationError as e:
+                            await writer.abort()
+                            slots.release()
+                            rejected, writer = writer, None
+                            reject(rejected, file_count - 1, e)
+                            skipping = True
+                    elif not skipping:
+                        field_value += payload
+                        if len(field_value) > MAX_FIELD_SIZE:
+                            raise FileValidationError(f"Form field {field_name} is too large")
+                elif event == "end":
+                    if writer:
+                        task = asyncio.create_task(persist(writer, file_count - 1))
+                        pending.append((writer, file_count - 1, task))
+                        writer = None
+                    elif skipping:
+                        skipping = False
+                    elif field_name is not None:
+                        fields[field_name] = field_value.decode("utf-8", "replace")
+                        field_name = None
+            events.clear()
+        parser.finalize()
+    except BaseException:
+        if writer:
+            await writer.abort()
+            slots.release()
+        # Let started files finish; their blobs are collected if left unreferenced
+        await asyncio.gather(*(task for _, _, task in pending), return_exceptions=True)
+        raise
+
+    stored: List[StoredUpload] = []
+    outcomes = await asyncio.gather(*(task for _, _, task in pending), return_exceptions=True)
+    for (finished, index, _), outcome in zip(pending, outcomes):
+        if isinstance(outcome, BaseException):
+            reject(finished, index, outcome)
+            continue
+        stored.append(outcome)
+
+    for upload in stored:
+        state_label = "deduplicated" if upload.deduplicated else "stored"
+        logger.debug(f"Upload {upload.filename} ({upload.size} bytes) {state_label} at {upload.url}")
+    return stored, fields
@@ -2,8 +2,11 @@ from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 from .api.api import api_router
-from app.infrastructure.scheduler.scheduler import start_scheduler
+from app.infrastructure.scheduler.scheduler import start_scheduler, stop_scheduler
+from app.infrastructure.storage.derivatives import shutdown_derivative_pool
+from app.infrastructure.external.sync_worker import sync_worker
 from fastapi.staticfiles import StaticFiles
+from app.infrastructure.storage.backends import get_storage_backend
 import os
 
 # Configure logging
@@ -42,9 +45,11 @@ base_dir = os.path.dirname(os.path.abspath(__file__))
 static_dir = os.path.join(base_dir, "static")
 static_uploads_dir = os.path.join(static_dir, "uploads")
 
-# Create static/uploads directory if it doesn't exist
+# Create static/uploads directory if it doesn't exist (also upload scratch space)
 os.makedirs(static_uploads_dir, exist_ok=True)
 
+# Uploads first: served from local disk, or redirected to object storage
+app.mount("/static/uploads", get_storage_backend().asgi_app(), name="uploads")
 # Mount the static directory
 app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
@@ -59,4 +64,13 @@ async def ping():
 @app.on_event("startup")
 async def startup_event():
     """Start background tasks on application startup"""
+    # Before the scheduler: scheduled syncs are handed to the worker
+    await sync_worker.start()
     start_scheduler()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release scheduler leadership, cancel running syncs and stop image derivative workers"""
+    stop_scheduler()
+    await sync_worker.stop()
+    shutdown_derivative_pool()
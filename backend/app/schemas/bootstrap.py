@@ -0,0 +1,16 @@
+from typing import List, Optional
+from pydantic import BaseModel
+from .layout import Layout
+from .theme import Theme
+from .section import Section
+from .skill import Skill
+from .project import Project
+
+
+class PublicBootstrap(BaseModel):
+    """Everything the public site needs to render its first page."""
+    layout: Optional[Layout] = None
+    theme: Optional[Theme] = None
+    sections: List[Section] = []
+    skills: List[Skill] = []
+    projects: List[Project] = []
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field, validator
 
@@ -11,7 +11,6 @@ class FileBase(BaseModel):
     size: Optional[int] = Field(None, ge=0)
     mime_type: Optional[str] = None
     tags: List[str] = Field(default_factory=list)
-    used_in: Dict[str, str] = Field(default_factory=dict)
 
     @validator('path')
     def validate_path(cls, v, values):
@@ -34,6 +33,12 @@ class FileBase(BaseModel):
 class FileCreate(FileBase):
     pass
 
+class FileFromHash(BaseModel):
+    """Create a file from content that is already stored, without uploading it again."""
+    name: str = Field(..., min_length=1, max_length=255)
+    content_hash: str = Field(..., pattern=r"^[0-9a-f]{64}$")
+    parent_id: Optional[UUID] = None
+
 class FileUpdate(FileBase):
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     path: Optional[str] = Field(None, min_length=1)
@@ -43,8 +48,97 @@ class FileUpdate(FileBase):
 
 class FileRead(FileBase):
     id: UUID
+    content_hash: Optional[str] = None
+    variants: Optional[Dict[str, Any]] = None
+    # Owner ids per owner type, from the usage index; only filled for single files
+    used_in: Dict[str, List[int]] = Field(default_factory=dict)
     created_at: datetime
     updated_at: datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+class FileUsageRead(BaseModel):
+    owner_type: Literal["project", "post", "section"]
+    owner_id: int
+    field: str
+
+class FileUploadResult(BaseModel):
+    """Outcome for one file of a multi-file upload."""
+    filename: str
+    status: Literal["created", "error"]
+    file: Optional[FileRead] = None
+    error: Optional[str] = None
+
+class ResumableUploadCreate(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    content_type: str
+    size: int = Field(..., gt=0)
+    parent_id: Optional[UUID] = None
+
+class ResumableUploadRead(BaseModel):
+    id: str
+    filename: str
+    content_type: str
+    size: int
+    offset: int
+    # Largest chunk one PATCH may carry
+    max_chunk_size: int
+    expires_at: datetime
+
+class FileListItem(BaseModel):
+    """A row of the file browser listing."""
+    id: UUID
+    name: str
+    path: str
+    parent_id: Optional[UUID] = None
+    is_folder: bool = False
+    size: Optional[int] = None
+    mime_type: Optional[str] = None
+    tags: List[str] = Field(default_factory=list)
+    usage_count: int = 0
+    content_hash: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    @validator('tags', pre=True)
+    def validate_tags(cls, v):
+        return v or []
+
+    @validator('usage_count', pre=True)
+    def validate_usage_count(cls, v):
+        return v or 0
+
+class FilePageRead(BaseModel):
+    items: List[FileListItem]
+    next_cursor: Optional[str] = None
+    total: int
+    total_is_estimate: bool = False
+
+    class Config:
+        from_attributes = True
+
+class FileBatchOperation(BaseModel):
+    op: Literal["move", "delete", "add_tags", "remove_tags"]
+    ids: List[UUID] = Field(..., min_length=1)
+    # Target folder of "move"; null moves to the root
+    parent_id: Optional[UUID] = None
+    # Tags of "add_tags" / "remove_tags"
+    tags: List[str] = Field(default_factory=list)
+
+class FileBatchRequest(BaseModel):
+    operations: List[FileBatchOperation] = Field(..., min_length=1)
+
+class FileBatchItemResult(BaseModel):
+    operation: int
+    id: str
+    status: Literal["ok", "not_found", "skipped", "error"]
+    detail: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class FileBatchResult(BaseModel):
+    results: List[FileBatchItemResult]
+    succeeded: int
+    failed: int
@@ -188,6 +188,8 @@ class Project(ProjectBase):
     last_updated: Optional[datetime] = None
     open_issues_count: Optional[int] = None
     default_branch: Optional[str] = None
+    # Responsive variants of uploaded images, keyed by their original URL
+    media: Optional[Dict[str, Any]] = None
 
 # Import schemas
 class GitHubProjectImport(CamelCaseModel):
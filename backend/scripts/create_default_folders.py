@@ -34,14 +34,15 @@ def ensure_upload_folders():
             if existing:
                 logger.info(f"Folder '{folder_name}' already exists in DB.")
                 continue
+            folder_id = uuid4()
             folder = FileModel(
-                id=uuid4(),
+                id=folder_id,
                 name=folder_name,
                 path=f"/static/uploads/{folder_name}",
                 parent_id=None,
+                tree_path=f"/{folder_id}/",
                 is_folder=True,
-                tags=[],
-                used_in={}
+                tags=[]
             )
             db.add(folder)
             logger.info(f"Created folder '{folder_name}' in DB.")
@@ -0,0 +1,47 @@
+import os
+import sys
+import logging
+
+# Adjust path to allow imports from the 'app' directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import delete, select
+from app.domain.models.file import USAGE_PROJECT, USAGE_POST, USAGE_SECTION
+from app.infrastructure.database.session import SessionLocal
+from app.infrastructure.database.models.project import ProjectModel
+from app.infrastructure.database.models.post import PostModel
+from app.infrastructure.database.models.section import SectionModel
+from app.infrastructure.database.models.file_usage import FileUsageModel
+from app.infrastructure.database.usage_index import FileUsageIndex
+
+logger = logging.getLogger("index_file_usages")
+
+OWNER_MODELS = {
+    USAGE_PROJECT: ProjectModel,
+    USAGE_POST: PostModel,
+    USAGE_SECTION: SectionModel,
+}
+
+def rebuild_usage_index():
+    """Index all existing content; the repositories keep the index current afterwards."""
+    logger.info("Rebuilding file usage index...")
+    db = SessionLocal()
+    try:
+        # Also drops usages of rows deleted while the index did not exist yet
+        db.execute(delete(FileUsageModel))
+        index = FileUsageIndex(db)
+        for owner_type, model in OWNER_MODELS.items():
+            rows = db.execute(select(model)).scalars().all()
+            index.index(owner_type, rows)
+            logger.info(f"Indexed {len(rows)} {owner_type}(s).")
+        db.commit()
+        logger.info("File usage index rebuilt.")
+    except Exception as e:
+        logger.error(f"Error rebuilding file usage index: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_usage_index()
@@ -0,0 +1,73 @@
+import os
+import sys
+import json
+import asyncio
+import logging
+import argparse
+
+# Adjust path to allow imports from the 'app' directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.github import AsyncGitHubFetcher, create_github_client
+from app.core.github_graphql import fetch_user_repositories_graphql
+from app.core.http_fixtures import RecordingTransport, ReplayTransport
+from app.infrastructure.external.sync_service import SyncService, FINGERPRINT_EXCLUDED_FIELDS
+
+logger = logging.getLogger("verify_github_sync")
+
+async def fetch_both(username, transport):
+    """Repositories of `username` from the REST and the GraphQL backend, over one transport."""
+    async with create_github_client(transport=transport) as rest_client, \
+            create_github_client(resource="graphql", transport=transport) as graphql_client:
+        # No conditional requests: a replayed 304 would hide the recorded page
+        async with AsyncGitHubFetcher(client=rest_client, cache=None) as fetcher:
+            rest = await fetcher.fetch_user_repositories(username)
+        graphql = await fetch_user_repositories_graphql(username, client=graphql_client)
+    return rest, graphql
+
+def map_projects(repos):
+    """Project fields per repository name, as a sync would write them."""
+    service = SyncService(session_factory=None, github_backend="rest")
+    return {
+        repo["name"]: service._build_project(repo, "github").model_dump(mode="json", exclude=FINGERPRINT_EXCLUDED_FIELDS)
+        for repo in repos
+    }
+
+def compare(rest, graphql):
+    """Print every field where the two backends map a repository differently; return the count."""
+    rest_projects, graphql_projects = map_projects(rest), map_projects(graphql)
+    differences = 0
+    for name in sorted(set(rest_projects) | set(graphql_projects)):
+        if name not in graphql_projects or name not in rest_projects:
+            print(f"{name}: only in {'REST' if name in rest_projects else 'GraphQL'}")
+            differences += 1
+            continue
+        left, right = rest_projects[name], graphql_projects[name]
+        for field in sorted(set(left) | set(right)):
+            if left.get(field) != right.get(field):
+                print(f"{name}.{field}: REST {json.dumps(left.get(field))} != GraphQL {json.dumps(right.get(field))}")
+                differences += 1
+    print(f"{len(rest_projects)} REST / {len(graphql_projects)} GraphQL repositories, {differences} difference(s)")
+    return differences
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that the REST and GraphQL GitHub sync backends map repositories to the same projects."
+    )
+    parser.add_argument("mode", choices=["record", "replay"], help="record: query GitHub (needs a token) and save; replay: offline")
+    parser.add_argument("username")
+    parser.add_argument("fixture", help="JSON file with the recorded requests and responses")
+    args = parser.parse_args()
+
+    if args.mode == "record":
+        transport = RecordingTransport()
+    else:
+        transport = ReplayTransport(args.fixture)
+    rest, graphql = asyncio.run(fetch_both(args.username, transport))
+    if args.mode == "record":
+        transport.save(args.fixture)
+    sys.exit(1 if compare(rest, graphql) else 0)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,64 @@
+import os
+import sys
+import logging
+
+# Adjust path to allow imports from the 'app' directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import Text, cast, null, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.infrastructure.database.session import engine
+from app.infrastructure.database.repositories.filemanager_repository_impl import (
+    _text_array,
+    _with_tags_added,
+    _with_tags_removed,
+)
+
+logger = logging.getLogger("verify_tag_updates")
+
+# (stored tags, tags of the operation); None is a row whose tags are NULL
+CASES = [
+    (None, ["n"]),
+    ([], ["n"]),
+    (["n"], ["n"]),
+    (["x"], ["n"]),
+    (["n", "x"], ["n"]),
+    (["x", "y"], ["n"]),
+    (["n", "x"], ["n", "y", "y"]),
+]
+
+
+def expected_added(current, tags):
+    current = list(current or [])
+    return current + [tag for tag in dict.fromkeys(tags) if tag not in current]
+
+
+def expected_removed(current, tags):
+    return [tag for tag in current or [] if tag not in tags]
+
+
+def main():
+    """Evaluate the add/remove tag expressions of the batch API on PostgreSQL, without touching any row."""
+    failures = 0
+    with engine.connect() as connection:
+        for current, tags in CASES:
+            stored = cast(null(), ARRAY(Text)) if current is None else _text_array(current)
+            added, removed = connection.execute(
+                select(_with_tags_added(tags, stored), _with_tags_removed(tags, stored))
+            ).one()
+            # Order of newly added tags is not defined
+            checks = [
+                ("add", sorted(added), sorted(expected_added(current, tags))),
+                ("remove", removed, expected_removed(current, tags)),
+            ]
+            for operation, actual, expected in checks:
+                if actual != expected:
+                    print(f"{operation} {tags} on {current}: got {actual}, expected {expected}")
+                    failures += 1
+    print(f"{len(CASES)} case(s), {failures} failure(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,101 @@
+import pytest
+from sqlalchemy import text
+from app.domain.models.file import BATCH_ADD_TAGS, BATCH_MOVE, BATCH_REMOVE_TAGS, File, FileBatchOperation, FileQuery
+from app.domain.exceptions import FileNotFoundError
+from app.infrastructure.database.repositories.filemanager_repository_impl import SQLAlchemyFileManagerRepository
+
+
+@pytest.fixture
+def repository(db):
+    return SQLAlchemyFileManagerRepository(db)
+
+
+def folder(repository, name, parent_id=None):
+    return repository.create_file(File(name=name, path=f"/{name}", parent_id=parent_id, is_folder=True))
+
+
+def upload(repository, name, parent_id=None, size=1, tags=None):
+    return repository.create_file(File(
+        name=name, path=f"/uploads/{name}", parent_id=parent_id, size=size, mime_type="image/png", tags=tags
+    ))
+
+
+def test_create_file_below_a_folder(repository):
+    docs = folder(repository, "docs")
+    image = upload(repository, "a.png", parent_id=docs.id)
+    assert str(image.parent_id) == str(docs.id)
+    assert image.tree_path == f"/{docs.id}/{image.id}/"
+    assert [str(file.id) for file in repository.get_breadcrumbs(str(image.id))] == [str(docs.id), str(image.id)]
+
+
+def test_create_files_needs_an_existing_folder(repository):
+    with pytest.raises(FileNotFoundError):
+        repository.create_files([File(name="a.png", path="/uploads/a.png", parent_id="00000000-0000-0000-0000-000000000000")])
+
+
+@pytest.mark.parametrize("sort, descending", [("name", False), ("size", True), ("created_at", False)])
+def test_keyset_pages_cover_every_file_once(repository, sort, descending):
+    for index in range(7):
+        upload(repository, f"{index % 3}-{index}.png", size=index % 2)
+    seen, cursor = [], None
+    while True:
+        page = repository.list_files_page(FileQuery(sort=sort, descending=descending, limit=3, cursor=cursor))
+        assert (page.total, page.total_is_estimate) == (7, False)
+        seen.extend(item["name"] for item in page.items)
+        cursor = page.next_cursor
+        if not cursor:
+            break
+    assert sorted(seen) == sorted(f"{index % 3}-{index}.png" for index in range(7))
+    assert len(seen) == len(set(seen))
+
+
+def test_batch_tags(repository, db):
+    files = [
+        upload(repository, "none.png"),
+        upload(repository, "one.png", tags=["new"]),
+        upload(repository, "other.png", tags=["x"]),
+        upload(repository, "many.png", tags=["x", "y"]),
+    ]
+    # Rows from before tags had a default
+    db.execute(text("UPDATE files SET tags = NULL WHERE name = 'none.png'"))
+    db.commit()
+    ids = [str(file.id) for file in files]
+
+    results, _ = repository.apply_batch([FileBatchOperation(op=BATCH_ADD_TAGS, ids=ids, tags=["new", "new"])])
+    assert {result.status for result in results} == {"ok"}
+    tags = {file.name: file.tags for file in map(repository.get_file, ids)}
+    assert tags == {"none.png": ["new"], "one.png": ["new"], "other.png": ["x", "new"], "many.png": ["x", "y", "new"]}
+
+    repository.apply_batch([FileBatchOperation(op=BATCH_REMOVE_TAGS, ids=ids, tags=["x"])])
+    assert repository.get_file(ids[3]).tags == ["y", "new"]
+
+
+def test_a_failing_batch_operation_keeps_the_others(repository):
+    docs = folder(repository, "docs")
+    clash = upload(repository, "a.png", parent_id=docs.id)
+    image = upload(repository, "a.png")
+    other = upload(repository, "b.png")
+
+    results, _ = repository.apply_batch([
+        FileBatchOperation(op=BATCH_ADD_TAGS, ids=[str(image.id)], tags=["kept"]),
+        FileBatchOperation(op=BATCH_MOVE, ids=[str(image.id)], parent_id=str(docs.id)),
+        FileBatchOperation(op=BATCH_MOVE, ids=[str(other.id)], parent_id=str(docs.id)),
+    ])
+    assert [result.status for result in results] == ["ok", "error", "ok"]
+    assert repository.get_file(str(image.id)).tags == ["kept"]
+    assert repository.get_file(str(image.id)).parent_id is None
+    assert str(repository.get_file(str(other.id)).parent_id) == str(docs.id)
+    assert str(repository.get_file(str(clash.id)).parent_id) == str(docs.id)
+
+
+def test_create_files_inserts_many_in_order(repository):
+    docs = folder(repository, "docs")
+    files = [
+        File(name=f"{index}.png", path=f"/uploads/{index}.png", parent_id=str(docs.id), size=index, mime_type="image/png")
+        for index in range(3)
+    ] + [File(name="root.png", path="/uploads/root.png", size=9, mime_type="image/png")]
+
+    created = repository.create_files(files)
+    assert [file.name for file in created] == ["0.png", "1.png", "2.png", "root.png"]
+    assert [file.tree_path for file in created] == [f"/{docs.id}/{file.id}/" for file in created[:3]] + [f"/{created[3].id}/"]
+    assert sorted(file.name for file in repository.list_files(str(docs.id))) == ["0.png", "1.png", "2.png"]
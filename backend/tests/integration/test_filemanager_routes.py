@@ -0,0 +1,60 @@
+import threading
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.deps import get_filemanager_service
+from app.api.endpoints.admin import filemanager
+from app.core.auth import get_current_user
+from app.domain.models.file import File
+from app.domain.services.filemanager_service import FileManagerService
+from app.infrastructure.database.repositories.filemanager_repository_impl import SQLAlchemyFileManagerRepository
+
+
+class ThreadRecordingRepository(SQLAlchemyFileManagerRepository):
+    """Notes the thread of every blocking call the routes make."""
+
+    def __init__(self, db):
+        super().__init__(db)
+        self.threads = set()
+
+    def __getattribute__(self, name):
+        attribute = super().__getattribute__(name)
+        if callable(attribute) and not name.startswith("_"):
+            super().__getattribute__("threads").add(threading.current_thread().name)
+        return attribute
+
+
+@pytest.fixture
+def repository(db):
+    return ThreadRecordingRepository(db)
+
+
+@pytest.fixture
+def saved_images():
+    return []
+
+
+@pytest.fixture
+def client(repository, saved_images):
+    app = FastAPI()
+    app.include_router(filemanager.router, prefix="/admin/filemanager")
+    app.dependency_overrides[get_current_user] = lambda: None
+    app.dependency_overrides[get_filemanager_service] = lambda: FileManagerService(
+        repository, on_image_saved=saved_images.append
+    )
+    with TestClient(app) as client:
+        yield client
+
+
+def test_create_from_hash_runs_off_the_event_loop(client, repository, saved_images):
+    stored = repository.create_file(File(
+        name="a.png", path="/uploads/ab.png", size=3, mime_type="image/png", content_hash="ab" * 32
+    ))
+    repository.threads.clear()
+    loop_thread = client.portal.call(lambda: threading.current_thread().name)
+
+    response = client.post("/admin/filemanager/files/from-hash", json={"name": "b.png", "content_hash": "ab" * 32})
+    assert response.status_code == 200, response.text
+    assert response.json()["path"] == stored.path
+    assert repository.threads and loop_thread not in repository.threads
+    assert [file.name for file in saved_images] == ["b.png"]
@@ -0,0 +1,39 @@
+from app.domain.models.project import Project
+from app.infrastructure.database.repositories.project_repository_impl import SQLAlchemyProjectRepository
+
+
+def synced(name, **fields):
+    return Project(name=name, source_type="github", source_username="octo", **fields)
+
+
+def test_bulk_upsert_inserts_in_key_order(db):
+    repository = SQLAlchemyProjectRepository(db)
+    created = repository.bulk_upsert([synced("b", stars_count=1), synced("a", stars_count=2), synced("b", stars_count=3)])
+    assert [(project.name, project.stars_count) for project in created] == [("b", 3), ("a", 2)]
+    assert all(project.id for project in created)
+
+
+def test_bulk_upsert_keeps_curated_fields(db):
+    repository = SQLAlchemyProjectRepository(db)
+    [project] = repository.bulk_upsert([synced("aboutme", description="From GitHub", stars_count=1)])
+    project.display_order = 7
+    project.is_visible = False
+    project.description = "Curated"
+    repository.update(project.id, project)
+
+    [synced_again] = repository.bulk_upsert([synced("aboutme", stars_count=5)])
+    assert synced_again.id == project.id
+    assert synced_again.stars_count == 5
+    assert (synced_again.display_order, synced_again.is_visible, synced_again.description) == (7, False, "Curated")
+
+
+def test_sync_fingerprints(db):
+    repository = SQLAlchemyProjectRepository(db)
+    created = repository.bulk_upsert([
+        synced("a", sync_fingerprint="f" * 64),
+        synced("b"),
+        Project(name="c", source_type="github", source_username="someone-else"),
+    ])
+    ids = {project.name: project.id for project in created}
+    fingerprints = repository.get_sync_fingerprints("github", "octo")
+    assert {name: stored[:2] for name, stored in fingerprints.items()} == {"a": (ids["a"], "f" * 64), "b": (ids["b"], None)}
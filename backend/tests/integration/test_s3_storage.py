@@ -0,0 +1,83 @@
+import os
+import uuid
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# An S3-compatible endpoint to create a bucket on, e.g. the test-minio service
+# of docker-compose.override.test.yml (scripts/test.sh)
+TEST_S3_ENDPOINT_URL = os.getenv("TEST_S3_ENDPOINT_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_S3_ENDPOINT_URL, reason="TEST_S3_ENDPOINT_URL is not set")
+
+
+@pytest.fixture(scope="module")
+def backend():
+    from app.infrastructure.storage.backends import S3StorageBackend
+    backend = S3StorageBackend(
+        bucket=os.getenv("TEST_S3_BUCKET", "aboutme-test"),
+        endpoint_url=TEST_S3_ENDPOINT_URL,
+        region="us-east-1",
+        access_key=os.getenv("TEST_S3_ACCESS_KEY_ID"),
+        secret_key=os.getenv("TEST_S3_SECRET_ACCESS_KEY"),
+        prefix=f"test-{uuid.uuid4().hex[:8]}"
+    )
+    client = backend._client
+    if backend.bucket not in {bucket["Name"] for bucket in client.list_buckets()["Buckets"]}:
+        client.create_bucket(Bucket=backend.bucket)
+    yield backend
+    for key, _ in list(backend.iter_blobs()):
+        backend.delete(key)
+
+
+@pytest.fixture
+def blob(tmp_path):
+    def write(content):
+        path = tmp_path / uuid.uuid4().hex
+        path.write_bytes(content)
+        return str(path)
+    return write
+
+
+def test_store_exists_fetch_delete(backend, blob):
+    key = "ab/ab12.txt"
+    assert not backend.exists(key)
+
+    source = blob(b"hello storage")
+    assert backend.store(source, key, "text/plain") is False
+    # Handed over: the local file is gone
+    assert not os.path.exists(source)
+    assert backend.exists(key)
+    assert 0 <= backend.age(key) < 300
+    assert key in {stored for stored, _ in backend.iter_blobs()}
+
+    # Content-addressed: storing the same key again is a no-op
+    assert backend.store(blob(b"hello storage"), key, "text/plain") is True
+
+    with backend.fetch(key) as local_path:
+        with open(local_path, "rb") as stored:
+            assert stored.read() == b"hello storage"
+    assert not os.path.exists(local_path)
+
+    assert backend.delete(key)
+    assert not backend.exists(key)
+    assert backend.age(key) is None
+
+
+def test_uploads_are_served_by_presigned_redirect(backend, blob):
+    key = "cd/cd34.txt"
+    backend.store(blob(b"redirected"), key, "text/plain")
+    app = FastAPI()
+    app.mount("/static/uploads", backend.asgi_app())
+
+    response = TestClient(app).get(f"/static/uploads/{key}", follow_redirects=False)
+    assert response.status_code == 307
+    assert response.headers["cache-control"] == f"private, max-age={backend.presign_expires // 2}"
+
+    stored = httpx.get(response.headers["location"])
+    assert stored.status_code == 200
+    assert stored.content == b"redirected"
+    assert stored.headers["content-type"] == "text/plain"
+
+    assert TestClient(app).get("/static/uploads/../secret").status_code == 404
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import text
+from app.infrastructure.cache.response_cache import ResponseCache
+from app.infrastructure.cache.tag_versions import LocalTagVersions
+from app.infrastructure.external import sync_service
+from app.infrastructure.external.sync_service import SyncService
+from tests.unit.test_sync_fingerprint import enriched, listed_repo
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeGitHub:
+    """The REST fetcher's contract: unchanged repositories are flagged, the others enriched."""
+
+    def __init__(self, repo):
+        self.repo = repo
+        self.has_releases = False
+        self.enriched = 0
+
+    async def fetch(self, username, client=None, is_unchanged=None):
+        repo = dict(self.repo)
+        if is_unchanged(repo):
+            return [{**repo, "not_modified": True}]
+        self.enriched += 1
+        return [enriched(repo, has_releases=self.has_releases)]
+
+
+@pytest.fixture
+def github(monkeypatch):
+    github = FakeGitHub(listed_repo())
+    monkeypatch.setattr(sync_service, "fetch_user_repositories_async", github.fetch)
+    monkeypatch.setattr(sync_service, "public_cache", ResponseCache(LocalTagVersions()))
+    return github
+
+
+def stored(db):
+    db.expire_all()
+    return db.execute(text("SELECT status, synced_at, updated_at FROM projects WHERE name = 'aboutme'")).one()
+
+
+async def test_unchanged_listing_is_enriched_again_after_a_while(github, db, async_session_factory):
+    service = SyncService(async_session_factory, github_backend="rest")
+    assert (await service.sync_projects("octo")).created == 1
+    assert (await service.sync_projects("octo")).unchanged == 1
+    assert github.enriched == 1
+
+    # A release without a push: the listing entry stays the same
+    github.has_releases = True
+    age = (sync_service.SYNC_REENRICH_HOURS + 1) * 3600
+    db.execute(text("UPDATE projects SET synced_at = synced_at - make_interval(secs => :age)"), {"age": age})
+    db.commit()
+    assert (await service.sync_projects("octo")).updated == 1
+    assert github.enriched == 2
+    assert stored(db).status == "ACTIVE"
+
+
+async def test_a_verified_project_only_gets_its_check_time_refreshed(github, db, async_session_factory):
+    service = SyncService(async_session_factory, github_backend="rest")
+    await service.sync_projects("octo")
+    db.execute(text("UPDATE projects SET synced_at = synced_at - interval '1 year'"))
+    db.commit()
+    before = stored(db)
+
+    assert (await service.sync_projects("octo")).unchanged == 1
+    after = stored(db)
+    assert github.enriched == 2
+    assert after.synced_at > before.synced_at
+    assert after.updated_at == before.updated_at
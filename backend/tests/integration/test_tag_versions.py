@@ -0,0 +1,49 @@
+import pytest
+from app.infrastructure.cache.tag_versions import DatabaseTagVersions
+from app.infrastructure.database import session
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def workers(async_db_engine, db, monkeypatch):
+    monkeypatch.setattr(session, "async_engine", async_db_engine)
+    # The test moves time forward by hand
+    clock = [1000.0]
+    monkeypatch.setattr("app.infrastructure.cache.tag_versions.time.monotonic", lambda: clock[0])
+    return DatabaseTagVersions(refresh_interval=1), DatabaseTagVersions(refresh_interval=1), clock
+
+
+async def test_a_bump_is_seen_by_its_own_worker_right_away(workers):
+    first, _, _ = workers
+    assert await first.read(["projects"]) == {"projects": 0}
+    await first.bump(["projects", "projects"])
+    assert await first.read(["projects", "skills"]) == {"projects": 1, "skills": 0}
+
+
+async def test_other_workers_reload_at_most_once_per_interval(workers):
+    first, second, clock = workers
+    await second.read(["projects"])
+    await first.bump(["projects"])
+
+    # Within the interval the snapshot answers, without a query
+    assert await second.read(["projects"]) == {"projects": 0}
+
+    clock[0] += 1
+    assert await second.read(["projects"]) == {"projects": 1}
+
+
+async def test_a_failed_reload_keeps_the_last_versions(workers, monkeypatch):
+    first, second, clock = workers
+    await first.bump(["themes"])
+    assert await second.read(["themes"]) == {"themes": 1}
+
+    class Unreachable:
+        def connect(self):
+            raise OSError("connection refused")
+
+    monkeypatch.setattr(session, "async_engine", Unreachable())
+    clock[0] += 1
+    assert await second.read(["themes"]) == {"themes": 1}
+    with pytest.raises(OSError):
+        await DatabaseTagVersions().read(["themes"])
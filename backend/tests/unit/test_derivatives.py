@@ -0,0 +1,61 @@
+import asyncio
+import anyio.to_thread
+import pytest
+from app.domain.models.file import File
+from app.infrastructure.storage import derivatives
+from app.infrastructure.storage.backends import UPLOADS_URL_PREFIX
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_schedule_from_a_worker_thread_runs_on_the_event_loop(monkeypatch):
+    processed = asyncio.Event()
+
+    async def process(sha256, source_url):
+        processed.set()
+
+    monkeypatch.setattr(derivatives, "_process", process)
+    image = File(name="a.png", path="/uploads/ab.png", content_hash="ab" * 32)
+    await anyio.to_thread.run_sync(derivatives.schedule_derivatives, image)
+    await asyncio.wait_for(processed.wait(), timeout=1)
+
+
+async def test_render_stores_the_variants(tmp_path, monkeypatch):
+    from PIL import Image
+    from app.infrastructure.storage.backends import LocalStorageBackend
+
+    sha256 = "cd" * 32
+    (tmp_path / "cd").mkdir()
+    Image.new("RGB", (400, 200), "teal").save(tmp_path / "cd" / f"{sha256}.png")
+    monkeypatch.setattr(derivatives, "UPLOADS_DIR", str(tmp_path))
+    monkeypatch.setattr(derivatives, "DERIVATIVE_FORMATS", ("webp",))
+    monkeypatch.setattr(derivatives, "get_storage_backend", lambda: LocalStorageBackend(str(tmp_path)))
+    try:
+        variants = await derivatives._render(sha256, f"cd/{sha256}.png")
+    finally:
+        derivatives.shutdown_derivative_pool()
+
+    assert (variants["width"], variants["height"]) == (400, 200)
+    assert [entry["width"] for entry in variants["sources"]["image/webp"]] == [320, 400]
+    assert (tmp_path / "cd" / f"{sha256}-320w.webp").exists()
+    # The scratch dir is gone
+    assert not [path for path in tmp_path.iterdir() if path.name.startswith(".derivatives-")]
+
+
+async def test_jobs_wait_for_a_slot(monkeypatch):
+    running, peak = 0, 0
+
+    async def render(sha256, key):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return None
+
+    monkeypatch.setattr(derivatives, "_render", render)
+    monkeypatch.setattr(derivatives, "_job_slots", asyncio.Semaphore(2))
+    await asyncio.gather(*(
+        derivatives._process(f"{index:064x}", f"{UPLOADS_URL_PREFIX}/00/{index:064x}.png") for index in range(6)
+    ))
+    assert peak == 2
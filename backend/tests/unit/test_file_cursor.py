@@ -0,0 +1,29 @@
+import uuid
+from datetime import datetime, timezone
+import pytest
+from app.domain.exceptions import FileValidationError
+from app.infrastructure.database.repositories.filemanager_repository_impl import _decode_cursor, _encode_cursor
+
+FILE_ID = str(uuid.uuid4())
+
+
+@pytest.mark.parametrize("sort, value", [
+    ("name", "Report.pdf"),
+    ("size", 12345),
+    ("created_at", datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)),
+])
+def test_cursor_roundtrip(sort, value):
+    cursor = _encode_cursor(value, FILE_ID)
+    assert "=" not in cursor
+    assert _decode_cursor(cursor, sort) == (value, FILE_ID)
+
+
+@pytest.mark.parametrize("sort, cursor", [
+    ("name", ""),
+    ("name", "not a cursor"),
+    ("name", _encode_cursor("a", "not-a-uuid")),
+    ("size", _encode_cursor("big", FILE_ID)),
+])
+def test_invalid_cursor(sort, cursor):
+    with pytest.raises(FileValidationError):
+        _decode_cursor(cursor, sort)
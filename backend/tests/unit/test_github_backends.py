@@ -0,0 +1,32 @@
+import os
+import pytest
+from app.core.http_fixtures import ReplayTransport
+from app.infrastructure.external.sync_service import SyncService, compute_fingerprint
+from scripts.verify_github_sync import fetch_both, map_projects
+
+pytestmark = pytest.mark.anyio
+
+# In the format of `verify_github_sync.py record`, with made-up data for one
+# user: a stable release, a prerelease, an archived repo without releases or
+# description; no tokens, cookies or real accounts
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "fixtures", "github_sync_octo.json")
+
+
+async def test_rest_and_graphql_map_to_the_same_projects():
+    rest, graphql = await fetch_both("octo", ReplayTransport(FIXTURE))
+
+    rest_projects, graphql_projects = map_projects(rest), map_projects(graphql)
+    assert set(rest_projects) == {"aboutme", "dotfiles", "tiny-cli"}
+    assert rest_projects == graphql_projects
+
+
+async def test_rest_and_graphql_fingerprints_match():
+    rest, graphql = await fetch_both("octo", ReplayTransport(FIXTURE))
+
+    service = SyncService(session_factory=None, github_backend="rest")
+    def fingerprints(repos):
+        return {
+            repo["name"]: compute_fingerprint(service._build_project(repo, "github", log=False), repo)
+            for repo in repos
+        }
+    assert fingerprints(rest) == fingerprints(graphql)
@@ -0,0 +1,97 @@
+import time
+import httpx
+import pytest
+from app.core.rate_limit import (
+    PRIORITY_ENRICHMENT,
+    PRIORITY_LISTING,
+    RateLimitBudget,
+    RateLimitExceeded,
+    RateLimitUsage,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def rate_limit_response(limit=5000, remaining=4999, reset_in=3600, status_code=200, **kwargs):
+    headers = {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(time.time() + reset_in)),
+    }
+    headers.update(kwargs.pop("headers", {}))
+    return httpx.Response(status_code, headers=headers, **kwargs)
+
+
+async def send(budget, priority, response):
+    await budget.acquire(priority)
+    budget.release(response, priority)
+
+
+async def test_release_reads_github_and_gitlab_headers():
+    budget = RateLimitBudget("test")
+    await send(budget, PRIORITY_LISTING, rate_limit_response(limit=5000, remaining=4000))
+    assert (budget.limit, budget.remaining) == (5000, 4000)
+
+    await send(budget, PRIORITY_ENRICHMENT, httpx.Response(200, headers={"RateLimit-Limit": "600", "RateLimit-Remaining": "12"}))
+    assert (budget.limit, budget.remaining) == (600, 12)
+    assert budget.usage == RateLimitUsage(requests=2, listing_requests=1, enrichment_requests=1)
+
+
+async def test_enrichment_stops_at_the_reserve_while_listing_goes_on():
+    budget = RateLimitBudget("test", share=0.8, max_wait=1)
+    # 1000 left of 5000, all of it the 20% reserve; reset far beyond max_wait
+    await send(budget, PRIORITY_LISTING, rate_limit_response(limit=5000, remaining=1000))
+
+    with pytest.raises(RateLimitExceeded) as excinfo:
+        await budget.acquire(PRIORITY_ENRICHMENT)
+    assert excinfo.value.retry_at > time.time()
+    assert budget.usage.deferred == 1
+
+    await send(budget, PRIORITY_LISTING, rate_limit_response(limit=5000, remaining=999))
+    assert budget.remaining == 999
+
+
+async def test_enrichment_is_paced_once_the_budget_runs_low():
+    budget = RateLimitBudget("test", share=1.0, burst=100, max_wait=1)
+    # 10 requests for the next 100 seconds: one every 10 seconds
+    await send(budget, PRIORITY_LISTING, rate_limit_response(limit=5000, remaining=10, reset_in=100))
+
+    await budget.acquire(PRIORITY_ENRICHMENT)
+    with pytest.raises(RateLimitExceeded):
+        await budget.acquire(PRIORITY_ENRICHMENT)
+
+
+async def test_enrichment_bursts_while_plenty_is_left():
+    budget = RateLimitBudget("test", share=1.0, burst=100, max_wait=0.01)
+    await send(budget, PRIORITY_LISTING, rate_limit_response(limit=5000, remaining=4000, reset_in=100))
+    for _ in range(5):
+        await send(budget, PRIORITY_ENRICHMENT, rate_limit_response(limit=5000, remaining=4000, reset_in=100))
+    assert budget.usage.waited_ms == 0
+
+
+def test_retry_after_pauses_every_request():
+    budget = RateLimitBudget("test")
+    delay = budget.backoff(httpx.Response(429, headers={"Retry-After": "7"}), attempt=0)
+    assert delay == 7
+    assert budget.snapshot()["paused_until"] >= time.time() + 6
+    assert budget.usage.rate_limited == 1
+
+
+def test_secondary_limit_backs_off_with_jitter():
+    budget = RateLimitBudget("test", backoff_base=1.0)
+    response = httpx.Response(403, content=b'{"message": "You have exceeded a secondary rate limit"}')
+    delay = budget.backoff(response, attempt=2)
+    assert 1.0 <= delay <= 1.0 + 4.0
+
+
+def test_plain_forbidden_is_not_a_rate_limit():
+    budget = RateLimitBudget("test")
+    assert budget.backoff(httpx.Response(403, content=b'{"message": "Resource not accessible"}'), attempt=0) is None
+    assert budget.backoff(httpx.Response(404), attempt=0) is None
+    assert budget.usage.rate_limited == 0
+
+
+def test_usage_difference():
+    before = RateLimitUsage(requests=3, retries=1)
+    after = RateLimitUsage(requests=10, retries=1, deferred=2)
+    assert after - before == RateLimitUsage(requests=7, deferred=2)
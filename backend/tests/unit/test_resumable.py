@@ -0,0 +1,66 @@
+import base64
+import hashlib
+import pytest
+from app.domain.exceptions import ChecksumMismatchError, FileValidationError, UploadOffsetError
+from app.infrastructure.storage.resumable import ResumableUploadStore, parse_checksum
+from app.infrastructure.storage.uploads import UploadPolicy
+
+POLICY = UploadPolicy(allowed_types={"text/plain"}, max_size=1024)
+
+
+def checksum(data, algorithm="sha256"):
+    return f"{algorithm} {base64.b64encode(hashlib.new(algorithm, data).digest()).decode()}"
+
+
+async def chunk(data):
+    yield data
+
+
+def test_parse_checksum():
+    assert parse_checksum(checksum(b"abc")) == ("sha256", hashlib.sha256(b"abc").digest())
+    assert parse_checksum(" MD5 " + base64.b64encode(b"x" * 16).decode()) == ("md5", b"x" * 16)
+
+
+@pytest.mark.parametrize("header", [None, "", "crc32 AAAA", "sha256 not-base64!"])
+def test_parse_checksum_rejects(header):
+    with pytest.raises(FileValidationError):
+        parse_checksum(header)
+
+
+@pytest.mark.anyio
+async def test_append_advances_the_offset(tmp_path):
+    store = ResumableUploadStore(str(tmp_path))
+    upload = await store.create("notes.txt", "text/plain", 6, POLICY)
+
+    upload = await store.append(upload.id, 0, 3, checksum(b"abc"), chunk(b"abc"))
+    assert upload.offset == 3
+    upload = await store.append(upload.id, 3, 3, checksum(b"def", "md5"), chunk(b"def"))
+    assert (await store.get(upload.id)).offset == 6
+    assert (tmp_path / f"{upload.id}.part").read_bytes() == b"abcdef"
+
+
+@pytest.mark.anyio
+async def test_append_rejects_a_wrong_offset(tmp_path):
+    store = ResumableUploadStore(str(tmp_path))
+    upload = await store.create("notes.txt", "text/plain", 6, POLICY)
+    with pytest.raises(UploadOffsetError):
+        await store.append(upload.id, 3, 3, checksum(b"def"), chunk(b"def"))
+
+
+@pytest.mark.anyio
+async def test_a_corrupt_chunk_is_cut_off(tmp_path):
+    store = ResumableUploadStore(str(tmp_path))
+    upload = await store.create("notes.txt", "text/plain", 6, POLICY)
+    await store.append(upload.id, 0, 3, checksum(b"abc"), chunk(b"abc"))
+
+    with pytest.raises(ChecksumMismatchError):
+        await store.append(upload.id, 3, 3, checksum(b"def"), chunk(b"dxf"))
+    assert (await store.get(upload.id)).offset == 3
+    assert (tmp_path / f"{upload.id}.part").read_bytes() == b"abc"
+
+
+@pytest.mark.anyio
+async def test_create_checks_the_policy(tmp_path):
+    store = ResumableUploadStore(str(tmp_path))
+    with pytest.raises(FileValidationError):
+        await store.create("run.sh", "application/x-sh", 6, POLICY)
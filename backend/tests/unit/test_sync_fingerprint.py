@@ -0,0 +1,77 @@
+from app.infrastructure.external.sync_service import (
+    FINGERPRINT_HALF,
+    SyncService,
+    compute_fingerprint,
+    listing_fingerprint,
+)
+
+
+def listed_repo(**overrides):
+    repo = {
+        "name": "aboutme",
+        "description": "Portfolio",
+        "html_url": "https://github.com/octo/aboutme",
+        "homepage": None,
+        "archived": False,
+        "stargazers_count": 3,
+        "watchers_count": 3,
+        "forks_count": 1,
+        "open_issues_count": 0,
+        "language": "Python",
+        "topics": ["fastapi"],
+        "updated_at": "2024-05-01T10:00:00Z",
+        "pushed_at": "2024-05-01T09:00:00Z",
+        "default_branch": "main",
+        "owner": {"login": "octo", "avatar_url": "https://avatars.example/octo"},
+    }
+    repo.update(overrides)
+    return repo
+
+
+def enriched(repo, has_releases=True, is_prerelease=False, languages=None):
+    return {**repo, "has_releases": has_releases, "is_prerelease": is_prerelease, "languages_map": languages or {"Python": 100}}
+
+
+def fingerprint(repo):
+    project = SyncService(session_factory=None)._build_project(repo, "github", log=False)
+    return compute_fingerprint(project, repo)
+
+
+def listing_half(repo):
+    project = SyncService(session_factory=None)._build_project(repo, "github", log=False)
+    return listing_fingerprint(project, repo)
+
+
+def test_fingerprint_fits_the_column_and_is_stable():
+    repo = enriched(listed_repo())
+    assert len(fingerprint(repo)) == 2 * FINGERPRINT_HALF == 64
+    assert fingerprint(repo) == fingerprint(enriched(listed_repo()))
+
+
+def test_listing_half_is_the_same_before_and_after_enrichment():
+    repo = listed_repo()
+    assert listing_half(repo) == fingerprint(enriched(repo))[:FINGERPRINT_HALF]
+
+
+def test_listing_changes_change_both_halves():
+    before = fingerprint(enriched(listed_repo()))
+    after = fingerprint(enriched(listed_repo(stargazers_count=4)))
+    assert before[:FINGERPRINT_HALF] != after[:FINGERPRINT_HALF]
+    assert before[FINGERPRINT_HALF:] != after[FINGERPRINT_HALF:]
+
+
+def test_push_changes_the_fingerprint():
+    assert fingerprint(enriched(listed_repo())) != fingerprint(enriched(listed_repo(pushed_at="2024-05-02T00:00:00Z")))
+
+
+def test_enrichment_changes_only_the_second_half():
+    before = fingerprint(enriched(listed_repo(), has_releases=False))
+    after = fingerprint(enriched(listed_repo(), has_releases=True))
+    assert before[:FINGERPRINT_HALF] == after[:FINGERPRINT_HALF]
+    assert before[FINGERPRINT_HALF:] != after[FINGERPRINT_HALF:]
+
+
+def test_build_project_leaves_curated_fields_unset():
+    project = SyncService(session_factory=None)._build_project(listed_repo(description=None), "github", log=False)
+    assert not {"display_order", "is_visible", "description"} & project.model_fields_set
+    assert {"name", "stars_count", "source_username"} <= project.model_fields_set
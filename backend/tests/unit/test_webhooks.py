@@ -0,0 +1,96 @@
+import hmac
+import json
+import time
+import hashlib
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.endpoints import webhooks
+from app.infrastructure.external.sync_worker import SyncRun
+
+SECRET = "s3cret"
+
+
+class FakeWorker:
+    def __init__(self):
+        self.triggered = []
+
+    def trigger(self, username, source_type="github", reason="manual", repo=None):
+        self.triggered.append((username, source_type, reason, repo))
+        return SyncRun(username, source_type, reason, time.time(), repo=repo)
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    worker = FakeWorker()
+    monkeypatch.setattr(webhooks, "sync_worker", worker)
+    monkeypatch.setattr(webhooks, "GITHUB_WEBHOOK_SECRET", SECRET)
+    monkeypatch.setattr(webhooks, "GITLAB_WEBHOOK_SECRET", SECRET)
+    monkeypatch.setenv("GIT_USERNAME", "octo")
+    return worker
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(webhooks.router, prefix="/webhooks")
+    return TestClient(app)
+
+
+def push(ref="refs/heads/main", owner="octo"):
+    return {"ref": ref, "repository": {"name": "aboutme", "default_branch": "main", "owner": {"login": owner}}}
+
+
+def github(client, payload, event="push", secret=SECRET):
+    body = json.dumps(payload).encode()
+    signature = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return client.post(
+        "/webhooks/github",
+        content=body,
+        headers={"X-GitHub-Event": event, "X-Hub-Signature-256": signature, "Content-Type": "application/json"},
+    )
+
+
+def test_github_is_disabled_without_a_secret(client, monkeypatch):
+    monkeypatch.setattr(webhooks, "GITHUB_WEBHOOK_SECRET", None)
+    assert github(client, push()).status_code == 503
+
+
+def test_github_rejects_a_bad_signature(client, worker):
+    assert github(client, push(), secret="wrong").status_code == 401
+    response = client.post("/webhooks/github", json=push(), headers={"X-GitHub-Event": "push"})
+    assert response.status_code == 401
+    assert worker.triggered == []
+
+
+def test_github_push_to_the_default_branch_queues_a_sync(client, worker):
+    response = github(client, push())
+    assert response.status_code == 202
+    assert response.json()["run"]["repo"] == "aboutme"
+    assert worker.triggered == [("octo", "github", "webhook:push", "aboutme")]
+
+
+@pytest.mark.parametrize("payload, event", [
+    (push(ref="refs/heads/feature"), "push"),
+    (push(owner="someone-else"), "push"),
+    (push(), "issues"),
+])
+def test_github_ignores_what_we_do_not_show(client, worker, payload, event):
+    response = github(client, payload, event=event)
+    assert response.status_code == 202
+    assert response.json()["message"].startswith("Ignored")
+    assert worker.triggered == []
+
+
+def test_github_ping(client, worker):
+    assert github(client, {"zen": "Keep it simple"}, event="ping").json() == {"message": "pong"}
+
+
+def test_gitlab_token(client, worker):
+    payload = {"ref": "refs/heads/main", "project": {"path_with_namespace": "octo/aboutme", "default_branch": "main"}}
+    headers = {"X-Gitlab-Event": "Push Hook"}
+    assert client.post("/webhooks/gitlab", json=payload, headers={**headers, "X-Gitlab-Token": "wrong"}).status_code == 401
+
+    response = client.post("/webhooks/gitlab", json=payload, headers={**headers, "X-Gitlab-Token": SECRET})
+    assert response.status_code == 202
+    assert worker.triggered == [("octo", "gitlab", "webhook:push_hook", "aboutme")]
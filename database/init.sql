@@ -74,6 +74,8 @@ CREATE TABLE IF NOT EXISTS projects (
     topics TEXT[],
     default_branch VARCHAR(50),
     last_updated TIMESTAMP WITH TIME ZONE,
+    sync_fingerprint VARCHAR(64), -- Hash of the last synced remote payload (delta sync)
+    synced_at TIMESTAMPTZ, -- Last comparison with the enriched remote payload (releases, languages)
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
 
@@ -133,6 +135,10 @@ CREATE TABLE IF NOT EXISTS projects (
     ui_config JSONB DEFAULT '{}'::jsonb  -- Speichert UI-spezifische Einstellungen wie Sichtbarkeit von Feldern
 );
 
+-- Natural key of synced projects; target of INSERT ... ON CONFLICT in bulk upserts
+-- and the index behind batched (name, source_type, source_username) IN (...) lookups
+CREATE UNIQUE INDEX IF NOT EXISTS uq_projects_source_name ON projects (source_type, source_username, name);
+
 -- POSTS
 -- Flexible table for all types of blog posts (project updates, general posts, etc.)
 CREATE TABLE IF NOT EXISTS posts (
@@ -257,17 +263,79 @@ CREATE TABLE IF NOT EXISTS files (
     name VARCHAR(255) NOT NULL,
     path VARCHAR(1024) NOT NULL, -- z.B. "2024/06/01/xyz.jpg"
     parent_id UUID REFERENCES files(id) ON DELETE CASCADE, -- für Ordnerstruktur
+    tree_path TEXT COLLATE "C" NOT NULL, -- IDs aller Vorfahren und der eigenen ID, z.B. "/<ordner>/<datei>/"
     is_folder BOOLEAN DEFAULT FALSE,
     size BIGINT,
     mime_type VARCHAR(100),
+    content_hash VARCHAR(64), -- SHA-256 des Inhalts; gleiche Inhalte teilen sich eine Datei
+    variants JSONB, -- erzeugte WebP/AVIF-Größen und Platzhalter von Bildern
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     tags TEXT[],
-    used_in JSONB, -- z.B. Referenzen auf Projekte, Posts etc.
     -- weitere Metadaten nach Bedarf
     UNIQUE (parent_id, name)
 );
 
+-- Dedup lookups and reference counting of content-addressed uploads
+CREATE INDEX IF NOT EXISTS ix_files_content_hash ON files (content_hash);
+
+-- Subtree ranges of the materialized folder path (prefix scans)
+CREATE INDEX IF NOT EXISTS ix_files_tree_path ON files (tree_path);
+
+-- Keyset pagination of folder listings, one index per sort key
+CREATE INDEX IF NOT EXISTS ix_files_parent_name ON files (parent_id, name, id);
+CREATE INDEX IF NOT EXISTS ix_files_parent_size ON files (parent_id, (COALESCE(size, 0)), id);
+CREATE INDEX IF NOT EXISTS ix_files_parent_created ON files (parent_id, created_at, id);
+
+-- Tag filters (tags @> ARRAY[...])
+CREATE INDEX IF NOT EXISTS ix_files_tags ON files USING GIN (tags);
+
+-- FILE USAGES
+-- Reverse index of upload references in content, rewritten by the repositories
+-- whenever a project, post or section is saved (backfill: scripts/index_file_usages.py)
+CREATE TABLE IF NOT EXISTS file_usages (
+    owner_type VARCHAR(16) NOT NULL, -- 'project', 'post' oder 'section'
+    owner_id INTEGER NOT NULL,
+    field VARCHAR(64) NOT NULL, -- Feld mit der Referenz, z.B. 'thumbnail_url' oder 'content_markdown'
+    path TEXT NOT NULL, -- Blob-URL wie in files.path, z.B. "/static/uploads/ab/<sha256>.png"
+    PRIMARY KEY (owner_type, owner_id, field, path)
+);
+
+-- "Where is this file used" and usage counts of the file listing
+CREATE INDEX IF NOT EXISTS ix_file_usages_path ON file_usages (path);
+
+-- SCHEDULER
+-- Jobs of the background scheduler, run by whichever worker holds the leader
+-- advisory lock. apscheduler_jobs is APScheduler's SQLAlchemy job store.
+CREATE TABLE IF NOT EXISTS apscheduler_jobs (
+    id VARCHAR(191) PRIMARY KEY,
+    next_run_time DOUBLE PRECISION, -- Unix-Zeitstempel des nächsten Laufs, NULL = pausiert
+    job_state BYTEA NOT NULL -- Gepickelter Job (Funktion, Trigger, Optionen)
+);
+
+-- Due jobs lookup of the scheduler loop
+CREATE INDEX IF NOT EXISTS ix_apscheduler_jobs_next_run_time ON apscheduler_jobs (next_run_time);
+
+CREATE TABLE IF NOT EXISTS scheduler_job_runs (
+    job_id VARCHAR(191) PRIMARY KEY,
+    status VARCHAR(16) NOT NULL, -- 'running', 'success', 'error' oder 'missed' (letzter Lauf)
+    instance VARCHAR(255) NOT NULL, -- Host:PID des Workers, der den Job zuletzt ausgeführt hat
+    started_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ,
+    duration_ms INTEGER, -- Dauer des letzten abgeschlossenen Laufs
+    error TEXT,
+    run_count INTEGER NOT NULL DEFAULT 0,
+    failure_count INTEGER NOT NULL DEFAULT 0
+);
+
+-- RESPONSE CACHE
+-- Versions of the public response cache tags, shared by all workers; an
+-- invalidation in one worker bumps the version, the others rebuild on read.
+CREATE TABLE IF NOT EXISTS cache_tag_versions (
+    tag VARCHAR(191) PRIMARY KEY, -- z.B. 'projects', 'projects:list', 'projects:42'
+    version BIGINT NOT NULL DEFAULT 0
+);
+
 CREATE TABLE IF NOT EXISTS layouts (
     id SERIAL PRIMARY KEY,
     name VARCHAR(255) NOT NULL,
@@ -15,6 +15,10 @@ export class AdminFileManagerService {
     return this.api.createFiles(formData, parent_id);
   }
 
+  uploadResumable(file: globalThis.File, parent_id?: string, onProgress?: (sent: number, total: number) => void) {
+    return this.api.uploadResumable(file, parent_id, onProgress);
+  }
+
   createFolder(name: string, parent_id?: string) {
     return this.api.createFolder(name, parent_id);
   }
@@ -46,6 +46,23 @@ export function useAdminFileManager() {
     }
   }, []);
 
+  const uploadResumable = useCallback(async (
+    file: globalThis.File,
+    parent_id?: string,
+    onProgress?: (sent: number, total: number) => void
+  ) => {
+    setLoading(true);
+    setError(null);
+    try {
+      return await api.uploadResumable(file, parent_id, onProgress);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to upload file');
+      throw err;
+    } finally {
+      setLoading(false);
+    }
+  }, []);
+
   const createFolder = useCallback(async (name: string, parent_id?: string) => {
     setLoading(true);
     setError(null);
@@ -91,6 +108,7 @@ export function useAdminFileManager() {
     listFiles,
     createFile,
     createFiles,
+    uploadResumable,
     createFolder,
     deleteFile,
     moveFile
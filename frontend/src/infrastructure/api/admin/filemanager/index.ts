@@ -11,18 +11,73 @@ export interface File {
   created_at: string;
   updated_at: string;
   tags: string[];
-  used_in: Record<string, string>;
+  // Owner ids per type ('project', 'post', 'section'); only on single-file responses
+  used_in?: Record<string, number[]>;
+  // Number of content fields referencing the file; only on listing items
+  usage_count?: number;
+}
+
+export interface FileUsage {
+  owner_type: 'project' | 'post' | 'section';
+  owner_id: number;
+  field: string;
+}
+
+export interface FilePage {
+  items: File[];
+  next_cursor?: string | null;
+  total: number;
+  total_is_estimate: boolean;
+}
+
+export interface FileUploadResult {
+  filename: string;
+  status: 'created' | 'error';
+  file?: File | null;
+  error?: string | null;
+}
+
+export interface ResumableUpload {
+  id: string;
+  filename: string;
+  content_type: string;
+  size: number;
+  offset: number;
+  max_chunk_size: number;
+  expires_at: string;
+}
+
+async function sha256Base64(data: ArrayBuffer): Promise<string> {
+  const digest = new Uint8Array(await crypto.subtle.digest('SHA-256', data));
+  let binary = '';
+  digest.forEach(byte => { binary += String.fromCharCode(byte); });
+  return btoa(binary);
+}
+
+export interface FileListParams {
+  parent_id?: string;
+  sort?: 'name' | 'size' | 'created_at';
+  order?: 'asc' | 'desc';
+  limit?: number;
+  cursor?: string;
+  mime_type?: string;
+  tags?: string[];
+  unused?: boolean;
 }
 
 export class AdminFileManagerApi {
   private baseUrl = `${config.backendUrl}/api/admin/filemanager`;
 
-  async listFiles(parent_id?: string): Promise<File[]> {
+  async listFilesPage(params: FileListParams = {}): Promise<FilePage> {
     const url = new URL(`${this.baseUrl}/files`, window.location.origin);
-    if (parent_id) {
-      url.searchParams.append('parent_id', parent_id);
-    }
-    
+    Object.entries(params).forEach(([key, value]) => {
+      if (Array.isArray(value)) {
+        value.forEach(item => url.searchParams.append(key, item));
+      } else if (value !== undefined && value !== '') {
+        url.searchParams.append(key, String(value));
+      }
+    });
+
     const res = await fetch(url.toString(), {
       credentials: 'include'
     });
@@ -30,6 +85,25 @@ export class AdminFileManagerApi {
     return res.json();
   }
 
+  async listFiles(parent_id?: string): Promise<File[]> {
+    const files: File[] = [];
+    let cursor: string | undefined;
+    do {
+      const page = await this.listFilesPage({ parent_id, cursor, limit: 500 });
+      files.push(...page.items);
+      cursor = page.next_cursor ?? undefined;
+    } while (cursor);
+    return files;
+  }
+
+  async getUsages(file_id: string): Promise<FileUsage[]> {
+    const res = await fetch(`${this.baseUrl}/files/${file_id}/usages`, {
+      credentials: 'include'
+    });
+    if (!res.ok) throw new Error('Failed to fetch file usages');
+    return res.json();
+  }
+
   async createFile(formData: FormData, parent_id?: string): Promise<File> {
     if (parent_id) {
       formData.append('parent_id', parent_id);
@@ -44,7 +118,7 @@ export class AdminFileManagerApi {
     return res.json();
   }
 
-  async createFiles(formData: FormData, parent_id?: string): Promise<File[]> {
+  async createFiles(formData: FormData, parent_id?: string): Promise<FileUploadResult[]> {
     if (parent_id) {
       formData.append('parent_id', parent_id);
     }
@@ -58,6 +132,66 @@ export class AdminFileManagerApi {
     return res.json();
   }
 
+  /**
+   * Upload a large file in checksummed chunks. A failed chunk is retried from
+   * the offset the server reports, so a dropped connection loses at most one chunk.
+   */
+  async uploadResumable(
+    file: globalThis.File,
+    parent_id?: string,
+    onProgress?: (sent: number, total: number) => void,
+    retries = 3
+  ): Promise<File> {
+    const res = await fetch(`${this.baseUrl}/files/uploads`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      credentials: 'include',
+      body: JSON.stringify({
+        filename: file.name,
+        content_type: file.type || 'application/octet-stream',
+        size: file.size,
+        parent_id
+      })
+    });
+    if (!res.ok) throw new Error('Failed to start upload');
+    let upload: ResumableUpload = await res.json();
+
+    let failures = 0;
+    while (upload.offset < upload.size) {
+      const chunk = await file.slice(upload.offset, upload.offset + upload.max_chunk_size).arrayBuffer();
+      const patch = await fetch(`${this.baseUrl}/files/uploads/${upload.id}`, {
+        method: 'PATCH',
+        headers: {
+          'Content-Type': 'application/offset+octet-stream',
+          'Upload-Offset': String(upload.offset),
+          'Upload-Checksum': `sha256 ${await sha256Base64(chunk)}`
+        },
+        credentials: 'include',
+        body: chunk
+      }).catch(() => null);
+      if (patch?.ok) {
+        upload = await patch.json();
+        failures = 0;
+        onProgress?.(upload.offset, upload.size);
+        continue;
+      }
+      if (++failures > retries || (patch && patch.status < 500 && patch.status !== 409 && patch.status !== 460)) {
+        throw new Error('Failed to upload file');
+      }
+      // Ask where to continue; the rejected chunk was discarded server-side
+      const head = await fetch(`${this.baseUrl}/files/uploads/${upload.id}`, { credentials: 'include' });
+      if (!head.ok) throw new Error('Failed to resume upload');
+      upload = await head.json();
+    }
+
+    const done = await fetch(`${this.baseUrl}/files/uploads/${upload.id}/complete`, {
+      method: 'POST',
+      credentials: 'include'
+    });
+    if (!done.ok) throw new Error('Failed to complete upload');
+    return done.json();
+  }
+
   async createFolder(name: string, parent_id?: string): Promise<File> {
     const res = await fetch(`${this.baseUrl}/folders`, {
       method: 'POST',
@@ -22,12 +22,17 @@ export function FileInformation({ file }: { file: File }) {
           <span className="file-information__label">Tags:</span> {file.tags.join(', ')}
         </div>
       )}
+      {!file.is_folder && file.usage_count !== undefined && (
+        <div>
+          <span className="file-information__label">Verwendungen:</span> {file.usage_count}
+        </div>
+      )}
       {file.used_in && Object.keys(file.used_in).length > 0 && (
         <div>
           <span className="file-information__label">Verwendet in:</span>
           <ul className="file-information__list">
             {Object.entries(file.used_in).map(([type, ids]) => (
-              <li key={type}>{type}: {Array.isArray(ids) ? ids.length : 1}</li>
+              <li key={type}>{type}: {ids.join(', ')}</li>
             ))}
           </ul>
         </div>
@@ -5,6 +5,9 @@ import { useAdminFileManager } from '@/application/admin/filemanager/useAdminFil
 import type { File as ApiFile } from '@/infrastructure/api/admin/filemanager';
 import { FileManagerContext } from '@/presentation/admin/pages/layout';
 
+// Videos above the single-request cap go through chunked, resumable uploads
+const MAX_VIDEO_SIZE = 2 * 1024 * 1024 * 1024;
+
 interface FileUploadProps {
   onUploadComplete: () => void;
   parentId?: string;
@@ -20,6 +23,7 @@ export function FileUpload({
 }: FileUploadProps) {
   const [uploading, setUploading] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  const [progress, setProgress] = useState<number | null>(null);
   const fileManager = useAdminFileManager();
   const { refreshFiles } = useContext(FileManagerContext);
 
@@ -30,16 +34,22 @@ export function FileUpload({
     setError(null);
 
     try {
-      if (acceptedFiles.length === 1) {
+      // Große Videos in Chunks, alles andere per Formular
+      const large = acceptedFiles.filter(file => file.size > maxSize);
+      const small = acceptedFiles.filter(file => file.size <= maxSize);
+      for (const file of large) {
+        await fileManager.uploadResumable(file, parentId, (sent, total) => setProgress(Math.round(sent / total * 100)));
+      }
+      if (small.length === 1) {
         // Einzel-Upload
         const formData = new FormData();
-        formData.append('file', acceptedFiles[0]);
+        formData.append('file', small[0]);
         if (parentId) formData.append('parent_id', parentId);
         await fileManager.createFile(formData as any, parentId);
-      } else {
+      } else if (small.length > 1) {
         // Multi-Upload
         const formData = new FormData();
-        acceptedFiles.forEach(file => formData.append('files', file));
+        small.forEach(file => formData.append('files', file));
         if (parentId) formData.append('parent_id', parentId);
         await fileManager.createFiles(formData as any, parentId);
       }
@@ -49,8 +59,9 @@ export function FileUpload({
       setError(err.message || 'Upload failed');
     } finally {
       setUploading(false);
+      setProgress(null);
     }
-  }, [fileManager, parentId, onUploadComplete, refreshFiles]);
+  }, [fileManager, parentId, maxSize, onUploadComplete, refreshFiles]);
 
   const { getRootProps, getInputProps, isDragActive } = useDropzone({
     onDrop,
@@ -61,7 +72,9 @@ export function FileUpload({
       'application/msword': ['.doc'],
       'application/vnd.openxmlformats-officedocument.wordprocessingml.document': ['.docx'],
     } : undefined,
-    maxSize,
+    validator: file => file.size > (file.type?.startsWith('video/') ? MAX_VIDEO_SIZE : maxSize)
+      ? { code: 'file-too-large', message: 'File is too large' }
+      : null,
   });
 
   return (
@@ -72,7 +85,7 @@ export function FileUpload({
       >
         <input {...getInputProps()} />
         {uploading ? (
-          <div className="file-upload__uploading">Uploading...</div>
+          <div className="file-upload__uploading">Uploading...{progress !== null && ` ${progress}%`}</div>
         ) : isDragActive ? (
           <div className="file-upload__drop-hint">Drop the file here...</div>
         ) : (
@@ -89,13 +89,13 @@ check_docker() {
 
 # Start test database
 start_test_db() {
-  # Remove old test-db container if exists (any state)
-  docker rm -f about-me-test-db 2>/dev/null || true
+  # Remove old test containers if they exist (any state)
+  docker rm -f about-me-test-db about-me-test-minio 2>/dev/null || true
   # Remove old test network if exists
   docker network rm about-me_default 2>/dev/null || true
   
-  echo "Starting PostgreSQL test database..."
-  docker compose -f docker-compose.yml -f docker-compose.override.test.yml up -d --force-recreate test-db
+  echo "Starting PostgreSQL test database and MinIO..."
+  docker compose -f docker-compose.yml -f docker-compose.override.test.yml up -d --force-recreate test-db test-minio
   
   # Wait until healthy
   for i in {1..20}; do
@@ -117,8 +117,8 @@ start_test_db() {
 # Stop test database
 stop_test_db() {
   echo "Stopping PostgreSQL test database..."
-  docker stop about-me-test-db 2>/dev/null || true
-  docker rm about-me-test-db 2>/dev/null || true
+  docker stop about-me-test-db about-me-test-minio 2>/dev/null || true
+  docker rm about-me-test-db about-me-test-minio 2>/dev/null || true
 }
 
 # =========================================